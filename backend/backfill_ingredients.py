@@ -0,0 +1,95 @@
+# backfill_ingredients.py
+"""
+Backfill of Recipes.ingredients_parsed.
+Parses the stored ingredient lines of every row that has no structured
+ingredients yet (rows scraped before ingredient_parser.py existed) and
+writes them, one upsert per id-ordered batch, with no re-scraping. Rows are selected
+by `ingredients_parsed is null`, so an interrupted run simply picks up
+where it stopped. Requires migrations/003_ingredients_parsed.sql.
+
+Usage:
+    python3 backfill_ingredients.py
+    python3 backfill_ingredients.py --batch-size 500 --max-rows 10000 --pause 1
+    python3 backfill_ingredients.py --dry-run
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from ingredient_parser import cache_report, parse_ingredients
+from storage import get_supabase
+
+BATCH_SIZE = 500
+
+
+def write_parsed(supabase, updates: List[Dict]):
+    """Every row gets its own value, so the batch goes out as one upsert on id."""
+    supabase.table("Recipes").upsert(updates, on_conflict="id").execute()
+
+
+def backfill(
+    supabase,
+    batch_size: int = BATCH_SIZE,
+    max_rows: Optional[int] = None,
+    pause: float = 0.0,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    stats = dict.fromkeys(['rows', 'lines', 'batches'], 0)
+    last_id = 0
+    while max_rows is None or stats['rows'] < max_rows:
+        limit = batch_size if max_rows is None else min(batch_size, max_rows - stats['rows'])
+        rows = supabase.table("Recipes") \
+            .select("id, url, ingredients") \
+            .is_("ingredients_parsed", "null") \
+            .gt("id", last_id) \
+            .order("id") \
+            .limit(limit) \
+            .execute().data
+        if not rows:
+            break
+        updates = [{'id': row['id'], 'url': row['url'],
+                    'ingredients_parsed': parse_ingredients((row.get('ingredients') or '').split(' | '))}
+                   for row in rows]
+        if not dry_run:
+            write_parsed(supabase, updates)
+        stats['rows'] += len(rows)
+        stats['lines'] += sum(len(u['ingredients_parsed']) for u in updates)
+        stats['batches'] += 1
+        last_id = rows[-1]['id']
+        print(f"  … {stats['rows']} row(s) up to id {last_id}, {stats['lines']} ingredient line(s)")
+        if len(rows) < limit:
+            break
+        time.sleep(pause)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse stored ingredients into Recipes.ingredients_parsed")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Rows per batch (default: {BATCH_SIZE})")
+    parser.add_argument("--max-rows",   type=int, default=None,
+                        help="Stop after this many rows")
+    parser.add_argument("--pause",      type=float, default=0.0,
+                        help="Seconds to sleep between batches (default: 0)")
+    parser.add_argument("--dry-run",    action="store_true",
+                        help="Parse, but write nothing")
+    args = parser.parse_args()
+
+    start = time.time()
+    stats = backfill(get_supabase(), batch_size=args.batch_size, max_rows=args.max_rows,
+                     pause=args.pause, dry_run=args.dry_run)
+    elapsed = time.time() - start
+    print(
+        f"\n{'═'*60}\n"
+        f"INGREDIENT BACKFILL {'DRY RUN ' if args.dry_run else ''}COMPLETE\n"
+        f"  Rows          : {stats['rows']} in {stats['batches']} batch(es)\n"
+        f"  Lines parsed  : {stats['lines']}\n"
+        f"  {cache_report()}\n"
+        f"  Total time    : {int(elapsed // 60)}m {int(elapsed % 60)}s\n"
+        f"{'═'*60}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench_dietary_tags.py
+"""
+Microbenchmark: dietary tagging.
+Tags the ingredient lists of the saved recipe pages in fixtures/recipes/ with
+the compiled single-pass matcher, and with a reference matcher that runs one
+re.search(rf'\\b{term}\\b') / `term in text` per keyword the way the old
+per-category loops did. Reports the time per recipe for each and checks that
+every recipe gets the same tags.
+
+Usage (from backend/):
+    python3 benchmarks/bench_dietary_tags.py
+    python3 benchmarks/bench_dietary_tags.py --repeat 500
+"""
+
+import argparse
+import gzip
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dietary_tags import SUBSTRING_TERMS, WORD_TERMS, dietary_tags, get_matcher  # noqa: E402
+from extraction_context import ExtractionContext  # noqa: E402
+from jsonld_recipe import load_recipe  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "recipes"
+
+
+class ReferenceMatcher:
+    """One search per keyword — what the tagging rules used to do."""
+
+    def scan(self, text):
+        words = frozenset(t for t in WORD_TERMS if re.search(rf'\b{re.escape(t)}\b', text))
+        substrings = frozenset(t for t in SUBSTRING_TERMS if t in text)
+        return words, substrings
+
+
+def load_corpus():
+    corpus = {}
+    for i, path in enumerate(sorted(FIXTURES_DIR.glob("*.html.gz")), 1):
+        site = path.name[:-len(".html.gz")]
+        corpus[site] = load_recipe(gzip.decompress(path.read_bytes()), f"https://www.{site}/recipe/{i}/fixture-recipe/")
+    return corpus
+
+
+def bench(matcher, corpus, repeat):
+    times, tags = {}, {}
+    for site, scraper in corpus.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            tags[site] = dietary_tags(ExtractionContext(scraper), matcher)
+        times[site] = (time.perf_counter() - start) / repeat
+    return times, tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dietary tagging benchmark")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if not corpus:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+    start = time.perf_counter()
+    matcher = get_matcher()
+    print(f"{len(corpus)} recipe(s), {len(WORD_TERMS)} word + {len(SUBSTRING_TERMS)} substring keywords, "
+          f"matcher compiled in {(time.perf_counter() - start) * 1000:.1f} ms, repeat={args.repeat}\n")
+
+    ref_t, ref_tags = bench(ReferenceMatcher(), corpus, args.repeat)
+    new_t, new_tags = bench(matcher, corpus, args.repeat)
+
+    print(f"  {'site':<20} {'chars':>6} {'per-term ms':>12} {'1-pass ms':>10} {'speedup':>8}  same tags")
+    print("  " + "─" * 70)
+    for site, scraper in corpus.items():
+        text = ExtractionContext(scraper).text
+        same = "yes" if ref_tags[site] == new_tags[site] else "NO"
+        print(f"  {site:<20} {len(text):>6} {ref_t[site] * 1000:>12.3f} {new_t[site] * 1000:>10.3f} "
+              f"{ref_t[site] / new_t[site]:>7.1f}x  {same}")
+    ref_avg = sum(ref_t.values()) / len(ref_t)
+    new_avg = sum(new_t.values()) / len(new_t)
+    print(f"\n  mean {ref_avg * 1000:.3f} ms -> {new_avg * 1000:.3f} ms per recipe ({ref_avg / new_avg:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# bench_extraction.py
+"""
+Benchmark + regression check: the recipe extraction pipeline.
+Runs every recipe page in fixtures/recipes/ (small synthetic pages, one per
+site layout) and fixtures/pages/ (real pages saved from supported sites,
+reported as real/<site>) through parse_recipe()'s stages and reports, per
+page:
+
+    parse    building the recipe scraper from the HTML (JSON-LD fast path)
+    extract  ingredients, _clean_instructions() and _extract_nutrients()
+    tag      _extract_dietary_tags()
+    total    the whole parse_recipe() call, and pages/sec over the corpus
+    peak KB  tracemalloc peak while parsing the page once
+
+and compares every parse_recipe() column with the golden results in
+fixtures/golden/recipes.json, exiting non-zero on any difference. --json
+writes the numbers (plus commit and Python version) for tracking over time.
+
+To add a real page: save it gzipped as fixtures/pages/<site>.html.gz, put
+its URL (and where it came from) in fixtures/pages/sources.json, run
+--update-golden and check the new entry by hand before committing it.
+
+Usage (from backend/):
+    python3 benchmarks/bench_extraction.py
+    python3 benchmarks/bench_extraction.py --repeat 50 --json bench-results.json
+    python3 benchmarks/bench_extraction.py --update-golden     # after an intended output change
+"""
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_context import ExtractionContext  # noqa: E402
+from jsonld_recipe import load_recipe  # noqa: E402
+from scraper_v3_railway import RecipeParser  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "recipes"
+PAGES_DIR = Path(__file__).parent / "fixtures" / "pages"
+PAGE_SOURCES_FILE = PAGES_DIR / "sources.json"
+GOLDEN_FILE = Path(__file__).parent / "fixtures" / "golden" / "recipes.json"
+# Columns that legitimately differ between runs or rule versions
+VOLATILE_FIELDS = {'scraped_date', 'tagger_version'}
+STAGES = ['parse', 'extract', 'tag', 'total']
+
+
+def load_fixtures():
+    pages = {}
+    for path in sorted(FIXTURES_DIR.glob("*.html.gz")):
+        site = path.name[:-len(".html.gz")]
+        pages[site] = (f"https://www.{site}/recipe/{len(pages) + 1}/fixture-recipe/",
+                       gzip.decompress(path.read_bytes()))
+    sources = json.loads(PAGE_SOURCES_FILE.read_text()) if PAGE_SOURCES_FILE.exists() else {}
+    for path in sorted(PAGES_DIR.glob("*.html.gz")):
+        site = path.name[:-len(".html.gz")]
+        if site not in sources:
+            raise SystemExit(f"{path.name} has no URL in {PAGE_SOURCES_FILE.name}")
+        pages[f"real/{site}"] = (sources[site]['url'], gzip.decompress(path.read_bytes()))
+    return pages
+
+
+def time_stages(parser, url, body, repeat):
+    """Mean seconds per stage over `repeat` runs on fresh scrapers."""
+    totals = dict.fromkeys(STAGES, 0.0)
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        scraper = load_recipe(body, url)
+        t1 = time.perf_counter()
+        context = ExtractionContext(scraper)
+        context.ingredients
+        parser._clean_instructions(scraper)
+        parser._extract_nutrients(context)
+        t2 = time.perf_counter()
+        parser._extract_dietary_tags(context)
+        t3 = time.perf_counter()
+        parser.parse_recipe(body, url)
+        t4 = time.perf_counter()
+        totals['parse'] += t1 - t0
+        totals['extract'] += t2 - t1
+        totals['tag'] += t3 - t2
+        totals['total'] += t4 - t3
+    return {stage: t / repeat for stage, t in totals.items()}
+
+
+def peak_memory(parser, url, body) -> int:
+    tracemalloc.start()
+    try:
+        parser.parse_recipe(body, url)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def stable_output(parser, url, body):
+    recipe = parser.parse_recipe(body, url)
+    return {k: v for k, v in recipe.to_row().items() if k not in VOLATILE_FIELDS}
+
+
+def golden_diff(expected, actual):
+    if expected is None:
+        return ["(no golden result)"]
+    return sorted(k for k in set(expected) | set(actual) if expected.get(k) != actual.get(k))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    argp = argparse.ArgumentParser(description="Recipe extraction benchmark and golden-output check")
+    argp.add_argument("--repeat",        type=int, default=20)
+    argp.add_argument("--json",          default=None, metavar="PATH",
+                      help="Also write the results as JSON to PATH ('-' for stdout)")
+    argp.add_argument("--update-golden", action="store_true",
+                      help=f"Rewrite {GOLDEN_FILE.name} from the current output")
+    args = argp.parse_args()
+
+    pages = load_fixtures()
+    if not pages:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+    parser = RecipeParser()
+    outputs = {site: stable_output(parser, url, body) for site, (url, body) in pages.items()}
+    if args.update_golden:
+        GOLDEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+        GOLDEN_FILE.write_text(json.dumps(outputs, indent=1, sort_keys=True, ensure_ascii=False) + "\n")
+        print(f"Wrote golden results for {len(outputs)} page(s) to {GOLDEN_FILE}")
+        return
+    golden = json.loads(GOLDEN_FILE.read_text()) if GOLDEN_FILE.exists() else {}
+
+    total_kb = sum(len(body) for _, body in pages.values()) / 1024
+    print(f"{len(pages)} recipe page(s), {total_kb:.0f} KB total, repeat={args.repeat}\n")
+    results = {}
+    for site, (url, body) in pages.items():
+        timings = time_stages(parser, url, body, args.repeat)
+        results[site] = {
+            **{f"{stage}_ms": round(t * 1000, 4) for stage, t in timings.items()},
+            'bytes': len(body),
+            'peak_kb': round(peak_memory(parser, url, body) / 1024, 1),
+            'golden_diff': golden_diff(golden.get(site), outputs[site]),
+        }
+
+    print(f"  {'site':<32} {'parse ms':>9} {'extract ms':>11} {'tag ms':>8} {'total ms':>9} {'peak KB':>8}  golden")
+    print("  " + "─" * 92)
+    for site, r in results.items():
+        same = "ok" if not r['golden_diff'] else "DIFF: " + ", ".join(r['golden_diff'])
+        print(f"  {site:<32} {r['parse_ms']:>9.3f} {r['extract_ms']:>11.3f} {r['tag_ms']:>8.3f} "
+              f"{r['total_ms']:>9.3f} {r['peak_kb']:>8.1f}  {same}")
+    mean = {stage: sum(r[f"{stage}_ms"] for r in results.values()) / len(results) for stage in STAGES}
+    pages_per_sec = 1000 / mean['total']
+    mean_peak = sum(r['peak_kb'] for r in results.values()) / len(results)
+    mismatched = [site for site, r in results.items() if r['golden_diff']]
+    print(f"\n  mean: parse {mean['parse']:.3f} ms, extract {mean['extract']:.3f} ms, tag {mean['tag']:.3f} ms, "
+          f"total {mean['total']:.3f} ms -> {pages_per_sec:.0f} pages/sec, {mean_peak:.0f} KB peak per page")
+    print(f"  golden: {len(results) - len(mismatched)}/{len(results)} page(s) match")
+
+    if args.json:
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'repeat': args.repeat,
+            'pages': len(results),
+            'pages_per_sec': round(pages_per_sec, 1),
+            'mean_ms': {stage: round(t, 4) for stage, t in mean.items()},
+            'mean_peak_kb': round(mean_peak, 1),
+            'golden_mismatches': mismatched,
+            'sites': results,
+        }
+        text = json.dumps(report, indent=1)
+        if args.json == '-':
+            print(text)
+        else:
+            Path(args.json).write_text(text + "\n")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
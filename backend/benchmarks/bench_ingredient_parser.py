@@ -0,0 +1,76 @@
+# bench_ingredient_parser.py
+"""
+Benchmark + regression check: the ingredient line parser.
+Parses every line in fixtures/golden/ingredients.json and compares each
+result with the expected one, exiting non-zero on any difference, then times
+parse_ingredient() over a repeated mix of those lines:
+
+    cold     every line parsed with an empty LRU cache
+    cached   the same lines again, served from the cache
+
+The golden file keeps the awkward lines real pages contain ("Juice of 1
+lemon", "2 leaves basil", "1/0 cup sugar"); add a line there whenever a
+parser fix changes how one comes out.
+
+Usage (from backend/):
+    python3 benchmarks/bench_ingredient_parser.py
+    python3 benchmarks/bench_ingredient_parser.py --repeat 200
+    python3 benchmarks/bench_ingredient_parser.py --update-golden     # after an intended output change
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingredient_parser import parse_ingredient  # noqa: E402
+
+GOLDEN_FILE = Path(__file__).parent / "fixtures" / "golden" / "ingredients.json"
+
+
+def golden_diff(expected, actual):
+    return sorted(k for k in set(expected) | set(actual) if expected.get(k) != actual.get(k))
+
+
+def main():
+    argp = argparse.ArgumentParser(description="Ingredient parser benchmark and golden-output check")
+    argp.add_argument("--repeat",        type=int, default=100)
+    argp.add_argument("--update-golden", action="store_true",
+                      help=f"Rewrite {GOLDEN_FILE.name} from the current output")
+    args = argp.parse_args()
+
+    golden = json.loads(GOLDEN_FILE.read_text())
+    outputs = {line: parse_ingredient(line).to_dict() for line in golden}
+    if args.update_golden:
+        GOLDEN_FILE.write_text(json.dumps(outputs, indent=1, ensure_ascii=False) + "\n")
+        print(f"Wrote golden results for {len(outputs)} line(s) to {GOLDEN_FILE}")
+        return
+
+    mismatched = {line: golden_diff(expected, outputs[line]) for line, expected in golden.items()}
+    mismatched = {line: diff for line, diff in mismatched.items() if diff}
+    for line, diff in mismatched.items():
+        print(f"  DIFF {line!r}: " + ", ".join(f"{k}={outputs[line].get(k)!r} (expected {golden[line].get(k)!r})"
+                                              for k in diff))
+
+    lines = list(golden) * args.repeat
+    parse_ingredient.cache_clear()
+    t0 = time.perf_counter()
+    for line in golden:
+        parse_ingredient(line)
+    t1 = time.perf_counter()
+    for line in lines:
+        parse_ingredient(line)
+    t2 = time.perf_counter()
+    print(f"  {len(golden)} line(s): cold {(t1 - t0) / len(golden) * 1e6:.1f} µs/line, "
+          f"cached {(t2 - t1) / len(lines) * 1e6:.2f} µs/line")
+    print(f"  golden: {len(golden) - len(mismatched)}/{len(golden)} line(s) match")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench_link_extract.py
+"""
+Microbenchmark: search-page link extraction.
+Runs the search-page URL collection step (_collect_recipe_urls) over the saved
+search pages in fixtures/search/ with every registered link extractor, and
+compares each one with the original path (decode to text + full
+BeautifulSoup parse).
+
+Usage (from backend/):
+    python3 benchmarks/bench_link_extract.py
+    python3 benchmarks/bench_link_extract.py --repeat 20 --limit 6
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_extract import LINK_EXTRACTORS, get_link_extractor  # noqa: E402
+from scraper_v3_railway import RecipeSearchScraper  # noqa: E402
+from site_registry import get_site_config  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "search"
+
+
+def load_fixtures():
+    pages = {}
+    for path in sorted(FIXTURES_DIR.glob("*.html.gz")):
+        site = path.name[:-len(".html.gz")]
+        pages[site] = gzip.decompress(path.read_bytes())
+    return pages
+
+
+def original_links(body: bytes):
+    """The pre-extractor path: decode the whole body, then build a full tree."""
+    soup = BeautifulSoup(body.decode("utf-8", errors="replace"), "html.parser")
+    for link in soup.find_all("a", href=True):
+        yield link["href"]
+
+
+def make_scraper(extract_links):
+    # Bench only the parsing helpers — no network or Supabase connection needed
+    scraper = RecipeSearchScraper.__new__(RecipeSearchScraper)
+    scraper.extract_links = extract_links
+    return scraper
+
+
+def bench(scraper, pages, limit, repeat):
+    results = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for site, body in pages.items():
+            results[site] = scraper._collect_recipe_urls(body, get_site_config(site), limit)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(pages)), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search-page link extraction benchmark")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=6, help="per_site_limit to stop at")
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    if not pages:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+    total_kb = sum(len(b) for b in pages.values()) / 1024
+    print(f"{len(pages)} search page(s), {total_kb:.0f} KB total, limit={args.limit}, repeat={args.repeat}\n")
+
+    baseline_s, baseline = bench(make_scraper(original_links), pages, args.limit, args.repeat)
+    print(f"  {'extractor':<12} {'ms/page':>9} {'speedup':>8}  same URLs")
+    print("  " + "─" * 42)
+    print(f"  {'original':<12} {baseline_s * 1000:>9.2f} {1.0:>7.1f}x  —")
+    for name in LINK_EXTRACTORS:
+        per_page, results = bench(make_scraper(get_link_extractor(name)), pages, args.limit, args.repeat)
+        same = "yes" if results == baseline else "NO"
+        print(f"  {name:<12} {per_page * 1000:>9.2f} {baseline_s / per_page:>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# bench_recipe_parse.py
+"""
+Microbenchmark: recipe page extraction.
+Runs the saved recipe pages in fixtures/recipes/ through the JSON-LD fast path
+(load_recipe) and through the full recipe_scrapers parse (scrape_html), and
+reports the time per page to build the scraper and read every field
+parse_recipe() uses. Then runs parse_recipe() both ways and checks that every
+column comes out the same.
+
+Usage (from backend/):
+    python3 benchmarks/bench_recipe_parse.py
+    python3 benchmarks/bench_recipe_parse.py --repeat 20
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recipe_scrapers import scrape_html  # noqa: E402
+
+from jsonld_recipe import load_recipe  # noqa: E402
+from scraper_v3_railway import RecipeSearchScraper  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "recipes"
+VOLATILE_FIELDS = {'scraped_date'}
+FIELDS = ['title', 'canonical_url', 'author', 'image', 'total_time', 'yields',
+          'cuisine', 'category', 'ingredients', 'instructions_list', 'nutrients']
+
+
+def load_fixtures():
+    pages = {}
+    for path in sorted(FIXTURES_DIR.glob("*.html.gz")):
+        site = path.name[:-len(".html.gz")]
+        pages[site] = (f"https://www.{site}/recipe/{len(pages) + 1}/fixture-recipe/",
+                       gzip.decompress(path.read_bytes()))
+    return pages
+
+
+def make_scraper(jsonld_fast_path: bool):
+    # Bench only the parsing path — no network or Supabase connection needed
+    scraper = RecipeSearchScraper.__new__(RecipeSearchScraper)
+    scraper.prefer_page_canonical = True
+    scraper.jsonld_fast_path = jsonld_fast_path
+    return scraper
+
+
+def read_fields(scraper):
+    values = {}
+    for name in FIELDS:
+        try:
+            values[name] = getattr(scraper, name)()
+        except Exception:
+            values[name] = None
+    return values
+
+
+def bench_extract(load, pages, repeat):
+    times = {}
+    for site, (url, body) in pages.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            read_fields(load(html=body, org_url=url) if load is scrape_html else load(body, url))
+        times[site] = (time.perf_counter() - start) / repeat
+    return times
+
+
+def parse_all(scraper, pages):
+    results = {}
+    for site, (url, body) in pages.items():
+        recipe = scraper.parse_recipe(body, url)
+        results[site] = {k: v for k, v in recipe.to_row().items() if k not in VOLATILE_FIELDS}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recipe page extraction benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    if not pages:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+    total_kb = sum(len(body) for _, body in pages.values()) / 1024
+    print(f"{len(pages)} recipe page(s), {total_kb:.0f} KB total, repeat={args.repeat}\n")
+
+    full_t = bench_extract(scrape_html, pages, args.repeat)
+    fast_t = bench_extract(load_recipe, pages, args.repeat)
+    full = parse_all(make_scraper(False), pages)
+    fast = parse_all(make_scraper(True), pages)
+
+    print(f"  {'site':<20} {'full ms':>8} {'json-ld ms':>11} {'speedup':>8}  same fields")
+    print("  " + "─" * 62)
+    for site in pages:
+        diff = [k for k in full[site] if full[site][k] != fast[site].get(k)]
+        same = "yes" if not diff else "NO: " + ", ".join(diff)
+        print(f"  {site:<20} {full_t[site] * 1000:>8.2f} {fast_t[site] * 1000:>11.2f} "
+              f"{full_t[site] / fast_t[site]:>7.1f}x  {same}")
+    full_avg = sum(full_t.values()) / len(full_t)
+    fast_avg = sum(fast_t.values()) / len(fast_t)
+    print(f"\n  mean {full_avg * 1000:.2f} ms -> {fast_avg * 1000:.2f} ms per page "
+          f"({full_avg / fast_avg:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
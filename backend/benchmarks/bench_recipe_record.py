@@ -0,0 +1,126 @@
+# bench_recipe_record.py
+"""
+Memory benchmark: in-memory recipe representation.
+Builds N synthetic recipes (as a bulk scrape would hold them between
+scrape_multiple() and save_to_db()) two ways and reports the memory held
+and the build time for each:
+
+    dict    the old parse_recipe() output: a 29-key dict per recipe with its
+            own copy of every string and a list of dicts for the parsed
+            ingredients
+    record  RecipeRecord: slotted, low-cardinality fields interned, parsed
+            ingredients shared with the ingredient parser's cache
+
+Every string is created fresh per recipe, the way parsing HTML does, so
+equal values are only shared where interning or the cache shares them.
+
+Usage (from backend/):
+    python3 benchmarks/bench_recipe_record.py
+    python3 benchmarks/bench_recipe_record.py --count 20000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingredient_parser import parse_ingredient_lines, parse_ingredients  # noqa: E402
+from recipe_record import NUTRIENT_FIELDS, RecipeRecord  # noqa: E402
+
+SITES = ['allrecipes.com', 'bbcgoodfood.com', 'budgetbytes.com', 'epicurious.com', 'food52.com',
+         'seriouseats.com', 'simplyrecipes.com', 'tasty.co', 'smittenkitchen.com', 'thekitchn.com']
+CUISINES = ['', 'American', 'Italian', 'Mexican', 'Indian', 'Chinese', 'French', 'Thai', 'Japanese', 'Greek']
+CATEGORIES = ['', 'Dinner', 'Dessert', 'Breakfast', 'Side Dish', 'Soup', 'Salad', 'Appetizer', 'Main Course']
+TAG_SETS = ['', 'vegetarian', 'vegan, vegetarian, gluten-free', 'gluten-free, nut-free, shellfish-free',
+            'vegetarian, nut-free, shellfish-free, halal, kosher', 'pescatarian, gluten-free, low-calorie',
+            'nut-free, shellfish-free, high-protein, halal', 'keto, gluten-free, diabetic-friendly']
+AMOUNTS = ['1', '2', '1/2', '3/4', '1 1/2', '3', '4', '200g', '1/4']
+UNITS = ['cup', 'cups', 'tsp', 'tbsp', 'tablespoons', 'oz', 'g', 'lb', 'cloves', '']
+NAMES = ['all-purpose flour', 'sugar', 'salt', 'unsalted butter', 'olive oil', 'garlic', 'onion, diced',
+         'large eggs', 'milk', 'chicken breasts', 'tomatoes, chopped', 'black pepper', 'baking powder',
+         'fresh parsley, chopped', 'heavy cream', 'parmesan cheese, grated', 'lemon juice', 'rice',
+         'brown sugar', 'vanilla extract', 'ground cumin', 'soy sauce', 'ginger, minced', 'carrots']
+# A small vocabulary: ingredient lines repeat across recipes, as on real sites
+LINES = [f"{a} {u} {n}".replace("  ", " ") for a in AMOUNTS for u in UNITS for n in NAMES]
+
+
+def fresh(s: str) -> str:
+    """An equal but distinct string object, like one sliced out of a page."""
+    return s.encode().decode()
+
+
+def synthetic(rng: random.Random, i: int):
+    site = rng.choice(SITES)
+    lines = [fresh(rng.choice(LINES)) for _ in range(rng.randint(6, 14))]
+    fields = {
+        'title': fresh(f"Recipe number {i} with {rng.choice(NAMES)}"),
+        'url': fresh(f"https://www.{site}/recipe/{i}/recipe-number-{i}/"),
+        'author': fresh(rng.choice(['Unknown', 'Test Kitchen', 'Jane Cook', 'Chef John'])),
+        'image_url': fresh(f"https://images.{site}/photos/{i}.jpg"),
+        'total_time': fresh(f"{rng.randint(10, 120)} minutes"),
+        'yields': fresh(f"{rng.randint(2, 8)} servings"),
+        'cuisine': fresh(rng.choice(CUISINES)),
+        'category': fresh(rng.choice(CATEGORIES)),
+        'instructions': fresh(" | ".join(f"Step {n}: stir the {rng.choice(NAMES)} well and cook for "
+                                         f"{rng.randint(2, 30)} minutes." for n in range(rng.randint(4, 9)))),
+        'dietary_tags': fresh(rng.choice(TAG_SETS)),
+        'tagger_version': fresh('0a9be246f5f8'),
+        'source_site': fresh(f"www.{site}"),
+        'scraped_date': fresh(f"2026-10-{rng.randint(10, 28)} 12:{rng.randint(10, 59)}:00"),
+        'etag': None,
+        'last_modified': None,
+        'content_hash': fresh(f"{rng.getrandbits(256):064x}"),
+    }
+    nutrients = {key: fresh(f"{rng.randint(1, 900)} {'kcal' if key == 'calories' else 'g'}")
+                 for key in NUTRIENT_FIELDS}
+    return fields, nutrients, lines
+
+
+def as_dict(fields, nutrients, lines):
+    return {**fields, 'ingredients': ' | '.join(lines), 'ingredients_parsed': parse_ingredients(lines), **nutrients}
+
+
+def as_record(fields, nutrients, lines):
+    return RecipeRecord(**fields, ingredients=' | '.join(lines), ingredients_parsed=parse_ingredient_lines(lines),
+                        **{NUTRIENT_FIELDS[k]: v for k, v in nutrients.items()})
+
+
+def measure(build, count, seed):
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    recipes = [build(*synthetic(rng, i)) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del recipes
+    gc.collect()
+    return held, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recipe dict vs RecipeRecord memory benchmark")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed",  type=int, default=1)
+    args = parser.parse_args()
+
+    parse_ingredient_lines(LINES)   # warm the parser cache so neither side pays for filling it
+    print(f"{args.count} synthetic recipe(s), {len(LINES)} distinct ingredient lines\n")
+    results = {name: measure(build, args.count, args.seed) for name, build in (('dict', as_dict), ('record', as_record))}
+    print(f"  {'layout':<8} {'held MB':>9} {'bytes/recipe':>13} {'build s':>8}")
+    print("  " + "─" * 42)
+    for name, (held, elapsed) in results.items():
+        print(f"  {name:<8} {held / 1e6:>9.1f} {held / args.count:>13.0f} {elapsed:>8.2f}")
+    (dict_held, _), (record_held, _) = results['dict'], results['record']
+    print(f"\n  RecipeRecord holds {record_held / dict_held:.0%} of the dict layout's memory "
+          f"({(dict_held - record_held) / 1e6:.1f} MB saved)")
+
+
+if __name__ == "__main__":
+    main()
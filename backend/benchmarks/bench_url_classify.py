@@ -0,0 +1,111 @@
+# bench_url_classify.py
+"""
+Microbenchmark: recipe URL classification.
+Classifies a synthetic set of hrefs (recipe pages, listing pages, off-pattern
+links) with the original per-href check (raw-pattern re.search + urlparse +
+segment set) and with the compiled SiteConfig classifier, and verifies both
+agree on every href.
+
+Usage (from backend/):
+    python3 benchmarks/bench_url_classify.py
+    python3 benchmarks/bench_url_classify.py --count 100000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from site_registry import (  # noqa: E402
+    DEFAULT_CONFIG, LISTING_PATH_SEGMENTS, SITE_SEARCH_CONFIGS, get_site_config,
+)
+
+SLUG_WORDS = ["chicken", "garlic", "lemon", "pasta", "easy", "best", "vegan", "Soup", "tacos", "curry"]
+PATH_SHAPES = [
+    "/recipe/{n}/{slug}",
+    "/recipe/{slug}",
+    "/recipes/{n}-{slug}",
+    "/recipes/{slug}",
+    "/recipes/{slug}/{slug}-{n}",
+    "/recipes/{slug}-recipe",
+    "/recipes/food/views/{slug}-{n}",
+    "/{slug}-recipe-{n}",
+    "/recipes/{listing}/{slug}",
+    "/{listing}/{slug}",
+    "/{listing}",
+    "/recettes/recette_{slug}_{n}.aspx",
+    "/rezepte/{n}/{slug}.html",
+    "/cooking/recipe-ideas/{slug}",
+    "/about/{slug}",
+    "/recipes/{slug}#comments",
+    "/RECIPES/{slug}/",
+]
+
+
+def legacy_is_recipe_url(href: str, recipe_path_re: str) -> bool:
+    if not re.search(recipe_path_re, href, re.IGNORECASE):
+        return False
+    path = urlparse(href).path.lower().strip('/')
+    segments = set(path.split('/'))
+    return not (segments & LISTING_PATH_SEGMENTS)
+
+
+def legacy_config(site: str) -> dict:
+    config = SITE_SEARCH_CONFIGS.get(site, {})
+    return {'recipe_path_re': config.get('recipe_path_re', DEFAULT_CONFIG['recipe_path_re'])}
+
+
+def make_hrefs(count: int, seed: int = 326):
+    rng = random.Random(seed)
+    sites = list(SITE_SEARCH_CONFIGS) + ["budgetbytes.com", "loveandlemons.com", "smittenkitchen.com"]
+    listings = sorted(LISTING_PATH_SEGMENTS) + ["recipes", "recipe", "ideas"]
+    hrefs = []
+    for _ in range(count):
+        site = rng.choice(sites)
+        path = rng.choice(PATH_SHAPES).format(
+            n=rng.randint(1, 999999),
+            slug="-".join(rng.sample(SLUG_WORDS, rng.randint(1, 4))),
+            listing=rng.choice(listings),
+        )
+        host = rng.choice([f"www.{site}", site])
+        hrefs.append((site, f"https://{host}{path}".rstrip('/')))
+    return hrefs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recipe URL classification benchmark")
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+
+    hrefs = make_hrefs(args.count)
+
+    # Configs are looked up once per search page in both paths, so keep that out of the timing
+    patterns = {site: legacy_config(site)['recipe_path_re'] for site, _ in hrefs}
+    configs = {site: get_site_config(site) for site, _ in hrefs}
+
+    start = time.perf_counter()
+    legacy = [legacy_is_recipe_url(href, patterns[site]) for site, href in hrefs]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [configs[site].is_recipe_url(href) for site, href in hrefs]
+    compiled_s = time.perf_counter() - start
+
+    mismatches = [hrefs[i][1] for i, (a, b) in enumerate(zip(legacy, compiled)) if a != b]
+    print(f"{len(hrefs)} hrefs, {sum(legacy)} classified as recipes\n")
+    print(f"  {'path':<10} {'total ms':>9} {'µs/href':>8}")
+    print("  " + "─" * 29)
+    print(f"  {'legacy':<10} {legacy_s * 1000:>9.1f} {legacy_s / len(hrefs) * 1e6:>8.2f}")
+    print(f"  {'compiled':<10} {compiled_s * 1000:>9.1f} {compiled_s / len(hrefs) * 1e6:>8.2f}")
+    print(f"\n  speedup {legacy_s / compiled_s:.1f}x, mismatches: {len(mismatches)}")
+    for href in mismatches[:10]:
+        print(f"    {href}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 bulk_scrape.py
 ==============
 Runs scraper_v2.py sequentially across a large wordlist of recipe search terms.
-Skips queries already logged in the `search_log` Supabase table.
+Skips queries already logged in the `search_log` table.
 
 Usage:
     python bulk_scrape.py                         # Run with defaults
@@ -11,6 +11,12 @@ Usage:
     python bulk_scrape.py --dry-run               # Preview terms only
     python bulk_scrape.py --resume                # Skip already-logged queries (default ON)
     python bulk_scrape.py --category proteins     # Run only one category
+    python bulk_scrape.py --mode sitemap          # Discover via site sitemaps, no queries
+    python bulk_scrape.py --max-pages 1           # First search result page only
+    python bulk_scrape.py --parse-workers -1      # Parse on all spare cores
+    python bulk_scrape.py --archive html_archive  # Keep raw pages for reextract.py
+    python bulk_scrape.py --flush-interval 10     # Write buffered recipes at least every 10s
+    python bulk_scrape.py --storage sqlite        # Store in a local SQLite file instead of Supabase
 
 Dependencies: same as scraper_v2.py (must be in same directory)
 """
@@ -18,14 +24,15 @@ Dependencies: same as scraper_v2.py (must be in same directory)
 import argparse
 import time
 from datetime import datetime
-from supabase import create_client
-import os
 
 # ── import your existing scraper ────────────────────────────────────────────
-from scraper_v3_railway import RecipeSearchScraper, log_search
-
-SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
-SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
+from html_archive import DEFAULT_ARCHIVE_DIR
+from parse_pool import default_workers
+from recipe_writer import MAX_DELAY
+from scraper_v3_railway import MAX_SEARCH_PAGES, RecipeSearchScraper, load_recipe_sites
+from storage import (
+    SAVE_CHUNK_SIZE, SQLITE_PATH, STORAGE_BACKEND, STORAGE_BACKENDS, SUPABASE_KEY, SUPABASE_URL, get_storage,
+)
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -152,11 +159,10 @@ ALL_TERMS: list[str] = list(dict.fromkeys(
 #  HELPERS
 # ════════════════════════════════════════════════════════════════════════════
 
-def get_already_searched(supabase) -> set[str]:
+def get_already_searched(storage) -> set[str]:
     """Pull every query string already stored in search_log."""
     try:
-        rows = supabase.table("search_log").select("query").execute().data
-        return {r["query"].lower().strip() for r in rows}
+        return storage.searched_queries()
     except Exception as e:
         print(f" Could not read search_log ({e}) — proceeding without skip list.")
         return set()
@@ -175,6 +181,56 @@ def print_progress(current: int, total: int, query: str, saved: int, elapsed: fl
     )
 
 
+def open_storage(args):
+    """The storage backend chosen by --storage, or None if it cannot be used."""
+    if args.storage == "supabase" and (not SUPABASE_URL or not SUPABASE_KEY):
+        print("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY env vars.")
+        return None
+    return get_storage(args.storage, args.sqlite_path)
+
+
+def parse_workers(args) -> int:
+    return default_workers() if args.parse_workers < 0 else args.parse_workers
+
+
+def run_sitemap_mode(args):
+    sites = load_recipe_sites()
+    if args.dry_run:
+        print(f"\n--- DRY RUN — {len(sites)} site(s) whose sitemaps would be read ---")
+        for i, s in enumerate(sites, 1):
+            print(f"  {i:>3}. {s}")
+        return
+    storage = open_storage(args)
+    if storage is None:
+        return
+
+    start_time = time.time()
+    scraper = RecipeSearchScraper(parse_workers=parse_workers(args), archive_dir=args.archive,
+                                  save_chunk_size=args.save_chunk, flush_interval=args.flush_interval,
+                                  storage=storage)
+    scraper.writer.install_signal_handlers()
+    saved = scraper.sitemap_and_scrape(
+        sites=sites,
+        max_per_site=args.max_per_site,
+        scrape_delay=args.delay,
+    )
+    total_time = time.time() - start_time
+    print(
+        f"\n{'═'*60}\n"
+        f"SITEMAP CRAWL COMPLETE\n"
+        f"  Sites read    : {len(sites)}\n"
+        f"  Recipes saved : {saved}\n"
+        f"  Total time    : {int(total_time // 60)}m {int(total_time % 60)}s\n"
+        f"{'═'*60}"
+    )
+    print(f"  {scraper.fetch_stats.report()}")
+    print(f"  {scraper.retries.report()}")
+    print(f"  {scraper.writer.report()}")
+    if scraper.archive is not None:
+        print(f"  {scraper.archive.report()}")
+    scraper.close()
+
+
 # ════════════════════════════════════════════════════════════════════════════
 #  MAIN
 # ════════════════════════════════════════════════════════════════════════════
@@ -193,8 +249,30 @@ def main():
                         help="Ignore search_log and re-run all terms")
     parser.add_argument("--category",     type=str,   default=None,
                         help="Run only one category (e.g. proteins, desserts)")
+    parser.add_argument("--mode",         choices=["search", "sitemap"], default="search",
+                        help="search: run the wordlist; sitemap: crawl site sitemaps (default: search)")
+    parser.add_argument("--max-per-site", type=int,   default=50,
+                        help="Sitemap mode: max new recipe URLs per site (default: 50)")
+    parser.add_argument("--parse-workers", type=int,  default=0,
+                        help="Parse pages in this many processes; -1 = one per spare core, 0 = inline (default: 0)")
+    parser.add_argument("--max-pages",    type=int,   default=MAX_SEARCH_PAGES,
+                        help=f"Search mode: max result pages per site, more only while mostly new (default: {MAX_SEARCH_PAGES})")
+    parser.add_argument("--archive",      type=str,   default=DEFAULT_ARCHIVE_DIR,
+                        help="Archive raw pages (zstd) in this directory for reextract.py (default: $HTML_ARCHIVE_DIR, off)")
+    parser.add_argument("--save-chunk",   type=int,   default=SAVE_CHUNK_SIZE,
+                        help=f"Recipes per multi-row insert (default: {SAVE_CHUNK_SIZE})")
+    parser.add_argument("--flush-interval", type=float, default=MAX_DELAY,
+                        help=f"Write buffered recipes at least this often, in seconds (default: {MAX_DELAY})")
+    parser.add_argument("--storage",      choices=list(STORAGE_BACKENDS), default=STORAGE_BACKEND,
+                        help="Where recipes are stored (default: $RECIPE_STORAGE or supabase)")
+    parser.add_argument("--sqlite-path",  type=str,   default=SQLITE_PATH,
+                        help=f"SQLite file for --storage sqlite (default: {SQLITE_PATH})")
     args = parser.parse_args()
 
+    if args.mode == "sitemap":
+        run_sitemap_mode(args)
+        return
+
     # ── term list ────────────────────────────────────────────────────────────
     if args.category:
         cat = args.category.lower()
@@ -213,16 +291,14 @@ def main():
             print(f"  {i:>3}. {t}")
         return
 
-    # ── supabase ─────────────────────────────────────────────────────────────
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        print("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY env vars.")
+    # ── storage ──────────────────────────────────────────────────────────────
+    storage = open_storage(args)
+    if storage is None:
         return
 
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
     already_done: set[str] = set()
     if not args.no_resume:
-        already_done = get_already_searched(supabase)
+        already_done = get_already_searched(storage)
         skippable = sum(1 for t in terms if t.lower().strip() in already_done)
         print(f"  ✓ Resume mode ON — skipping {skippable} already-searched term(s)")
 
@@ -231,11 +307,15 @@ def main():
 
     if total == 0:
         print("\nAll terms already searched! Use --no-resume to re-run them.")
+        storage.close()
         return
 
     print(f"\nStarting bulk scrape — {total} term(s) to process\n")
 
-    scraper   = RecipeSearchScraper()
+    scraper   = RecipeSearchScraper(max_search_pages=args.max_pages, parse_workers=parse_workers(args),
+                                    archive_dir=args.archive, save_chunk_size=args.save_chunk,
+                                    flush_interval=args.flush_interval, storage=storage)
+    scraper.writer.install_signal_handlers()
     grand_total_saved = 0
     start_time = time.time()
 
@@ -264,6 +344,14 @@ def main():
         f"  Total time  : {int(total_time // 60)}m {int(total_time % 60)}s\n"
         f"{'═'*60}"
     )
+    if scraper.known_urls is not None:
+        print(f"  {scraper.known_urls.report()}")
+    print(f"  {scraper.fetch_stats.report()}")
+    print(f"  {scraper.retries.report()}")
+    print(f"  {scraper.writer.report()}")
+    if scraper.archive is not None:
+        print(f"  {scraper.archive.report()}")
+    scraper.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+# concurrency.py
+"""
+Adaptive concurrency control (AIMD).
+Replaces the fixed max_workers=10 with a concurrency window that is raised by
+one after every healthy window of requests and halved on congestion: a
+timeout/connection error, a 429 or 5xx, or a p95 latency that jumped well above
+the best recent p95. One window applies to the whole crawler and a smaller
+one to each host, so a single slow or rate-limiting site backs off without
+throttling the rest. Every change is printed.
+
+    controller = ConcurrencyController()
+    with controller.slot('allrecipes.com') as slot:
+        response = requests.get(url, timeout=10)
+        slot.status = response.status_code
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import requests
+
+CONGESTION_STATUS_CODES = {429}   # plus every 5xx
+CONGESTION_EXCEPTIONS = (requests.Timeout, requests.ConnectionError)
+
+GLOBAL_INITIAL = 8
+GLOBAL_MAX = 32
+HOST_INITIAL = 2
+HOST_MAX = 6
+
+
+class AIMDLimiter:
+    """
+    A concurrency window of `limit` slots. After each `window` completed
+    requests with no congestion the limit grows by `increase`; a congestion
+    signal multiplies it by `decrease`, at most once per window.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        maximum: int,
+        minimum: int = 1,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        window: int = 10,
+        latency_factor: float = 2.0,
+    ):
+        self.name = name
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.latency_factor = latency_factor
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._since_change = 0
+        self._congested = False
+        self._best_p95: Optional[float] = None
+
+    @property
+    def current(self) -> int:
+        return max(self.minimum, int(self.limit))
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.current:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: Optional[float], congested: bool, reason: str = ''):
+        with self._cond:
+            self.in_flight -= 1
+            self._since_change += 1
+            if latency is not None:
+                self._latencies.append(latency)
+            if congested and self._since_change >= self.window // 2:
+                # Multiplicative decrease, then wait half a window before cutting again
+                self._set(self.limit * self.decrease, reason)
+            elif congested:
+                self._congested = True
+            elif self._since_change >= self.window:
+                p95 = self._p95()
+                if p95 is not None and self._best_p95 is not None and p95 > self._best_p95 * self.latency_factor:
+                    self._set(self.limit * self.decrease, f"p95 {p95:.2f}s vs best {self._best_p95:.2f}s")
+                    # React to a rise, not a level: a host that simply got slower
+                    # is cut once, then grows again from the new baseline
+                    self._best_p95 = p95 / self.latency_factor
+                elif not self._congested:
+                    if p95 is not None:
+                        self._best_p95 = p95 if self._best_p95 is None else min(self._best_p95, p95)
+                    self._set(self.limit + self.increase, f"p95 {p95:.2f}s" if p95 is not None else "healthy")
+                else:
+                    self._since_change = 0
+                    self._congested = False
+            self._cond.notify_all()
+
+    def _p95(self) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def _set(self, new_limit: float, reason: str):
+        old = self.current
+        self.limit = min(float(self.maximum), max(float(self.minimum), new_limit))
+        self._since_change = 0
+        self._congested = False
+        if self.current != old:
+            arrow = "↑" if self.current > old else "↓"
+            print(f"    {arrow} concurrency[{self.name}] {old} → {self.current} ({reason})")
+
+
+class Slot:
+    """One in-flight request; set .status to the HTTP status before leaving."""
+
+    def __init__(self, controller: 'ConcurrencyController', host: str, track_latency: bool):
+        self.controller = controller
+        self.host = host
+        self.track_latency = track_latency
+        self.status: Optional[int] = None
+        self._started = 0.0
+
+    def __enter__(self):
+        # Host first: a request blocked on its host must not hold a global slot
+        self.controller.host_limiter(self.host).acquire()
+        self.controller.global_limiter.acquire()
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        latency = time.monotonic() - self._started if self.track_latency else None
+        reason = ''
+        if exc_type is not None and issubclass(exc_type, CONGESTION_EXCEPTIONS):
+            reason = exc_type.__name__
+        elif self.status in CONGESTION_STATUS_CODES or (self.status or 0) >= 500:
+            reason = f"HTTP {self.status}"
+        congested = bool(reason)
+        self.controller.global_limiter.release(latency, congested, f"{self.host}: {reason}")
+        self.controller.host_limiter(self.host).release(latency, congested, reason)
+        return False
+
+
+class ConcurrencyController:
+    """Global AIMD window plus one per host."""
+
+    def __init__(
+        self,
+        global_initial: int = GLOBAL_INITIAL,
+        global_max: int = GLOBAL_MAX,
+        host_initial: int = HOST_INITIAL,
+        host_max: int = HOST_MAX,
+    ):
+        global_max = max(global_max, 1)
+        self.global_limiter = AIMDLimiter('global', min(global_initial, global_max), global_max)
+        self.host_initial = host_initial
+        self.host_max = host_max
+        self._hosts: Dict[str, AIMDLimiter] = {}
+        self._lock = threading.Lock()
+
+    def host_limiter(self, host: str) -> AIMDLimiter:
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = AIMDLimiter(host, self.host_initial, self.host_max, window=4)
+                self._hosts[host] = limiter
+            return limiter
+
+    def slot(self, host: str, track_latency: bool = True) -> Slot:
+        return Slot(self, host, track_latency)
+
+    @property
+    def max_workers(self) -> int:
+        """Thread pool size that lets the global window reach its maximum."""
+        return self.global_limiter.maximum
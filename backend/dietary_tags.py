@@ -0,0 +1,432 @@
+# dietary_tags.py
+"""
+Dietary tagging engine.
+Every keyword below is compiled once into a single trie-shaped regex, and the
+joined ingredient text is scanned once to collect the terms it contains: as
+whole words for the ingredient lists, as plain substrings for the "signal"
+phrases (so 'light' still matches 'lightly', as it always has). Each tag is
+then a set intersection against the matched terms instead of its own loop of
+re.search calls.
+
+    tags = tag_recipe(scraper)                # ['vegetarian', 'nut-free', ...]
+    tags = dietary_tags(context)              # same, from an ExtractionContext
+    tagger_version()                          # rules version, stored next to the tags
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import extraction_context
+from extraction_context import ExtractionContext
+
+# Bump on any change to how tags are computed from the keyword sets below:
+# dietary_tags(), TermMatcher / _trie_regex, parse_amount() and its units,
+# or retag.py's batch rules. Keyword edits change the version by themselves.
+TAGGER_REVISION = 1
+
+# ═══════════════════════════════════════════════════════════════
+#  KEYWORD SETS
+#  Ingredient sets match whole words; *_SIGNALS match anywhere.
+# ═══════════════════════════════════════════════════════════════
+
+NON_VEGAN = frozenset({
+    # Meat
+    'meat', 'chicken', 'beef', 'pork', 'ham', 'bacon', 'sausage',
+    'turkey', 'lamb', 'duck', 'veal', 'goat', 'rabbit', 'venison',
+    'salami', 'pepperoni', 'prosciutto',
+    # Seafood
+    'fish', 'anchovy', 'anchovies', 'shrimp', 'prawn', 'prawns',
+    'crab', 'lobster', 'shellfish', 'salmon', 'tuna', 'cod',
+    'sardine', 'sardines', 'mussel', 'mussels', 'clam', 'clams',
+    'oyster', 'oysters', 'scallop', 'scallops', 'squid', 'octopus',
+    # Dairy
+    'milk', 'cheese', 'butter', 'cream', 'ghee', 'whey', 'casein',
+    'lactose', 'lactalbumin', 'kefir', 'buttermilk', 'custard',
+    'yogurt', 'yoghurt',
+    # Eggs
+    'egg', 'eggs', 'albumin', 'albumen', 'mayonnaise', 'meringue',
+    # Animal-derived additives
+    'honey', 'gelatin', 'lard', 'suet', 'tallow', 'rennet',
+    'isinglass', 'carmine', 'cochineal', 'shellac', 'collagen',
+    'lanolin',
+})
+
+NON_VEG = frozenset({
+    # Meat
+    'meat', 'chicken', 'beef', 'pork', 'ham', 'bacon', 'sausage',
+    'turkey', 'lamb', 'duck', 'veal', 'goat', 'rabbit', 'venison',
+    'bison', 'quail', 'goose', 'salami', 'pepperoni', 'prosciutto',
+    # Seafood
+    'fish', 'salmon', 'tuna', 'cod', 'tilapia', 'sardine', 'sardines',
+    'herring', 'mackerel', 'anchovy', 'anchovies', 'shrimp', 'prawn',
+    'prawns', 'crab', 'lobster', 'squid', 'octopus', 'scallop', 'scallops',
+    'clam', 'clams', 'oyster', 'oysters', 'mussel', 'mussels',
+    # Animal-derived
+    'lard', 'suet', 'tallow', 'gelatin', 'rennet', 'isinglass',
+    'carmine', 'cochineal', 'dashi',
+})
+
+LAND_MEAT = frozenset({
+    'chicken', 'beef', 'pork', 'bacon', 'ham', 'sausage', 'lamb',
+    'turkey', 'duck', 'veal', 'lard', 'suet', 'meat', 'gelatin',
+    'chorizo', 'salami', 'pepperoni', 'prosciutto', 'brisket',
+})
+
+GLUTEN_SOURCES = frozenset({
+    'flour', 'wheat', 'barley', 'rye', 'spelt', 'farro', 'bulgur',
+    'semolina', 'durum', 'triticale', 'malt', 'bread', 'breadcrumbs',
+    'pasta', 'noodles', 'couscous', 'cracker', 'tortilla', 'pita',
+    'soy sauce', 'teriyaki', 'panko', 'seitan', 'beer',
+})
+GLUTEN_FREE_SIGNALS = frozenset({
+    'gluten-free', 'gluten free', 'gf flour', 'rice flour',
+    'almond flour', 'coconut flour', 'tapioca flour',
+})
+
+DAIRY_SOURCES = frozenset({
+    'milk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt',
+    'whey', 'casein', 'lactose', 'ghee', 'kefir', 'sour cream',
+    'half-and-half', 'half and half', 'ice cream', 'custard',
+    'bechamel', 'béchamel',
+})
+DAIRY_FREE_SIGNALS = frozenset({
+    'dairy-free', 'dairy free', 'non-dairy', 'nondairy',
+    'lactose-free', 'lactose free', 'plant-based milk',
+    'almond milk', 'oat milk', 'soy milk', 'coconut milk',
+    'vegan butter', 'vegan cheese',
+})
+
+NUT_SOURCES = frozenset({
+    'almond', 'almonds', 'cashew', 'cashews', 'walnut', 'walnuts',
+    'pecan', 'pecans', 'pistachio', 'pistachios', 'hazelnut', 'hazelnuts',
+    'macadamia', 'pine nut', 'pine nuts', 'brazil nut', 'brazil nuts',
+    'peanut', 'peanuts', 'peanut butter', 'nut butter', 'almond butter',
+    'almond flour', 'almond milk', 'marzipan', 'praline', 'nutella',
+    'mixed nuts', 'chopped nuts',
+})
+
+SHELLFISH_SOURCES = frozenset({
+    'shrimp', 'prawn', 'prawns', 'crab', 'lobster', 'crayfish',
+    'crawfish', 'scallop', 'scallops', 'clam', 'clams', 'oyster',
+    'oysters', 'mussel', 'mussels', 'barnacle', 'krill',
+    'cuttlefish', 'squid', 'calamari', 'octopus',
+    'seafood sauce', 'shrimp paste', 'fish sauce',
+})
+
+HIGH_SUGAR_CARB = frozenset({
+    'sugar', 'brown sugar', 'powdered sugar', 'caster sugar',
+    'corn syrup', 'high fructose', 'honey', 'maple syrup', 'agave',
+    'molasses', 'jam', 'jelly', 'condensed milk', 'caramel',
+    'frosting', 'icing', 'candy', 'chocolate chips',
+    'white rice', 'white bread', 'white flour', 'pasta',
+    'potato', 'potatoes', 'sweet potato',
+})
+LOW_SUGAR_SIGNALS = frozenset({
+    'sugar-free', 'sugar free', 'no sugar', 'zero sugar',
+    'diabetic', 'low-carb', 'low carb', 'no added sugar',
+})
+
+KETO_DISQUALIFIERS = frozenset({
+    'sugar', 'honey', 'maple syrup', 'corn syrup', 'agave',
+    'white flour', 'wheat flour', 'bread', 'pasta', 'rice',
+    'potato', 'oat', 'oats', 'oatmeal', 'beans', 'lentils',
+    'chickpeas', 'corn', 'tortilla', 'cracker', 'granola',
+})
+KETO_SIGNALS = frozenset({'keto', 'ketogenic', 'low-carb', 'low carb'})
+
+LOW_CAL_SIGNALS = frozenset({
+    'low-calorie', 'low calorie', 'light', 'diet', 'reduced-fat',
+    'reduced fat', 'low-fat', 'low fat', 'skinny', 'low-cal',
+    'low cal', 'lowcal', 'lowfat',
+})
+
+HIGH_PROTEIN_INGREDIENTS = frozenset({
+    'chicken', 'beef', 'pork', 'turkey', 'tuna', 'salmon', 'egg',
+    'eggs', 'lentils', 'chickpeas', 'black beans', 'edamame',
+    'tofu', 'tempeh', 'cottage cheese', 'greek yogurt',
+    'protein powder', 'whey', 'quinoa',
+})
+HIGH_PROTEIN_SIGNALS = frozenset({
+    'high-protein', 'high protein', 'protein-packed', 'protein packed',
+})
+
+HARAM_INGREDIENTS = frozenset({
+    'pork', 'bacon', 'ham', 'lard', 'prosciutto', 'pepperoni',
+    'salami', 'sausage', 'chorizo', 'gelatin', 'beer', 'wine',
+    'alcohol', 'liqueur', 'rum', 'vodka', 'whiskey', 'brandy',
+    'sake', 'mirin', 'cooking wine',
+})
+HALAL_SIGNALS = frozenset({'halal'})
+
+TREIF_INGREDIENTS = frozenset({
+    'pork', 'bacon', 'ham', 'lard', 'prosciutto', 'pepperoni',
+    'salami', 'chorizo', 'shrimp', 'crab', 'lobster', 'clam',
+    'oyster', 'mussel', 'scallop', 'squid', 'calamari', 'octopus',
+    'rabbit', 'catfish', 'eel',
+})
+# Kosher cannot mix meat and dairy
+KOSHER_MEAT_WORDS = frozenset({
+    'chicken', 'beef', 'lamb', 'turkey', 'meat', 'steak',
+    'veal', 'brisket', 'ground beef', 'ground turkey',
+})
+KOSHER_DAIRY_WORDS = frozenset({
+    'milk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt',
+    'whey', 'sour cream', 'half and half',
+})
+KOSHER_SIGNALS = frozenset({'kosher'})
+
+BEEF_SOURCES = frozenset({
+    'beef', 'steak', 'brisket', 'veal', 'ground beef', 'ribeye',
+    'sirloin', 'chuck', 'short rib', 'oxtail', 'beef broth',
+    'beef stock', 'beef bouillon', 'suet', 'lard',
+})
+HINDU_SIGNALS = frozenset({'hindu'})
+
+# Buddhist - typically no meat and sometimes no alliums
+ALLIUMS = frozenset({
+    'garlic', 'onion', 'onions', 'leek', 'leeks', 'shallot',
+    'shallots', 'chive', 'chives', 'scallion', 'scallions',
+    'spring onion',
+})
+BUDDHIST_MEAT_SOURCES = frozenset({
+    'chicken', 'beef', 'pork', 'lamb', 'turkey', 'duck', 'veal',
+    'bacon', 'ham', 'sausage', 'fish', 'shrimp', 'crab', 'lobster',
+})
+BUDDHIST_SIGNALS = frozenset({'buddhist'})
+
+HIGH_SODIUM_INGREDIENTS = frozenset({
+    'soy sauce', 'salt', 'table salt', 'kosher salt', 'sea salt',
+    'fish sauce', 'oyster sauce', 'worcestershire', 'anchovies',
+    'capers', 'olives', 'pickles', 'miso', 'tamari',
+    'canned tomatoes', 'canned beans', 'stock', 'broth', 'bouillon',
+    'deli meat', 'bacon', 'ham', 'sausage', 'salami', 'pepperoni',
+})
+LOW_SODIUM_SIGNALS = frozenset({
+    'low-sodium', 'low sodium', 'no salt', 'unsalted',
+    'reduced sodium', 'sodium-free', 'sodium free',
+})
+
+PALEO_DISQUALIFIERS = frozenset({
+    'sugar', 'brown sugar', 'white sugar', 'cane sugar', 'powdered sugar',
+    'caster sugar', 'corn syrup', 'high fructose', 'artificial sweetener',
+    'splenda', 'aspartame', 'sucralose',
+    # grains
+    'wheat', 'flour', 'bread', 'pasta', 'rice', 'oat', 'oats', 'oatmeal',
+    'barley', 'rye', 'corn', 'cornmeal', 'cornstarch', 'couscous',
+    'quinoa', 'granola', 'cereal', 'cracker', 'tortilla', 'breadcrumbs',
+    # legumes
+    'beans', 'lentils', 'chickpeas', 'peanut', 'peanuts', 'peanut butter',
+    'soy', 'tofu', 'tempeh', 'edamame', 'miso', 'soy sauce', 'tamari',
+    # dairy
+    'milk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt',
+    'whey', 'casein', 'ghee', 'kefir', 'sour cream', 'ice cream',
+    # processed / industrial
+    'canola oil', 'vegetable oil', 'soybean oil', 'corn oil',
+    'margarine', 'shortening', 'msg', 'maltodextrin',
+})
+PALEO_SIGNALS = frozenset({'paleo', 'paleolithic', 'primal'})
+
+WORD_TERMS = (
+    NON_VEGAN | NON_VEG | LAND_MEAT | GLUTEN_SOURCES | DAIRY_SOURCES | NUT_SOURCES
+    | SHELLFISH_SOURCES | HIGH_SUGAR_CARB | KETO_DISQUALIFIERS | HIGH_PROTEIN_INGREDIENTS
+    | HARAM_INGREDIENTS | TREIF_INGREDIENTS | KOSHER_MEAT_WORDS | KOSHER_DAIRY_WORDS
+    | BEEF_SOURCES | ALLIUMS | BUDDHIST_MEAT_SOURCES | HIGH_SODIUM_INGREDIENTS
+    | PALEO_DISQUALIFIERS
+)
+SUBSTRING_TERMS = (
+    GLUTEN_FREE_SIGNALS | DAIRY_FREE_SIGNALS | LOW_SUGAR_SIGNALS | KETO_SIGNALS
+    | LOW_CAL_SIGNALS | HIGH_PROTEIN_SIGNALS | HALAL_SIGNALS | KOSHER_SIGNALS
+    | HINDU_SIGNALS | BUDDHIST_SIGNALS | LOW_SODIUM_SIGNALS | PALEO_SIGNALS
+)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  MATCHER
+# ═══════════════════════════════════════════════════════════════
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """
+    An alternation of `terms` shaped as a prefix trie. At any position it
+    matches the longest term starting there; every shorter term starting
+    there is a prefix of that one.
+    """
+    trie: Dict[str, Dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'   # what \w means for str patterns
+
+
+class TermMatcher:
+    """
+    Finds which of `word_terms` occur in a text as whole words (like
+    re.search(rf'\\b{term}\\b')) and which of `substring_terms` occur at all
+    (like `term in text`), in one left-to-right scan.
+    """
+
+    def __init__(self, word_terms: Iterable[str], substring_terms: Iterable[str]):
+        word_terms, substring_terms = frozenset(word_terms), frozenset(substring_terms)
+        for term in word_terms:
+            if not (_is_word_char(term[0]) and _is_word_char(term[-1])):
+                raise ValueError(f"word term must start and end with a word character: {term!r}")
+        all_terms = word_terms | substring_terms
+        self._pattern = re.compile(f"(?=({_trie_regex(all_terms)}))")
+        # Longest match -> every term that starts at the same place:
+        # (term, length, whole-word term?, substring term?)
+        self._candidates: Dict[str, Tuple[Tuple[str, int, bool, bool], ...]] = {
+            longest: tuple(
+                (term, len(term), term in word_terms, term in substring_terms)
+                for term in all_terms if longest.startswith(term)
+            )
+            for longest in all_terms
+        }
+
+    def scan(self, text: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """(whole-word terms found, substring terms found)."""
+        words: Set[str] = set()
+        substrings: Set[str] = set()
+        size = len(text)
+        for m in self._pattern.finditer(text):
+            start = m.start()
+            starts_word = start == 0 or not _is_word_char(text[start - 1])
+            for term, length, is_word, is_substring in self._candidates[m.group(1)]:
+                if is_substring:
+                    substrings.add(term)
+                if is_word and starts_word:
+                    end = start + length
+                    if end == size or not _is_word_char(text[end]):
+                        words.add(term)
+        return frozenset(words), frozenset(substrings)
+
+
+_MATCHER: Optional[TermMatcher] = None
+
+
+def get_matcher() -> TermMatcher:
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = TermMatcher(WORD_TERMS, SUBSTRING_TERMS)
+    return _MATCHER
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TAG RULES
+# ═══════════════════════════════════════════════════════════════
+
+def dietary_tags(context: ExtractionContext, matcher: Optional[TermMatcher] = None) -> List[str]:
+    """
+    Tags for one recipe, from its extraction context. Rules that look at
+    nutrition numbers fall back to ingredient keywords when the nutrition
+    data can't be read. [] if the recipe has no readable ingredients.
+    """
+    try:
+        text = context.text
+    except Exception:
+        return []
+    words, signals = (matcher or get_matcher()).scan(text)
+    tags = []
+
+    if not NON_VEGAN & words:
+        tags.append('vegan')
+    elif not NON_VEG & words:
+        tags.append('vegetarian')
+    if not LAND_MEAT & words:
+        tags.append('pescatarian')
+
+    if GLUTEN_FREE_SIGNALS & signals or not GLUTEN_SOURCES & words:
+        tags.append('gluten-free')
+    if DAIRY_FREE_SIGNALS & signals or not DAIRY_SOURCES & words:
+        tags.append('lactose-free')
+    if not NUT_SOURCES & words:
+        tags.append('nut-free')
+    if not SHELLFISH_SOURCES & words:
+        tags.append('shellfish-free')
+
+    # Diabetic-Friendly (flags high-sugar / high-carb) -- not perfect
+    has_ls_signal = bool(LOW_SUGAR_SIGNALS & signals)
+    has_high_sc = bool(HIGH_SUGAR_CARB & words)
+    amounts = context.amounts('sugarContent', 'carbohydrateContent')
+    if amounts is None:
+        if has_ls_signal or not has_high_sc:
+            tags.append('diabetic-friendly')
+    else:
+        sugar_g, carb_g = amounts
+        if ((sugar_g is not None and carb_g is not None and sugar_g <= 10 and carb_g <= 30)
+                or (has_ls_signal and not has_high_sc)):
+            tags.append('diabetic-friendly')
+
+    keto_by_keywords = bool(KETO_SIGNALS & signals) and not KETO_DISQUALIFIERS & words
+    amounts = context.amounts('carbohydrateContent')
+    if (amounts is not None and amounts[0] is not None and amounts[0] <= 10) or keto_by_keywords:
+        tags.append('keto')
+
+    amounts = context.amounts('calories')
+    if (amounts is not None and amounts[0] is not None and amounts[0] <= 400) or LOW_CAL_SIGNALS & signals:
+        tags.append('low-calorie')
+
+    amounts = context.amounts('proteinContent')
+    if ((amounts is not None and amounts[0] is not None and amounts[0] >= 20)
+            or HIGH_PROTEIN_SIGNALS & signals or HIGH_PROTEIN_INGREDIENTS & words):
+        tags.append('high-protein')
+
+    if HALAL_SIGNALS & signals or not HARAM_INGREDIENTS & words:
+        tags.append('halal')
+    has_meat_and_dairy = bool(KOSHER_MEAT_WORDS & words) and bool(KOSHER_DAIRY_WORDS & words)
+    if KOSHER_SIGNALS & signals or (not TREIF_INGREDIENTS & words and not has_meat_and_dairy):
+        tags.append('kosher')
+    if HINDU_SIGNALS & signals or not BEEF_SOURCES & words:
+        tags.append('hindu-friendly')
+    if BUDDHIST_SIGNALS & signals or not (BUDDHIST_MEAT_SOURCES | ALLIUMS) & words:
+        tags.append('buddhist-friendly')
+
+    amounts = context.amounts('sodiumContent')
+    if ((amounts is not None and amounts[0] is not None and amounts[0] <= 600)
+            or LOW_SODIUM_SIGNALS & signals or not HIGH_SODIUM_INGREDIENTS & words):
+        tags.append('low-sodium')
+
+    if PALEO_SIGNALS & signals or not PALEO_DISQUALIFIERS & words:
+        tags.append('paleo')
+    return tags
+
+
+def tag_recipe(scraper) -> List[str]:
+    """dietary_tags() straight from a recipe_scrapers scraper."""
+    return dietary_tags(ExtractionContext(scraper))
+
+
+# ═══════════════════════════════════════════════════════════════
+#  VERSION
+# ═══════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=None)
+def tagger_version() -> str:
+    """
+    Hash of the tag rules' data (every keyword set and the nutrient units)
+    and TAGGER_REVISION, which covers the code. Stored in each row's
+    tagger_version column, so a rule change can be rolled out by re-tagging
+    only the rows with another version (retag.py --stale); comment or
+    formatting edits leave it alone.
+    """
+    h = hashlib.sha256(f"revision={TAGGER_REVISION}\n".encode('utf-8'))
+    for name, value in sorted(globals().items()):
+        if isinstance(value, frozenset):
+            h.update(f"{name}={sorted(value)}\n".encode('utf-8'))
+    h.update(repr(sorted(extraction_context.NUTRIENT_UNITS.items())).encode('utf-8'))
+    h.update(repr(sorted(extraction_context._UNITS.items())).encode('utf-8'))
+    return h.hexdigest()[:12]
@@ -0,0 +1,113 @@
+# extraction_context.py
+"""
+Per-recipe extraction context.
+Built once per page around its recipe scraper, so that ingredients(),
+nutrients() and the numbers parsed out of the nutrition strings are each
+computed once and shared by parse_recipe(), the nutrient columns and the
+dietary tag rules — instead of every rule calling the scraper and
+re-parsing the strings itself.
+
+    context = ExtractionContext(scraper)
+    context.text                      # ingredients, joined and lowercased
+    context.amount('sodiumContent')   # 1.2 g -> 1200.0 (mg)
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+# Unit each nutrient's number is normalized to; anything not listed is grams
+NUTRIENT_UNITS = {
+    'calories': 'kcal',
+    'sodiumContent': 'mg',
+    'cholesterolContent': 'mg',
+}
+
+# unit as written -> (quantity, factor to the base unit: grams or kcal)
+_UNITS: Dict[str, Tuple[str, float]] = {
+    'g': ('mass', 1.0), 'gram': ('mass', 1.0), 'grams': ('mass', 1.0),
+    'mg': ('mass', 1e-3), 'milligram': ('mass', 1e-3), 'milligrams': ('mass', 1e-3),
+    'mcg': ('mass', 1e-6), 'µg': ('mass', 1e-6), 'μg': ('mass', 1e-6), 'ug': ('mass', 1e-6),
+    'kg': ('mass', 1e3),
+    'kcal': ('energy', 1.0), 'cal': ('energy', 1.0), 'calorie': ('energy', 1.0),
+    'calories': ('energy', 1.0), 'kilocalories': ('energy', 1.0),
+    'kj': ('energy', 1 / 4.184), 'kilojoules': ('energy', 1 / 4.184),
+}
+_TARGET_FACTOR = {'g': 1.0, 'mg': 1e-3, 'kcal': 1.0}
+
+_AMOUNT = re.compile(r'([\d.]+)\s*([^\W\d_]*)')
+_THOUSANDS = re.compile(r'(?<=\d),(?=\d{3}\b)')
+
+
+class _Unreadable(Exception):
+    pass
+
+
+def parse_amount(value, unit: str = 'g') -> Optional[float]:
+    """
+    The leading number of a nutrition string in `unit` ('g', 'mg' or 'kcal'),
+    converting from the unit written after it ('1.2 g' sodium -> 1200.0 mg).
+    None for an empty value; raises ValueError/TypeError if there is no number.
+    """
+    if not value:
+        return None
+    m = _AMOUNT.search(_THOUSANDS.sub('', value))
+    if m is None:
+        raise ValueError(f"no number in {value!r}")
+    number = float(m.group(1))
+    written = _UNITS.get(m.group(2).lower())
+    if written is None:
+        return number   # no unit, or one we don't know: assume it's already `unit`
+    quantity, factor = written
+    if quantity != ('energy' if unit == 'kcal' else 'mass'):
+        return number
+    return number * factor / _TARGET_FACTOR[unit]
+
+
+class ExtractionContext:
+    """Lazily computed, cached inputs of one recipe's extraction."""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self._amounts: Dict[str, object] = {}
+
+    @cached_property
+    def ingredients(self) -> List[str]:
+        return self.scraper.ingredients()
+
+    @cached_property
+    def text(self) -> str:
+        return ' '.join(self.ingredients).lower()
+
+    @cached_property
+    def nutrients(self) -> Optional[Dict]:
+        """The scraper's nutrients() ({} if it has none), or None if reading it failed."""
+        try:
+            return self.scraper.nutrients() or {}
+        except Exception:
+            return None
+
+    def amount(self, key: str) -> Optional[float]:
+        """
+        Numeric value of nutrient `key` in its NUTRIENT_UNITS unit, None if
+        the recipe doesn't list it. Raises ValueError if the nutrition data
+        or this value can't be read.
+        """
+        if key not in self._amounts:
+            try:
+                if self.nutrients is None:
+                    raise _Unreadable("nutrients unavailable")
+                self._amounts[key] = parse_amount(self.nutrients.get(key, ''), NUTRIENT_UNITS.get(key, 'g'))
+            except Exception as e:
+                self._amounts[key] = _Unreadable(str(e))
+        value = self._amounts[key]
+        if isinstance(value, _Unreadable):
+            raise ValueError(f"{key}: {value}")
+        return value
+
+    def amounts(self, *keys: str) -> Optional[List[Optional[float]]]:
+        """amount() for each key, or None if any of them can't be read."""
+        try:
+            return [self.amount(key) for key in keys]
+        except ValueError:
+            return None
@@ -0,0 +1,108 @@
+# fetch.py
+"""
+Bounded page fetch.
+Recipe pages are streamed instead of read whole: Content-Type and
+Content-Length are checked from the headers before any body is downloaded,
+the (already incrementally decompressed) body is read in chunks, and the
+download is abandoned once it passes a byte cap. PDFs, images and runaway
+pages that happen to match a recipe URL pattern no longer cost a full
+download and a parse attempt.
+
+    stats = FetchStats()
+    page = fetch_page(url, headers, stats=stats)
+    scrape_html(html=page.content, org_url=url)
+    print(stats.report())
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+
+DEFAULT_MAX_BYTES = int(os.environ.get("MAX_PAGE_BYTES", 5 * 1024 * 1024))
+CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+class FetchRejected(requests.RequestException):
+    """The response was not downloaded (wrong type, or too large)."""
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    status_code: int
+    headers: requests.structures.CaseInsensitiveDict
+    content: bytes
+
+
+class FetchStats:
+    """Per-run download counters; safe to share across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.bytes_read = 0
+        self.rejected_type = 0
+        self.rejected_size = 0
+        self.aborted = 0
+        self.bytes_saved = 0    # declared Content-Length not downloaded (lower bound)
+
+    def _add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self) -> str:
+        return (f"Fetch: {self.fetched} page(s), {self.bytes_read / 1e6:.1f} MB read, "
+                f"{self.rejected_type} non-HTML / {self.rejected_size + self.aborted} oversized skipped, "
+                f"~{self.bytes_saved / 1e6:.1f} MB saved")
+
+
+def _declared_length(headers) -> Optional[int]:
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_page(
+    url: str,
+    headers: Dict[str, str],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    timeout: float = 15,
+    stats: Optional[FetchStats] = None,
+) -> FetchedPage:
+    """
+    GET `url` as HTML, reading at most `max_bytes` of decoded body.
+    Raises FetchRejected for non-HTML or oversized responses, and
+    requests.HTTPError for error statuses. 304 responses return empty content.
+    """
+    stats = stats or FetchStats()
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304:
+            return FetchedPage(url, 304, response.headers, b'')
+        response.raise_for_status()
+
+        declared = _declared_length(response.headers)
+        content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            stats._add(rejected_type=1, bytes_saved=declared or 0)
+            raise FetchRejected(f"not HTML ({content_type})")
+        if declared is not None and declared > max_bytes:
+            stats._add(rejected_size=1, bytes_saved=declared)
+            raise FetchRejected(f"too large ({declared} bytes declared)")
+
+        chunks = []
+        read = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            read += len(chunk)
+            if read > max_bytes:
+                saved = max(declared - read, 0) if declared is not None else 0
+                stats._add(aborted=1, bytes_read=read, bytes_saved=saved)
+                raise FetchRejected(f"too large (over {max_bytes} bytes)")
+            chunks.append(chunk)
+        stats._add(fetched=1, bytes_read=read)
+        return FetchedPage(url, response.status_code, response.headers, b''.join(chunks))
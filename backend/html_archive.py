@@ -0,0 +1,185 @@
+# html_archive.py
+"""
+Raw-HTML archive.
+Every fetched recipe page is kept as its own zstd frame, appended to a
+segment file (seg-000001.zst, …, rolled at SEGMENT_BYTES). A SQLite index
+maps URL and fetch time to the segment, offset and length of the frame, so
+any page can be read back with one seek, and re-extraction can walk the
+latest copy of every URL in file order. A page whose bytes haven't changed
+since its last archived copy is not stored again.
+
+Enable it with RecipeSearchScraper(archive_dir=...), bulk_scrape.py
+--archive DIR or HTML_ARCHIVE_DIR; reextract.py re-runs extraction over it.
+
+    with HtmlArchive("html_archive") as archive:
+        archive.put(url, html_bytes, response_headers)
+        page = archive.latest(url)          # ArchivedPage(url, fetched_at, headers, content)
+        for page in archive.iter_latest():
+            ...
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import zstandard
+
+DEFAULT_ARCHIVE_DIR = os.environ.get("HTML_ARCHIVE_DIR") or None   # None: archiving off
+SEGMENT_BYTES = 256 * 1024 * 1024
+COMPRESSION_LEVEL = 10
+INDEX_FILE = "index.sqlite3"
+
+_SCHEMA = """
+create table if not exists pages (
+    id            integer primary key,
+    url           text    not null,
+    fetched_at    real    not null,
+    segment       integer not null,
+    offset        integer not null,
+    length        integer not null,
+    raw_length    integer not null,
+    content_hash  text    not null,
+    etag          text,
+    last_modified text
+);
+create index if not exists pages_url_fetched_idx on pages (url, fetched_at);
+"""
+_INDEX_COLUMNS = "url, fetched_at, segment, offset, length, etag, last_modified"
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    fetched_at: float
+    headers: Dict[str, str]
+    content: bytes
+
+
+class HtmlArchive:
+    def __init__(self, directory: str, segment_bytes: int = SEGMENT_BYTES, level: int = COMPRESSION_LEVEL):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, INDEX_FILE), check_same_thread=False)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.execute("pragma synchronous=normal")
+        self._db.executescript(_SCHEMA)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self.stored = 0
+        self.unchanged = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        last = self._db.execute("select max(segment) from pages").fetchone()[0]
+        self._segment = last or 1
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"seg-{segment:06d}.zst")
+
+    # ── writing ──────────────────────────────────────────────────
+
+    def put(self, url: str, html: bytes, headers=None, fetched_at: Optional[float] = None) -> bool:
+        """Archive one page; False if it matches the URL's latest copy."""
+        headers = headers or {}
+        digest = hashlib.sha256(html).hexdigest()
+        with self._lock:
+            row = self._db.execute(
+                "select content_hash from pages where url = ? order by fetched_at desc limit 1", (url,)
+            ).fetchone()
+            if row is not None and row[0] == digest:
+                self.unchanged += 1
+                return False
+            frame = self._compressor.compress(html)
+            offset = self._file.tell()
+            if offset and offset + len(frame) > self.segment_bytes:
+                self._file.close()
+                self._segment += 1
+                self._file = open(self._segment_path(self._segment), "ab")
+                offset = 0
+            # Frame first, then its index row: a crash in between leaves only
+            # an unreferenced frame behind
+            self._file.write(frame)
+            self._file.flush()
+            self._db.execute(
+                "insert into pages (url, fetched_at, segment, offset, length, raw_length, content_hash,"
+                " etag, last_modified) values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, fetched_at or time.time(), self._segment, offset, len(frame), len(html), digest,
+                 headers.get('ETag'), headers.get('Last-Modified')),
+            )
+            self._db.commit()
+            self.stored += 1
+            self.bytes_in += len(html)
+            self.bytes_out += len(frame)
+        return True
+
+    # ── reading ──────────────────────────────────────────────────
+
+    def _read(self, entries: List[Tuple]) -> Iterator[ArchivedPage]:
+        """Pages for index rows (url, fetched_at, segment, offset, length, etag, last_modified)."""
+        decompressor = zstandard.ZstdDecompressor()
+        handles: Dict[int, object] = {}
+        try:
+            for url, fetched_at, segment, offset, length, etag, last_modified in entries:
+                f = handles.get(segment)
+                if f is None:
+                    f = handles[segment] = open(self._segment_path(segment), "rb")
+                f.seek(offset)
+                headers = {k: v for k, v in (('ETag', etag), ('Last-Modified', last_modified)) if v}
+                yield ArchivedPage(url, fetched_at, headers, decompressor.decompress(f.read(length)))
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def latest(self, url: str) -> Optional[ArchivedPage]:
+        with self._lock:
+            entry = self._db.execute(
+                f"select {_INDEX_COLUMNS} from pages where url = ? order by fetched_at desc limit 1", (url,)
+            ).fetchone()
+        return next(self._read([entry]), None) if entry else None
+
+    def iter_latest(self, url_like: Optional[str] = None, since: Optional[float] = None) -> Iterator[ArchivedPage]:
+        """
+        The newest copy of every archived URL (optionally only URLs matching
+        the SQL LIKE pattern `url_like`, fetched at or after `since`), in
+        segment order so the files are read front to back.
+        """
+        query = (f"select {_INDEX_COLUMNS} from pages p"
+                 " where fetched_at = (select max(fetched_at) from pages where url = p.url)")
+        params: List = []
+        if url_like:
+            query += " and url like ?"
+            params.append(url_like)
+        if since:
+            query += " and fetched_at >= ?"
+            params.append(since)
+        with self._lock:
+            entries = self._db.execute(query + " order by segment, offset", params).fetchall()
+        return self._read(entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("select count(distinct url) from pages").fetchone()[0]
+
+    # ── lifecycle ────────────────────────────────────────────────
+
+    def report(self) -> str:
+        ratio = f", {self.bytes_in / self.bytes_out:.1f}x compression" if self.bytes_out else ""
+        return (f"HTML archive: {self.stored} page(s) stored ({self.bytes_out / 1e6:.1f} MB{ratio}), "
+                f"{self.unchanged} unchanged")
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
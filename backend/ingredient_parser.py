@@ -0,0 +1,270 @@
+# ingredient_parser.py
+"""
+Structured ingredient lines.
+Splits a raw ingredient string into quantity, unit, ingredient name and
+preparation notes, and maps the name to a canonical ingredient id, so that
+"2 cups all-purpose flour, sifted" and "flour" both come out as 'flour'.
+
+Recipe pages repeat the same lines endlessly ("1 tsp salt", "2 large
+eggs"), so parse_ingredient() is memoized with an LRU cache keyed on the
+raw string; the parsed results are immutable and safe to share.
+
+    parse_ingredient("2 cups all-purpose flour, sifted")
+    # ParsedIngredient(quantity=2.0, quantity_max=None, unit='cup',
+    #                  name='all-purpose flour', preparation='sifted', ingredient_id='flour')
+
+parse_recipe() keeps parse_ingredient_lines() of every page on its
+RecipeRecord, stored in the ingredients_parsed column; backfill_ingredients.py fills it in for rows
+scraped before it existed.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+CACHE_SIZE = 8192
+
+_UNICODE_FRACTIONS = {
+    '½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4', '⅕': '1/5', '⅖': '2/5',
+    '⅗': '3/5', '⅘': '4/5', '⅙': '1/6', '⅚': '5/6', '⅛': '1/8', '⅜': '3/8', '⅝': '5/8', '⅞': '7/8',
+}
+
+# unit as written (lowercase, no trailing '.') -> canonical unit
+UNITS: Dict[str, str] = {
+    'teaspoon': 'tsp', 'teaspoons': 'tsp', 'tsp': 'tsp', 'tsps': 'tsp',
+    'tablespoon': 'tbsp', 'tablespoons': 'tbsp', 'tbsp': 'tbsp', 'tbsps': 'tbsp', 'tbs': 'tbsp', 'tbl': 'tbsp',
+    'cup': 'cup', 'cups': 'cup', 'c': 'cup',
+    'fluid ounce': 'fl oz', 'fluid ounces': 'fl oz', 'fl oz': 'fl oz', 'fl. oz': 'fl oz',
+    'ounce': 'oz', 'ounces': 'oz', 'oz': 'oz',
+    'pound': 'lb', 'pounds': 'lb', 'lb': 'lb', 'lbs': 'lb',
+    'gram': 'g', 'grams': 'g', 'g': 'g', 'gr': 'g',
+    'kilogram': 'kg', 'kilograms': 'kg', 'kg': 'kg',
+    'milligram': 'mg', 'milligrams': 'mg', 'mg': 'mg',
+    'milliliter': 'ml', 'milliliters': 'ml', 'millilitre': 'ml', 'millilitres': 'ml', 'ml': 'ml',
+    'liter': 'l', 'liters': 'l', 'litre': 'l', 'litres': 'l', 'l': 'l',
+    'pint': 'pint', 'pints': 'pint', 'pt': 'pint',
+    'quart': 'quart', 'quarts': 'quart', 'qt': 'quart',
+    'gallon': 'gallon', 'gallons': 'gallon', 'gal': 'gallon',
+    'pinch': 'pinch', 'pinches': 'pinch', 'dash': 'dash', 'dashes': 'dash',
+    'clove': 'clove', 'cloves': 'clove',
+    'can': 'can', 'cans': 'can', 'tin': 'can', 'tins': 'can',
+    'package': 'package', 'packages': 'package', 'pkg': 'package', 'packet': 'package', 'packets': 'package',
+    'jar': 'jar', 'jars': 'jar', 'bottle': 'bottle', 'bottles': 'bottle',
+    'stick': 'stick', 'sticks': 'stick',
+    'slice': 'slice', 'slices': 'slice',
+    'piece': 'piece', 'pieces': 'piece',
+    'bunch': 'bunch', 'bunches': 'bunch', 'sprig': 'sprig', 'sprigs': 'sprig',
+    'handful': 'handful', 'handfuls': 'handful',
+    'head': 'head', 'heads': 'head', 'stalk': 'stalk', 'stalks': 'stalk',
+    'leaf': 'leaf', 'leaves': 'leaf', 'glass': 'glass', 'glasses': 'glass',
+}
+# Capitalized abbreviations whose meaning depends on case
+_CASED_UNITS = {'T': 'tbsp', 'Tbsp': 'tbsp', 'Tbs': 'tbsp', 't': 'tsp'}
+
+# Words that describe how an ingredient is prepared rather than what it is
+PREPARATION_WORDS = frozenset({
+    'chopped', 'minced', 'diced', 'sliced', 'grated', 'shredded', 'crushed', 'peeled',
+    'melted', 'softened', 'sifted', 'beaten', 'whisked', 'cubed', 'halved', 'quartered',
+    'julienned', 'trimmed', 'rinsed', 'drained', 'seeded', 'cored', 'toasted', 'zested',
+    'juiced', 'mashed', 'pitted', 'thawed', 'cooked', 'divided', 'room-temperature',
+    'finely', 'roughly', 'coarsely', 'thinly', 'thickly', 'freshly', 'lightly', 'well',
+})
+
+# Words dropped from the name when deriving the canonical id
+DESCRIPTORS = frozenset({
+    'large', 'medium', 'small', 'extra-large', 'jumbo', 'fresh', 'dried', 'extra', 'virgin',
+    'extra-virgin', 'boneless', 'skinless', 'whole', 'ripe', 'organic', 'raw', 'cold', 'warm',
+    'hot', 'unsalted', 'salted', 'light', 'dark', 'packed', 'heaping', 'level', 'good',
+    'quality', 'plain', 'granulated', 'white', 'kosher', 'sea', 'table', 'fine', 'coarse',
+    'all-purpose', 'low-sodium', 'reduced-sodium', 'store-bought', 'homemade', 'optional',
+})
+
+# normalized name -> canonical ingredient id, for synonyms the rules above don't fold
+ALIASES: Dict[str, str] = {
+    'ap flour': 'flour', 'wheat flour': 'flour',
+    'scallion': 'green-onion', 'spring onion': 'green-onion', 'green onion': 'green-onion',
+    'confectioner sugar': 'powdered-sugar', "confectioners' sugar": 'powdered-sugar',
+    'confectioners sugar': 'powdered-sugar', 'icing sugar': 'powdered-sugar', 'caster sugar': 'sugar',
+    'superfine sugar': 'sugar', 'heavy whipping cream': 'heavy-cream', 'whipping cream': 'heavy-cream',
+    'double cream': 'heavy-cream', 'garbanzo bean': 'chickpea', 'courgette': 'zucchini',
+    'aubergine': 'eggplant', 'coriander leaf': 'cilantro', 'ground black pepper': 'black-pepper',
+    'black peppercorn': 'black-pepper', 'bicarbonate of soda': 'baking-soda',
+    'bicarb soda': 'baking-soda', 'cornflour': 'cornstarch', 'corn starch': 'cornstarch',
+    'minced meat': 'ground-beef', 'beef mince': 'ground-beef', 'prawn': 'shrimp',
+    'rocket': 'arugula', 'capsicum': 'bell-pepper', 'egg yolk': 'egg-yolk', 'egg white': 'egg-white',
+}
+
+_QUANTITY_WORDS = {'a': 1.0, 'an': 1.0, 'one': 1.0, 'two': 2.0, 'three': 3.0, 'four': 4.0,
+                   'five': 5.0, 'six': 6.0, 'half': 0.5, 'dozen': 12.0}
+_NUMBER = r'\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?'
+_QUANTITY = re.compile(rf'^(?P<q>{_NUMBER})(?:\s*(?:-|–|—|to|or)\s*(?P<q2>{_NUMBER}))?\s*')
+_WORD_QUANTITY = re.compile(rf'^(?P<w>{"|".join(_QUANTITY_WORDS)})\s+', re.IGNORECASE)
+_UNIT = re.compile(
+    r'^(?P<unit>' + '|'.join(sorted((re.escape(u) for u in set(UNITS) | set(_CASED_UNITS)), key=len, reverse=True))
+    + r')\.?(?![\w-])\s*(?:of\s+)?',
+    re.IGNORECASE,
+)
+# "juice of 1 lemon" is "1 lemon, juiced": the part becomes the preparation
+_PART_OF = re.compile(r'^(?:the\s+)?(?P<part>juice|zest)\s+of\s+', re.IGNORECASE)
+_PART_PREPARATION = {'juice': 'juiced', 'zest': 'zested'}
+_PARENS = re.compile(r'\s*\(([^)]*)\)')
+_TO_TASTE = re.compile(r'[\s,]*\b(to taste|as needed|for garnish|for serving|or more|optional)\b\s*$', re.IGNORECASE)
+_SLUG = re.compile(r'[^a-z0-9]+')
+_SINGULAR_EXCEPTIONS = frozenset({'molasses', 'hummus', 'asparagus', 'couscous', 'swiss', 'grits',
+                                  'citrus', 'octopus', 'watercress', 'series', 'species', 'lemongrass'})
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedIngredient:
+    quantity: Optional[float]
+    quantity_max: Optional[float]     # upper end of a range ("2-3 cloves")
+    unit: Optional[str]               # canonical unit from UNITS
+    name: str
+    preparation: Optional[str]
+    ingredient_id: Optional[str]
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _number(text: str) -> Optional[float]:
+    """'1 1/2' -> 1.5; None for a zero denominator ("1/0 cup")."""
+    total = 0.0
+    for part in text.split():
+        if '/' in part:
+            num, den = part.split('/')
+            if not int(den):
+                return None
+            total += int(num) / int(den)
+        else:
+            total += float(part)
+    return round(total, 3)
+
+
+def _singular(word: str) -> str:
+    if word in _SINGULAR_EXCEPTIONS or len(word) < 4:
+        return word
+    if word.endswith('leaves'):
+        return word[:-3] + 'f'
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith('oes'):
+        return word[:-2]
+    if word.endswith(('ches', 'shes', 'sses', 'xes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us')):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_id(name: str) -> Optional[str]:
+    """Canonical ingredient id for a parsed name: 'Fresh Tomatoes' -> 'tomato'."""
+    name = name.lower().replace('’', "'")
+    alias = ALIASES.get(name)
+    if alias:
+        return alias
+    words = [w for w in re.findall(r"[a-z0-9'-]+", name) if w not in DESCRIPTORS and w not in PREPARATION_WORDS]
+    # "butter or margarine": the first alternative is the ingredient
+    if 'or' in words:
+        words = words[:words.index('or')]
+    if not words:
+        return None
+    words[-1] = _singular(words[-1])
+    key = ' '.join(words)
+    return ALIASES.get(key) or _SLUG.sub('-', key).strip('-') or None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_ingredient(text: str) -> ParsedIngredient:
+    """Split one ingredient line into its parts (cached on the raw string)."""
+    rest = ' '.join(text.split())
+    for char, fraction in _UNICODE_FRACTIONS.items():
+        rest = rest.replace(char, f' {fraction}')
+    rest = rest.replace('⁄', '/').strip()
+
+    notes: List[str] = []
+    m = _PART_OF.match(rest)
+    if m:
+        notes.append(_PART_PREPARATION[m.group('part').lower()])
+        rest = rest[m.end():]
+
+    quantity = quantity_max = None
+    m = _QUANTITY.match(rest)
+    if m:
+        quantity = _number(m.group('q'))
+        quantity_max = _number(m.group('q2')) if m.group('q2') else None
+        rest = rest[m.end():]
+    else:
+        m = _WORD_QUANTITY.match(rest)
+        if m and (_UNIT.match(rest[m.end():]) or m.group('w').lower() not in ('a', 'an')):
+            quantity = _QUANTITY_WORDS[m.group('w').lower()]
+            rest = rest[m.end():]
+            if m.group('w').lower() == 'half':
+                rest = re.sub(r'^an?\s+', '', rest, flags=re.IGNORECASE)   # "half a lemon"
+
+    # "1 (14 ounce) can tomatoes": the package size is a note
+    m = _PARENS.match(rest)
+    if m and quantity is not None:
+        notes.append(m.group(1).strip())
+        rest = rest[m.end():].lstrip()
+
+    unit = None
+    m = _UNIT.match(rest)
+    if m:
+        written = m.group('unit')
+        unit = _CASED_UNITS.get(written) or UNITS.get(written.lower())
+        # A bare "c"/"l"/"t" is only a unit right after a number
+        if len(written) == 1 and quantity is None:
+            unit = None
+        else:
+            rest = rest[m.end():]
+
+    for note in _PARENS.findall(rest):
+        if note.strip():
+            notes.append(note.strip())
+    rest = _PARENS.sub('', rest)
+    name, _, after = rest.partition(',')
+    if after.strip():
+        notes.insert(0, after.strip())
+    m = _TO_TASTE.search(name)
+    if m:
+        notes.append(m.group(1).lower())
+        name = name[:m.start()]
+
+    # Leading "finely chopped fresh parsley": the preparation goes to the notes
+    words = name.split()
+    lead = 0
+    while lead < len(words) - 1 and words[lead].lower().strip(',') in PREPARATION_WORDS:
+        lead += 1
+    if lead:
+        notes.insert(0, ' '.join(words[:lead]).strip(','))
+        words = words[lead:]
+    name = ' '.join(words).strip(' ,;:-').lower()
+
+    return ParsedIngredient(
+        quantity=quantity,
+        quantity_max=quantity_max,
+        unit=unit,
+        name=name,
+        preparation=', '.join(notes) or None,
+        ingredient_id=canonical_id(name) if name else None,
+    )
+
+
+def parse_ingredient_lines(lines: List[str]) -> Tuple[ParsedIngredient, ...]:
+    """parse_ingredient() of every non-empty line."""
+    return tuple(parse_ingredient(line) for line in lines if line and line.strip())
+
+
+def parse_ingredients(lines: List[str]) -> List[Dict]:
+    """parse_ingredient_lines() as JSON-ready dicts."""
+    return [p.to_dict() for p in parse_ingredient_lines(lines)]
+
+
+def cache_report() -> str:
+    info = parse_ingredient.cache_info()
+    lookups = info.hits + info.misses
+    rate = f" ({info.hits / lookups:.0%} hits)" if lookups else ""
+    return f"Ingredient parser cache: {info.currsize} line(s), {info.hits}/{lookups} lookups cached{rate}"
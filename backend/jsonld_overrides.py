@@ -0,0 +1,292 @@
+# jsonld_overrides.py
+"""
+Sites whose recipe_scrapers scraper computes a field from the page HTML
+rather than reading it from the schema.org Recipe. jsonld_recipe takes these
+fields from the full recipe_scrapers parse; every other field of a supported
+site is read straight from the page's JSON-LD.
+
+Written against the recipe-scrapers version pinned in requirements.txt
+(15.12.0). Re-check the table whenever that pin moves: a site scraper that
+gains or drops a field override must be added, changed or removed here.
+"""
+
+from typing import Dict, FrozenSet
+
+# bare host -> fields its scraper overrides
+_OVERRIDES = {
+    '15gram.be':                      {'author', 'canonical_url'},
+    '24kitchen.nl':                   {'instructions'},
+    'aberlehome.com':                 {'author', 'category', 'ingredients', 'instructions', 'nutrients', 'title', 'total_time', 'yields'},
+    'acouplecooks.com':               {'ingredients'},
+    'adrianasbestrecipes.com':        {'instructions'},
+    'afarmgirlsdabbles.com':          {'ingredients'},
+    'afghankitchenrecipes.com':       {'author', 'ingredients', 'instructions', 'total_time', 'yields'},
+    'ah.be':                          {'instructions'},
+    'ah.nl':                          {'instructions'},
+    'ahealthysliceoflife.com':        {'ingredients'},
+    'aldi-nord.de':                   {'author', 'instructions'},
+    'aldi-sued.de':                   {'instructions'},
+    'aldi-suisse.ch':                 {'instructions'},
+    'aldi.com.au':                    {'author', 'category', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'aldi.es':                        {'author', 'instructions'},
+    'aldi.fr':                        {'author', 'instructions'},
+    'aldi.hu':                        {'instructions'},
+    'aldi.it':                        {'instructions'},
+    'aldi.lu':                        {'author', 'instructions'},
+    'aldi.nl':                        {'author', 'instructions'},
+    'aldi.pl':                        {'author', 'instructions'},
+    'aldi.pt':                        {'author', 'instructions'},
+    'alisoneroman.com':               {'ingredients'},
+    'alittlebityummy.com':            {'author', 'ingredients', 'instructions', 'nutrients', 'total_time'},
+    'amazingoriental.com':            {'category', 'cuisine', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'ambitiouskitchen.com':           {'ingredients'},
+    'ameessavorydish.com':            {'ingredients'},
+    'app.samsungfood.com':            {'instructions', 'nutrients'},
+    'argiro.gr':                      {'author', 'category', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'arla.se':                        {'ingredients'},
+    'atelierdeschefs.fr':             {'yields'},
+    'bakels.co.uk':                   {'author', 'category', 'ingredients', 'instructions', 'title'},
+    'bakels.com.au':                  {'author', 'category', 'ingredients', 'instructions', 'title'},
+    'barefootcontessa.com':           {'author', 'ingredients', 'instructions'},
+    'barefootinthepines.com':         {'nutrients'},
+    'bbc.co.uk':                      {'title'},
+    'bbc.com':                        {'title'},
+    'bigoven.com':                    {'instructions', 'yields'},
+    'bodybuilding.com':               {'author', 'category', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'bofrost.de':                     {'nutrients'},
+    'bonappetit.com':                 {'total_time'},
+    'bongeats.com':                   {'ingredients', 'instructions'},
+    'books.ottolenghi.co.uk':         {'author', 'category', 'ingredients', 'instructions', 'title', 'yields'},
+    'briceletbaklava.ch':             {'author', 'category', 'image', 'ingredients', 'instructions', 'title', 'yields'},
+    'carriesexperimentalkitchen.com': {'ingredients'},
+    'cdkitchen.com':                  {'ingredients'},
+    'chefjackovens.com':              {'instructions'},
+    'chefnini.com':                   {'author', 'cuisine', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'choosehomemade.org':             {'author', 'category', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'claudia.abril.com.br':           {'instructions'},
+    'cleaneatingkitchen.com':         {'ingredients'},
+    'comidinhasdochef.com':           {'instructions'},
+    'cook-talk.com':                  {'author', 'category'},
+    'cookiesandcups.com':             {'author'},
+    'cookingcircle.com':              {'author', 'ingredients', 'instructions'},
+    'cookinglight.com':               {'ingredients', 'instructions'},
+    'cookomix.com':                   {'instructions'},
+    'cookwell.com':                   {'nutrients'},
+    'corriecooks.com':                {'ingredients'},
+    'costco.com':                     {'author', 'image', 'ingredients', 'instructions', 'title'},
+    'cuisineaz.com':                  {'ingredients'},
+    'cuisinez-pour-bebe.fr':          {'instructions'},
+    'culinaryhill.com':               {'ingredients'},
+    'culy.nl':                        {'instructions'},
+    'dagelijksekost.vrt.be':          {'canonical_url', 'instructions'},
+    'davidlebovitz.com':              {'total_time'},
+    'dish.co.nz':                     {'author', 'category', 'cuisine', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'dobruchut.aktuality.sk':         {'instructions'},
+    'domesticate-me.com':             {'author'},
+    'donalskehan.com':                {'author', 'category', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'dr.dk':                          {'author', 'ingredients', 'instructions', 'title'},
+    'drizzleanddip.com':              {'ingredients', 'instructions'},
+    'eatthismuch.com':                {'author'},
+    'eatwell101.com':                 {'category', 'ingredients', 'instructions'},
+    'editions-larousse.fr':           {'author', 'ingredients', 'instructions'},
+    'eggs.ca':                        {'author', 'ingredients'},
+    'en.wikibooks.org':               {'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'epicurious.com':                 {'author'},
+    'ethanchlebowski.com':            {'cuisine'},
+    'farmtojar.com':                  {'author'},
+    'fattoincasadabenedetta.it':      {'instructions'},
+    'felix.kitchen':                  {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'festligare.se':                  {'category', 'ingredients', 'instructions', 'yields'},
+    'fitmencook.com':                 {'category', 'ingredients', 'instructions', 'nutrients', 'total_time', 'yields'},
+    'flavorsbylinbie.com':            {'author', 'category', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'foodandwine.com':                {'yields'},
+    'foodnetwork.co.uk':              {'author'},
+    'foodnetwork.com':                {'author'},
+    'foodrepublic.com':               {'yields'},
+    'forksoverknives.com':            {'author', 'yields'},
+    'franzoesischkochen.de':          {'author', 'instructions', 'yields'},
+    'gesund-aktiv.com':               {'author', 'ingredients'},
+    'goldnplump.com':                 {'author', 'ingredients', 'total_time'},
+    'goodhousekeeping.com':           {'instructions', 'nutrients'},
+    'gourmettraveller.com.au':        {'category', 'ingredients'},
+    'grandfrais.com':                 {'author', 'category', 'cuisine', 'image', 'ingredients', 'instructions', 'nutrients', 'total_time'},
+    'greatbritishchefs.com':          {'yields'},
+    'grimgrains.com':                 {'author', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'grouprecipes.com':               {'author', 'category', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'halfbakedharvest.com':           {'instructions'},
+    'hassanchef.com':                 {'author'},
+    'healthyeating.nhlbi.nih.gov':    {'image', 'ingredients', 'instructions', 'nutrients', 'title', 'total_time', 'yields'},
+    'heb.com':                        {'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'hellofresh.at':                  {'total_time'},
+    'hellofresh.be':                  {'total_time'},
+    'hellofresh.ca':                  {'total_time'},
+    'hellofresh.ch':                  {'total_time'},
+    'hellofresh.co.nz':               {'total_time'},
+    'hellofresh.co.uk':               {'total_time'},
+    'hellofresh.com':                 {'total_time'},
+    'hellofresh.com.au':              {'total_time'},
+    'hellofresh.de':                  {'total_time'},
+    'hellofresh.dk':                  {'total_time'},
+    'hellofresh.es':                  {'total_time'},
+    'hellofresh.fr':                  {'total_time'},
+    'hellofresh.ie':                  {'total_time'},
+    'hellofresh.it':                  {'total_time'},
+    'hellofresh.lu':                  {'total_time'},
+    'hellofresh.nl':                  {'total_time'},
+    'hellofresh.no':                  {'total_time'},
+    'hellofresh.se':                  {'total_time'},
+    'hersheyland.com':                {'author', 'instructions'},
+    'hofer.at':                       {'instructions'},
+    'hofer.si':                       {'instructions'},
+    'homechef.com':                   {'instructions'},
+    'howtofeedaloon.com':             {'ingredients'},
+    'ingoodflavor.com':               {'author'},
+    'iowagirleats.com':               {'author', 'instructions'},
+    'irishcentral.com':               {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'itdoesnttastelikechicken.com':   {'ingredients'},
+    'itsnotaboutnutrition.com':       {'instructions'},
+    'jamieoliver.com':                {'ingredients', 'instructions'},
+    'joshuaweissman.com':             {'ingredients', 'instructions', 'total_time', 'yields'},
+    'joyfoodsunshine.com':            {'ingredients'},
+    'joythebaker.com':                {'total_time'},
+    'juliegoodwin.com.au':            {'author', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'justbento.com':                  {'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'justonecookbook.com':            {'ingredients'},
+    'kalejunkie.com':                 {'instructions'},
+    'kellyscleankitchen.com':         {'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'kennymcgovern.com':              {'instructions'},
+    'keukenliefde.nl':                {'author', 'category', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'kfoods.com':                     {'ingredients', 'instructions'},
+    'kikkoman.eu':                    {'author', 'category', 'ingredients', 'nutrients'},
+    'kingarthurbaking.com':           {'instructions'},
+    'kitchenaid.com.au':              {'ingredients', 'instructions', 'instructions_list', 'total_time', 'yields'},
+    'kochbucher.com':                 {'author', 'category', 'ingredients', 'instructions', 'title'},
+    'kookjij.nl':                     {'category', 'cuisine', 'ingredients'},
+    'krollskorner.com':               {'author'},
+    'kuchnia-domowa.pl':              {'image', 'instructions', 'title'},
+    'kuchynalidla.sk':                {'category', 'ingredients', 'instructions_list', 'yields'},
+    'kwestiasmaku.com':               {'image', 'ingredients', 'instructions', 'total_time', 'yields'},
+    'lacucinaitaliana.com':           {'author'},
+    'lacucinaitaliana.it':            {'author'},
+    'latelierderoxane.com':           {'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'lecker.de':                      {'instructions'},
+    'lekkerensimpel.com':             {'author', 'ingredients', 'instructions', 'title'},
+    'lidiasitaly.com':                {'author', 'image', 'ingredients', 'instructions', 'title', 'yields'},
+    'loveandlemons.com':              {'ingredients'},
+    'lovefood.com':                   {'author', 'category', 'cuisine', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'maangchi.com':                   {'ingredients', 'instructions'},
+    'madamecuisine.de':               {'author', 'category', 'cuisine', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'magimix.com':                    {'instructions'},
+    'matprat.no':                     {'ingredients', 'nutrients'},
+    'mccormick.com':                  {'instructions'},
+    'meljoulwan.com':                 {'author', 'category', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'melloschourico.com':             {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'migusto.migros.ch':              {'image'},
+    'mindmegette.hu':                 {'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'mob.co.uk':                      {'author'},
+    'mobkitchen.co.uk':               {'author'},
+    'mundodereceitasbimby.com.pt':    {'author'},
+    'mykitchen101.com':               {'author', 'ingredients', 'instructions', 'title', 'yields'},
+    'myplate.gov':                    {'ingredients', 'instructions', 'nutrients', 'total_time'},
+    'ndr.de':                         {'author', 'instructions'},
+    'netacooks.com':                  {'ingredients'},
+    'nhs.uk':                         {'author', 'instructions', 'title', 'total_time', 'yields'},
+    'nibbledish.com':                 {'ingredients', 'instructions'},
+    'ninjatestkitchen.eu':            {'author', 'ingredients', 'instructions'},
+    'norecipes.com':                  {'ingredients'},
+    'nrk.no':                         {'author', 'yields'},
+    'number-2-pencil.com':            {'author', 'category'},
+    'nutritionbynathalie.com':        {'image', 'ingredients', 'instructions', 'title'},
+    'ohsweetbasil.com':               {'ingredients'},
+    'okokorecepten.nl':               {'instructions'},
+    'omnivorescookbook.com':          {'ingredients'},
+    'onceuponachef.com':              {'author'},
+    'owen-han.com':                   {'author', 'ingredients', 'instructions', 'instructions_list', 'title', 'total_time'},
+    'panelinha.com.br':               {'total_time', 'yields'},
+    'paninihappy.com':                {'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'pastificiosorrentino.com':       {'instructions'},
+    'pauladeen.com':                  {'instructions'},
+    'pickuplimes.com':                {'ingredients', 'instructions'},
+    'picnic.app':                     {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'pingodoce.pt':                   {'category', 'cuisine', 'instructions'},
+    'platingpixels.com':              {'author'},
+    'poppycooks.com':                 {'author', 'image', 'ingredients', 'instructions', 'title', 'yields'},
+    'popsugar.com':                   {'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'potatorolls.com':                {'author', 'ingredients', 'instructions', 'yields'},
+    'projectgezond.nl':               {'author', 'category', 'cuisine', 'nutrients'},
+    'przepisy.pl':                    {'ingredients', 'yields'},
+    'quakeroats.com':                 {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'quitoque.fr':                    {'author', 'canonical_url', 'category', 'image', 'ingredients', 'instructions', 'nutrients', 'title', 'total_time', 'yields'},
+    'rachlmansfield.com':             {'total_time'},
+    'receitas.ig.com.br':             {'author', 'instructions', 'yields'},
+    'receitasnestle.com.br':          {'instructions', 'total_time'},
+    'recepti.index.hr':               {'instructions'},
+    'recipe.yamasa.com':              {'author', 'cuisine', 'ingredients', 'instructions'},
+    'recipeland.com':                 {'ingredients'},
+    'recipes.farmhousedelivery.com':  {'image', 'ingredients', 'instructions', 'title', 'total_time'},
+    'recipes.timesofindia.com':       {'ingredients'},
+    'reishunger.de':                  {'ingredients', 'instructions'},
+    'rewe.de':                        {'instructions'},
+    'rezeptwelt.de':                  {'author', 'cuisine', 'instructions'},
+    'ricetta.it':                     {'instructions'},
+    'ricette.giallozafferano.it':     {'nutrients'},
+    'rosannapansino.com':             {'ingredients', 'instructions', 'title', 'total_time'},
+    'rutgerbakt.nl':                  {'author', 'category', 'instructions', 'title', 'yields'},
+    'saboresajinomoto.com.br':        {'category', 'ingredients', 'instructions', 'title'},
+    'sallys-blog.de':                 {'author', 'ingredients'},
+    'saltpepperskillet.com':          {'author'},
+    'savvysavingcouple.net':          {'instructions'},
+    'schoolofwok.co.uk':              {'author', 'cuisine', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'scrambledandscrumptious.com':    {'ingredients', 'instructions'},
+    'sharkninja.com':                 {'author', 'ingredients', 'instructions', 'total_time', 'yields'},
+    'simplegreensmoothies.com':       {'ingredients'},
+    'simplehomeedit.com':             {'instructions'},
+    'simply-cookit.com':              {'ingredients', 'instructions'},
+    'simplyrecipes.com':              {'instructions'},
+    'sizzlefish.com':                 {'category'},
+    'sizzlingeats.com':               {'instructions'},
+    'smulweb.nl':                     {'instructions'},
+    'southernliving.com':             {'yields'},
+    'spisbedre.dk':                   {'category', 'ingredients', 'instructions', 'nutrients', 'yields'},
+    'staysnatched.com':               {'author'},
+    'streetkitchen.hu':               {'ingredients', 'instructions', 'total_time'},
+    'sunbasket.com':                  {'instructions'},
+    'sundpaabudget.dk':               {'nutrients'},
+    'taste.com.au':                   {'ingredients', 'instructions'},
+    'tasteofhome.com':                {'ingredients'},
+    'tastinghistory.com':             {'author', 'category', 'image', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'tastykitchen.com':               {'ingredients', 'instructions', 'title'},
+    'thecookingguy.com':              {'ingredients', 'instructions', 'total_time', 'yields'},
+    'theglutenfreeaustrian.com':      {'yields'},
+    'thehappyfoodie.co.uk':           {'ingredients'},
+    'themodernproper.com':            {'nutrients'},
+    'thepioneerwoman.com':            {'instructions'},
+    'theplantbasedschool.com':        {'instructions'},
+    'therecipecritic.com':            {'author'},
+    'thespruceeats.com':              {'ingredients'},
+    'tine.no':                        {'image', 'instructions'},
+    'tofoo.co.uk':                    {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'uitpaulineskeuken.nl':           {'ingredients', 'instructions'},
+    'usapears.org':                   {'author', 'ingredients', 'nutrients', 'total_time'},
+    'valdemarsro.dk':                 {'category', 'instructions', 'total_time'},
+    'varecha.pravda.sk':              {'ingredients'},
+    'vegetarbloggen.no':              {'instructions'},
+    'vegolosi.it':                    {'title'},
+    'veroniquecloutier.com':          {'author', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'waitrose.com':                   {'author', 'ingredients', 'instructions'},
+    'watchwhatueat.com':              {'ingredients'},
+    'weightwatchers.com':             {'author', 'ingredients', 'nutrients'},
+    'wellplated.com':                 {'cuisine'},
+    'williams-sonoma.com':            {'author'},
+    'womensweeklyfood.com.au':        {'ingredients', 'instructions'},
+    'woop.co.nz':                     {'ingredients', 'instructions', 'nutrients', 'title', 'total_time', 'yields'},
+    'www1.wdr.de':                    {'image', 'ingredients', 'instructions', 'title'},
+    'xiachufang.com':                 {'author', 'category', 'ingredients', 'instructions', 'title', 'total_time', 'yields'},
+    'yummly.com':                     {'author', 'ingredients', 'instructions'},
+    'zaubertopf.de':                  {'ingredients', 'instructions'},
+    'zeit.de':                        {'author', 'ingredients', 'instructions'},
+}
+
+SITE_FIELD_OVERRIDES: Dict[str, FrozenSet[str]] = {
+    site: frozenset(fields) for site, fields in _OVERRIDES.items()
+}
@@ -0,0 +1,374 @@
+# jsonld_recipe.py
+"""
+JSON-LD fast path for recipe pages.
+Most recipe sites embed a schema.org Recipe as <script type="application/ld+json">.
+Instead of building the full recipe_scrapers object for every page (a
+BeautifulSoup tree, plus an extruct pass over JSON-LD *and* microdata), this
+finds the ld+json blocks directly in the raw bytes, json-decodes only those,
+and maps the Recipe node's fields itself.
+
+Only recipe_scrapers' public API is used. The full parse
+(scrape_html(..., supported_only=False)) is built lazily, for:
+  - fields the site's scraper computes from the HTML itself — the explicit
+    table in jsonld_overrides.py, kept in step with the pinned version;
+  - a core field (title, ingredients, instructions, image) the JSON-LD lacks;
+  - pages with no Recipe node at all.
+
+    scraper = load_recipe(html_bytes, url)
+    scraper.title(), scraper.ingredients(), scraper.nutrients(), ...
+"""
+
+import html as html_lib
+import json
+import math
+import re
+from typing import Dict, FrozenSet, Iterator, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+from recipe_scrapers import SCRAPERS, scrape_html
+
+from jsonld_overrides import SITE_FIELD_OVERRIDES
+
+_LD_JSON_RE = re.compile(
+    rb'<script[^>]*?\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+_CANONICAL_RE = re.compile(
+    rb'<link\s[^>]*?(?:'
+    rb'\brel\s*=\s*["\']?canonical["\']?[^>]*?\bhref\s*=\s*["\']([^"\']+)'
+    rb'|\bhref\s*=\s*["\']([^"\']+)["\'][^>]*?\brel\s*=\s*["\']?canonical\b)',
+    re.IGNORECASE,
+)
+_TAG_RE = re.compile(r'<[^>]*>')
+_SPACE_RE = re.compile(r'\s+')
+_ISO_DURATION_RE = re.compile(
+    r'P(?:(?P<days>[\d.]+)D)?(?:T(?:(?P<hours>[\d.]+)H)?(?:(?P<minutes>[\d.]+)M)?(?:(?P<seconds>[\d.]+)S)?)?$',
+    re.IGNORECASE,
+)
+_HOURS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)\b', re.IGNORECASE)
+_MINUTES_RE = re.compile(r'(\d+)\s*(?:minutes?|mins?|m)\b', re.IGNORECASE)
+_SERVINGS_RE = re.compile(r'^\s*(?:serves|servings?|yields?|portions?)?\s*:?\s*(\d+)\s*(?:servings?|people|portions?)?\s*$',
+                          re.IGNORECASE)
+
+# Fields the rest of the scraper reads
+SCHEMA_FIELDS = (
+    'title', 'author', 'image', 'total_time', 'yields', 'cuisine',
+    'category', 'ingredients', 'instructions', 'nutrients',
+)
+# A page without these in its JSON-LD is not worth a fast-path record: take
+# them from the full parse (microdata, OpenGraph image, site HTML logic).
+# Other fields that are absent simply stay empty, as they would from the
+# generic schema.org reading recipe_scrapers does for them.
+CORE_FIELDS = frozenset({'title', 'ingredients', 'instructions', 'image'})
+
+
+def _is_type(node: Dict, schematype: str) -> bool:
+    t = node.get('@type', '')
+    types = t if isinstance(t, list) else [t]
+    return any(isinstance(x, str) and x.lower() == schematype for x in types)
+
+
+def _iter_nodes(data) -> Iterator[Dict]:
+    """Every dict in an ld+json document, walking lists, @graph and mainEntity."""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            yield item
+            for key in ('@graph', 'mainEntity'):
+                if isinstance(item.get(key), (list, dict)):
+                    stack.append(item[key])
+
+
+def find_jsonld_recipe(body: bytes) -> Optional[Dict]:
+    """
+    The page's schema.org Recipe node, built from the ld+json blocks only,
+    with an author given by @id reference resolved to its Person node.
+    None if the page has no parseable Recipe.
+    """
+    recipe = None
+    people: Dict[str, Dict] = {}
+    for m in _LD_JSON_RE.finditer(body):
+        try:
+            data = json.loads(m.group(1).decode('utf-8', errors='replace'), strict=False)
+        except ValueError:
+            continue
+        for node in _iter_nodes(data):
+            if recipe is None and _is_type(node, 'recipe'):
+                recipe = node
+            elif _is_type(node, 'person') and (node.get('@id') or node.get('url')):
+                people[node.get('@id') or node.get('url')] = node
+    if recipe is None:
+        return None
+    author = recipe.get('author')
+    if isinstance(author, list) and author and isinstance(author[0], dict):
+        author = author[0]
+    if isinstance(author, dict) and (author.get('@id') or author.get('url')) in people:
+        recipe = dict(recipe, author=people[author.get('@id') or author.get('url')])
+    return recipe
+
+
+# ═══════════════════════════════════════════════════════════════
+#  FIELD READERS  (None when the node has no usable value)
+# ═══════════════════════════════════════════════════════════════
+
+def _clean(value) -> str:
+    """Unescape (repeatedly), drop tags and collapse whitespace."""
+    text, prev = str(value), None
+    while prev != text:
+        prev, text = text, html_lib.unescape(text)
+    return _SPACE_RE.sub(' ', _TAG_RE.sub('', text).replace('\u200b', '')).strip()
+
+
+def _joined(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = ','.join(_clean(v) for v in value if v)
+    elif value is not None:
+        value = _clean(value)
+    return value or None
+
+
+def _minutes(value) -> Optional[int]:
+    if isinstance(value, dict):   # QuantitativeValue used as a Duration
+        value = value.get('maxValue')
+    if isinstance(value, (int, float)):
+        return int(value) or None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    m = _ISO_DURATION_RE.match(value)
+    if m and any(m.groups()):
+        parts = {k: float(v) for k, v in m.groupdict().items() if v}
+        total = (parts.get('days', 0) * 1440 + parts.get('hours', 0) * 60
+                 + parts.get('minutes', 0) + parts.get('seconds', 0) / 60)
+        return math.ceil(total) or None
+    if value.isdigit():
+        return int(value) or None
+    value = value.rpartition('-')[2].rpartition(' to ')[2]   # "12-15 minutes": take the upper bound
+    hours, minutes = _HOURS_RE.search(value), _MINUTES_RE.search(value)
+    if not hours and not minutes:
+        return None
+    return round(float(hours.group(1) if hours else 0) * 60 + int(minutes.group(1) if minutes else 0)) or None
+
+
+def read_title(node: Dict) -> Optional[str]:
+    return _clean(node['name']) if node.get('name') else None
+
+
+def read_author(node: Dict) -> Optional[str]:
+    author = node.get('author') or node.get('Author')
+    if isinstance(author, list) and author:
+        author = author[0]
+    if isinstance(author, dict):
+        author = author.get('name')
+    return _clean(author) if isinstance(author, str) and author.strip() else None
+
+
+def read_image(node: Dict) -> Optional[str]:
+    image = node.get('image')
+    if isinstance(image, list) and image:
+        image = image[0]
+    if isinstance(image, dict):
+        image = image.get('url')
+    # Relative paths are left to the full parse's generic image lookup
+    return image if isinstance(image, str) and image.startswith(('http://', 'https://')) else None
+
+
+def read_total_time(node: Dict) -> Optional[int]:
+    total = _minutes(node.get('totalTime'))
+    if total:
+        return total
+    return ((_minutes(node.get('prepTime')) or 0) + (_minutes(node.get('cookTime')) or 0)) or None
+
+
+def read_yields(node: Dict) -> Optional[str]:
+    value = node.get('recipeYield') or node.get('yield')
+    if isinstance(value, list):
+        # Prefer an entry that says what is made ("24 cookies") over serving counts
+        value = next((v for v in value if isinstance(v, str) and not _SERVINGS_RE.match(_clean(v))),
+                     value[0] if value else None)
+    if value is None or value == '':
+        return None
+    text = _clean(value)
+    m = _SERVINGS_RE.match(text)
+    if m:
+        count = int(m.group(1))
+        return f"{count} serving" if count == 1 else f"{count} servings"
+    return text or None
+
+
+def read_cuisine(node: Dict) -> Optional[str]:
+    return _joined(node.get('recipeCuisine'))
+
+
+def read_category(node: Dict) -> Optional[str]:
+    return _joined(node.get('recipeCategory'))
+
+
+def _ingredient_text(item) -> str:
+    if isinstance(item, dict) and _is_type(item, 'propertyvalue'):
+        parts = [item.get('value', ''), item.get('unitText') or item.get('unitCode') or '', item.get('name', '')]
+        return ' '.join(str(p) for p in parts if p)
+    return str(item)
+
+
+def read_ingredients(node: Dict) -> Optional[List[str]]:
+    items = node.get('recipeIngredient') or node.get('ingredients') or []
+    if isinstance(items, str):
+        items = [items]
+    flat = []
+    for item in items:
+        flat.extend(item if isinstance(item, list) else [item])
+    lines = [_clean(_ingredient_text(item)) for item in flat if item is not None]
+    return [line for line in lines if line] or None
+
+
+def _instruction_lines(item) -> List[str]:
+    if isinstance(item, str):
+        return [item]
+    if isinstance(item, list):
+        return [line for sub in item for line in _instruction_lines(sub)]
+    if not isinstance(item, dict):
+        return []
+    if _is_type(item, 'howtosection'):
+        lines = [item['name']] if item.get('name') else []
+        return lines + _instruction_lines(item.get('itemListElement') or [])
+    if item.get('itemListElement') and not item.get('text'):
+        return _instruction_lines(item['itemListElement'])
+    text = item.get('text') or ''
+    name = item.get('name') or ''
+    # Some sites repeat (or truncate) the step text as its name
+    if name and not text.startswith(name.rstrip('.')):
+        return [name, text]
+    return [text]
+
+
+def read_instructions(node: Dict) -> Optional[str]:
+    raw = node.get('recipeInstructions') or node.get('RecipeInstructions')
+    if isinstance(raw, dict):
+        raw = raw.get('itemListElement')
+    if not raw:
+        return None
+    lines = [_clean(line) for line in _instruction_lines(raw)]
+    return '\n'.join(line for line in lines if line) or None
+
+
+def read_nutrients(node: Dict) -> Optional[Dict[str, str]]:
+    nutrition = node.get('nutrition')
+    if not isinstance(nutrition, dict):
+        return None
+    return {
+        _clean(key): _clean(value) for key, value in nutrition.items()
+        if key and value and not key.startswith('@') and key != 'type'
+    }
+
+
+READERS = {
+    'title':        read_title,
+    'author':       read_author,
+    'image':        read_image,
+    'total_time':   read_total_time,
+    'yields':       read_yields,
+    'cuisine':      read_cuisine,
+    'category':     read_category,
+    'ingredients':  read_ingredients,
+    'instructions': read_instructions,
+    'nutrients':    read_nutrients,
+}
+
+
+def _host(url: str) -> str:
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class JsonLdRecipe:
+    """
+    recipe_scrapers-compatible reader backed by the page's JSON-LD Recipe
+    node. Overridden fields and missing core fields come from a full
+    recipe_scrapers parse built on first need.
+    """
+
+    def __init__(self, html: bytes, url: str, node: Dict, overrides: FrozenSet[str] = frozenset()):
+        self.html = html
+        self.url = url
+        self.node = node
+        self._overrides = overrides
+        self._full = None
+        self._values: Dict[str, object] = {}   # parse_recipe reads ingredients/nutrients repeatedly
+
+    @property
+    def used_fallback(self) -> bool:
+        return self._full is not None
+
+    def _full_scraper(self):
+        if self._full is None:
+            self._full = scrape_html(html=self.html, org_url=self.url, supported_only=False)
+        return self._full
+
+    def _field(self, name: str):
+        if name in self._values:
+            return self._values[name]
+        value = None if name in self._overrides else READERS[name](self.node)
+        if value is None and (name in self._overrides or name in CORE_FIELDS):
+            value = getattr(self._full_scraper(), name)()
+        self._values[name] = value
+        return value
+
+    def title(self):
+        return self._field('title')
+
+    def author(self):
+        return self._field('author')
+
+    def image(self):
+        return self._field('image')
+
+    def total_time(self):
+        return self._field('total_time')
+
+    def yields(self):
+        return self._field('yields')
+
+    def cuisine(self):
+        return self._field('cuisine')
+
+    def category(self):
+        return self._field('category')
+
+    def ingredients(self) -> List[str]:
+        return self._field('ingredients')
+
+    def instructions(self) -> str:
+        return self._field('instructions')
+
+    def instructions_list(self) -> List[str]:
+        if 'instructions_list' in self._overrides:
+            return self._full_scraper().instructions_list()
+        return [step for step in self.instructions().split('\n') if step]
+
+    def nutrients(self) -> Dict[str, str]:
+        return self._field('nutrients') or {}
+
+    def canonical_url(self) -> str:
+        if 'canonical_url' in self._overrides:
+            return self._full_scraper().canonical_url()
+        m = _CANONICAL_RE.search(self.html)
+        if m:
+            href = html_lib.unescape((m.group(1) or m.group(2)).decode('utf-8', errors='replace'))
+            return urljoin(self.url, href)
+        return self.url
+
+
+def load_recipe(html: bytes, url: str):
+    """
+    JsonLdRecipe when the page carries a JSON-LD Recipe, else the full
+    recipe_scrapers parse. Unsupported sites raise exactly as scrape_html does.
+    """
+    host = _host(url)
+    node = find_jsonld_recipe(html) if host in SCRAPERS else None
+    if node is None:
+        return scrape_html(html=html, org_url=url)
+    return JsonLdRecipe(html, url, node, SITE_FIELD_OVERRIDES.get(host, frozenset()))
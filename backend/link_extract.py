@@ -0,0 +1,90 @@
+# link_extract.py
+"""
+Link extractors for search result pages.
+Each extractor takes the raw response body (bytes) and yields <a href> values
+one at a time, so callers can stop reading as soon as they have enough recipe
+URLs. Select one by name with get_link_extractor().
+
+    'regex' (default) — byte-level tokenizer, no tree, no full decode
+    'lxml'            — lxml pull parser fed in chunks, stops early
+    'soup'            — full BeautifulSoup parse (the original path)
+"""
+
+import html
+import re
+from typing import Callable, Dict, Iterator, Optional
+
+from bs4 import BeautifulSoup
+
+DEFAULT_LINK_EXTRACTOR = 'regex'
+LXML_CHUNK_SIZE = 64 * 1024
+
+# <a ... href="..."> / href='...' / href=bare — matched directly on bytes
+_A_HREF_RE = re.compile(
+    rb'<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))',
+    re.IGNORECASE,
+)
+
+
+# <link rel="next"> / <a rel="next"> in either attribute order
+_REL_NEXT_RE = re.compile(
+    rb'<(?:link|a)\s[^>]*?(?:'
+    rb'\brel\s*=\s*["\']?next\b[^>]*?\bhref\s*=\s*["\']?([^"\'\s>]+)'
+    rb'|\bhref\s*=\s*["\']?([^"\'\s>]+)[^>]*?\brel\s*=\s*["\']?next\b)',
+    re.IGNORECASE,
+)
+
+
+def _decode_href(raw: bytes) -> str:
+    href = raw.decode('utf-8', errors='replace').strip()
+    return html.unescape(href) if '&' in href else href
+
+
+def extract_links_regex(body: bytes) -> Iterator[str]:
+    for m in _A_HREF_RE.finditer(body):
+        yield _decode_href(m.group(1) or m.group(2) or m.group(3) or b'')
+
+
+def extract_next_link(body: bytes) -> Optional[str]:
+    """href of the page's rel="next" link (pagination), if it has one."""
+    m = _REL_NEXT_RE.search(body)
+    return _decode_href(m.group(1) or m.group(2)) if m else None
+
+
+def extract_links_lxml(body: bytes) -> Iterator[str]:
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=('start',), tag='a')
+    for start in range(0, len(body), LXML_CHUNK_SIZE):
+        parser.feed(body[start:start + LXML_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            href = element.get('href')
+            if href is not None:
+                yield href.strip()
+    parser.close()
+    for _, element in parser.read_events():
+        href = element.get('href')
+        if href is not None:
+            yield href.strip()
+
+
+def extract_links_soup(body: bytes) -> Iterator[str]:
+    soup = BeautifulSoup(body, 'html.parser')
+    for link in soup.find_all('a', href=True):
+        yield link['href']
+
+
+LINK_EXTRACTORS: Dict[str, Callable[[bytes], Iterator[str]]] = {
+    'regex': extract_links_regex,
+    'lxml':  extract_links_lxml,
+    'soup':  extract_links_soup,
+}
+
+
+def get_link_extractor(name: str = DEFAULT_LINK_EXTRACTOR) -> Callable[[bytes], Iterator[str]]:
+    try:
+        return LINK_EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown link extractor '{name}'. Available: {', '.join(LINK_EXTRACTORS)}"
+        ) from None
@@ -0,0 +1,9 @@
+-- 001_refresh_validators.sql
+-- Conditional refresh (refresh.py): HTTP validators and a body hash per
+-- stored recipe, plus an index to walk rows oldest-scraped first.
+
+alter table "Recipes" add column if not exists etag          text;
+alter table "Recipes" add column if not exists last_modified text;
+alter table "Recipes" add column if not exists content_hash  text;
+
+create index if not exists recipes_scraped_date_idx on "Recipes" (scraped_date);
@@ -0,0 +1,8 @@
+-- 002_tagger_version.sql
+-- Versioned dietary tags (dietary_tags.tagger_version()): the hash of the
+-- rules that produced each row's dietary_tags, plus an index so
+-- retag.py --stale can find rows tagged by other versions.
+
+alter table "Recipes" add column if not exists tagger_version text;
+
+create index if not exists recipes_tagger_version_idx on "Recipes" (tagger_version, id);
@@ -0,0 +1,12 @@
+-- 003_ingredients_parsed.sql
+-- Structured ingredients (ingredient_parser.py): one object per ingredient
+-- line with quantity, quantity_max, unit, name, preparation and
+-- ingredient_id, written at ingest. The partial index lets
+-- backfill_ingredients.py page through the rows that don't have it yet, and
+-- the GIN index serves "recipes containing ingredient X" queries
+-- (ingredients_parsed @> '[{"ingredient_id": "flour"}]').
+
+alter table "Recipes" add column if not exists ingredients_parsed jsonb;
+
+create index if not exists recipes_ingredients_unparsed_idx on "Recipes" (id) where ingredients_parsed is null;
+create index if not exists recipes_ingredients_parsed_idx on "Recipes" using gin (ingredients_parsed jsonb_path_ops);
@@ -0,0 +1,9 @@
+-- 004_unique_recipe_url.sql
+-- One row per recipe URL, enforced by the database: save_recipes() inserts
+-- with upsert(on_conflict="url", ignore_duplicates=True), which needs a
+-- unique index on url and lets concurrent scrapers race safely.
+--
+-- Remove existing duplicates first, or the index can't be built:
+--     python3 url_canon.py --delete
+
+create unique index if not exists recipes_url_key on "Recipes" (url);
@@ -0,0 +1,84 @@
+# parse_pool.py
+"""
+Process-pool parse stage.
+Recipe extraction (HTML/JSON-LD parsing plus the regex-heavy dietary tagging)
+is CPU-bound, so running it on the fetching threads caps a scrape at one core.
+ParsePool hands raw page bytes to worker processes and gets RecipeRecords back,
+while the caller keeps fetching. Each worker imports recipe_scrapers and builds
+its RecipeParser once, in the pool initializer, not per page.
+
+Workers are started with forkserver (spawn where that is unavailable), never
+plain fork: by the time a pool exists the scraper may be running its writer
+and search threads, and a forked child can inherit their locks held. The
+workers are also started up front, while the pool is being built.
+
+    with ParsePool(workers=4) as pool:
+        future = pool.submit(html_bytes, url, response_headers)
+        recipe = future.result()
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Dict, Optional
+
+from recipe_record import RecipeRecord
+
+# Only the headers parse_recipe reads cross the process boundary
+PASSED_HEADERS = ('ETag', 'Last-Modified')
+
+_parser = None   # per-worker RecipeParser, set by _init_worker
+
+
+def _init_worker(prefer_page_canonical: bool, jsonld_fast_path: bool):
+    global _parser
+    import recipe_scrapers  # noqa: F401  (pay the import once per worker)
+
+    from scraper_v3_railway import RecipeParser
+
+    _parser = RecipeParser(prefer_page_canonical=prefer_page_canonical, jsonld_fast_path=jsonld_fast_path)
+
+
+def _parse(html: bytes, url: str, headers: Dict[str, str]) -> RecipeRecord:
+    return _parser.parse_recipe(html, url, headers)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)   # leave a core for the fetch threads
+
+
+class ParsePool:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        prefer_page_canonical: bool = True,
+        jsonld_fast_path: bool = True,
+    ):
+        self.workers = workers or default_workers()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+            initargs=(prefer_page_canonical, jsonld_fast_path),
+        )
+        # Bring every worker up now rather than on the first page
+        wait([self._executor.submit(os.getpid) for _ in range(self.workers)])
+
+    def submit(self, html: bytes, url: str, response_headers=None) -> Future:
+        response_headers = response_headers or {}
+        headers = {k: response_headers[k] for k in PASSED_HEADERS if response_headers.get(k)}
+        return self._executor.submit(_parse, html, url, headers)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
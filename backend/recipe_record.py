@@ -0,0 +1,102 @@
+# recipe_record.py
+"""
+Recipe record.
+One scraped recipe, from parse_recipe() through scrape_multiple(),
+save_to_db() and refresh/re-extraction, as a slotted dataclass whose
+fields are named after the Recipes columns — instead of a 25-key dict
+per recipe that save_recipe() then copied into a second dict.
+
+Fields with few distinct values across a crawl (source site, cuisine,
+category, the dietary tag string, author, tagger version) are interned,
+so a bulk run holds one copy of "allrecipes.com" rather than one per
+recipe. Structured ingredients are the ParsedIngredient objects shared by
+the ingredient parser's cache; they become JSON only in to_row().
+
+    record = parser.parse_recipe(html, url)
+    record.title, record.source_site
+    supabase.table("Recipes").insert(record.to_row())
+"""
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
+
+from ingredient_parser import ParsedIngredient
+from url_canon import canonicalize
+
+# Nutrient key as recipe scrapers report it -> RecipeRecord field / Recipes column
+NUTRIENT_FIELDS = {
+    'calories':              'calories',
+    'fatContent':            'fat_content',
+    'saturatedFatContent':   'saturated_fat_content',
+    'transFatContent':       'trans_fat_content',
+    'unsaturatedFatContent': 'unsaturated_fat_content',
+    'carbohydrateContent':   'carbohydrate_content',
+    'sugarContent':          'sugar_content',
+    'fiberContent':          'fiber_content',
+    'proteinContent':        'protein_content',
+    'sodiumContent':         'sodium_content',
+    'cholesterolContent':    'cholesterol_content',
+}
+
+INTERNED_FIELDS = ('author', 'source_site', 'cuisine', 'category', 'dietary_tags', 'tagger_version')
+
+# Row columns compared by refresh and re-extraction to decide whether a page really changed
+CONTENT_COLUMNS = [
+    "title", "author", "image_url", "total_time", "yields", "cuisine", "category",
+    "calories", "fat_content", "saturated_fat_content", "trans_fat_content",
+    "unsaturated_fat_content", "carbohydrate_content", "sugar_content",
+    "fiber_content", "protein_content", "sodium_content", "cholesterol_content",
+    "dietary_tags", "ingredients", "ingredients_parsed", "instructions",
+]
+
+
+def content_changed(stored: Dict, fresh: Dict) -> bool:
+    """True if any extracted column differs between a stored row and a fresh one."""
+    return any((stored.get(col) or '') != (fresh.get(col) or '') for col in CONTENT_COLUMNS)
+
+
+@dataclass(slots=True)
+class RecipeRecord:
+    url: str
+    title: Optional[str]
+    author: str = 'Unknown'
+    source_site: str = ''
+    image_url: str = ''
+    total_time: str = ''
+    yields: str = ''
+    cuisine: str = ''
+    category: str = ''
+    ingredients: str = ''
+    ingredients_parsed: Tuple[ParsedIngredient, ...] = ()
+    instructions: str = ''
+    calories: str = ''
+    fat_content: str = ''
+    saturated_fat_content: str = ''
+    trans_fat_content: str = ''
+    unsaturated_fat_content: str = ''
+    carbohydrate_content: str = ''
+    sugar_content: str = ''
+    fiber_content: str = ''
+    protein_content: str = ''
+    sodium_content: str = ''
+    cholesterol_content: str = ''
+    dietary_tags: str = ''
+    tagger_version: Optional[str] = None
+    scraped_date: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    def __post_init__(self):
+        for name in INTERNED_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                setattr(self, name, sys.intern(value))
+
+    def to_row(self) -> Dict:
+        """The Recipes row for this recipe (canonical URL, JSON-ready ingredients)."""
+        row = {f.name: getattr(self, f.name) for f in fields(self)}
+        row['url'] = canonicalize(self.url)
+        row['ingredients_parsed'] = [p.to_dict() for p in self.ingredients_parsed]
+        return row
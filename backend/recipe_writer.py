@@ -0,0 +1,174 @@
+# recipe_writer.py
+"""
+Write-behind recipe writer.
+The scraper hands each recipe to the writer as soon as it is parsed and
+carries on crawling; a background thread collects them and writes a batch
+when it holds `max_rows` recipes or the oldest has waited `max_delay`
+seconds, whichever comes first. Database latency overlaps with fetching
+instead of adding to it.
+
+Each batch is written `chunk_size` recipes per save_batch() call, and a
+chunk that fails is retried on its own with backoff, so chunks already
+committed are never sent twice; after `max_attempts` the chunk's recipes
+are kept in `failed_recipes` and counted. flush() blocks until
+everything handed over so far is written; close() flushes and stops the
+thread, and runs at interpreter exit as well. install_signal_handlers()
+turns SIGTERM into a normal exit so a deploy or container stop still
+flushes.
+
+    writer = BufferedRecipeWriter(save_batch, max_rows=100, max_delay=5.0)
+    writer.put(recipe)       # returns immediately
+    writer.depth             # recipes handed over but not written yet
+    writer.flush()
+"""
+
+import atexit
+import queue
+import signal
+import sys
+import threading
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from recipe_record import RecipeRecord
+
+MAX_ROWS = 100
+CHUNK_SIZE = 100       # recipes per save_batch() call, and per retry
+MAX_DELAY = 5.0        # seconds a recipe may wait for its batch
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 1.0      # doubled after each failed attempt
+
+# save_batch(recipes) -> (inserted, duplicates)
+SaveBatch = Callable[[List[RecipeRecord]], Tuple[Sequence[RecipeRecord], Sequence[RecipeRecord]]]
+
+_FLUSH = object()
+_STOP = object()
+
+
+class BufferedRecipeWriter:
+    def __init__(
+        self,
+        save_batch: SaveBatch,
+        max_rows: int = MAX_ROWS,
+        max_delay: float = MAX_DELAY,
+        max_attempts: int = MAX_ATTEMPTS,
+        retry_delay: float = RETRY_DELAY,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.save_batch = save_batch
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.chunk_size = chunk_size
+        self.inserted = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.retried = 0
+        self.failed_recipes: List[RecipeRecord] = []
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending = 0
+        self._done = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="recipe-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── producer side ────────────────────────────────────────────
+
+    def put(self, recipe: RecipeRecord):
+        if self._closed:
+            raise RuntimeError("recipe writer is closed")
+        with self._done:
+            self._pending += 1
+        self._queue.put(recipe)
+
+    @property
+    def depth(self) -> int:
+        """Recipes handed over but not yet written (queued or in flight)."""
+        with self._done:
+            return self._pending
+
+    def flush(self, timeout: float = None) -> bool:
+        """Write everything handed over so far; False if `timeout` ran out first."""
+        if self._closed:
+            return self.depth == 0
+        self._queue.put(_FLUSH)
+        with self._done:
+            return self._done.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def install_signal_handlers(self, signals=(signal.SIGTERM,)):
+        """
+        Exit cleanly on `signals` (main thread only): raising SystemExit lets
+        try/finally blocks and atexit run, which closes — and flushes — the writer.
+        """
+        def handler(signum, frame):
+            print(f"\n  ⊘ Received signal {signum}, flushing {self.depth} pending recipe(s)…")
+            sys.exit(128 + signum)
+
+        for sig in signals:
+            signal.signal(sig, handler)
+
+    # ── writer thread ────────────────────────────────────────────
+
+    def _run(self):
+        batch: List[RecipeRecord] = []
+        deadline = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()) if batch else None)
+            except queue.Empty:
+                item = _FLUSH   # the oldest recipe has waited max_delay
+            if item is _STOP or item is _FLUSH:
+                self._write(batch)
+                batch = []
+                if item is _STOP:
+                    return
+                continue
+            if not batch:
+                deadline = time.monotonic() + self.max_delay
+            batch.append(item)
+            if len(batch) >= self.max_rows:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch: List[RecipeRecord]):
+        if not batch:
+            return
+        try:
+            for start in range(0, len(batch), self.chunk_size):
+                self._write_chunk(batch[start:start + self.chunk_size])
+        finally:
+            with self._done:
+                self._pending -= len(batch)
+                self._done.notify_all()
+
+    def _write_chunk(self, chunk: List[RecipeRecord]):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                inserted, duplicates = self.save_batch(chunk)
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failed_recipes.extend(chunk)
+                    print(f"  ✗ Could not write {len(chunk)} recipe(s) after {attempt} attempt(s): {e}")
+                    return
+                self.retried += 1
+                print(f"  ↻ Write of {len(chunk)} recipe(s) failed ({e}), retrying")
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+                continue
+            self.inserted += len(inserted)
+            self.duplicates += len(duplicates)
+            self.batches += 1
+            return
+
+    def report(self) -> str:
+        return (f"Recipe writer: {self.inserted} inserted, {self.duplicates} duplicate(s) in "
+                f"{self.batches} batch(es), {self.retried} retried, {len(self.failed_recipes)} failed, "
+                f"{self.depth} pending")
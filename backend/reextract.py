@@ -0,0 +1,154 @@
+# reextract.py
+"""
+Offline re-extraction from the HTML archive.
+Runs the current extraction code (parse_recipe: JSON-LD fast path,
+instruction cleaning, nutrient parsing, dietary tags) over the newest
+archived copy of every page, in a process pool, and writes the results to
+Recipes — with no network access at all.
+
+A stored row is only rewritten if its extracted columns changed, and only
+if it was extracted from the same page bytes (matching content_hash, or no
+hash recorded); rows a later crawl refreshed from different bytes are left
+alone. Archived pages with no row yet are inserted.
+
+Usage:
+    python3 reextract.py --archive html_archive
+    python3 reextract.py --archive html_archive --site allrecipes.com --workers 4
+    python3 reextract.py --archive html_archive --dry-run
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from html_archive import DEFAULT_ARCHIVE_DIR, HtmlArchive
+from parse_pool import ParsePool, default_workers
+from recipe_record import CONTENT_COLUMNS, RecipeRecord, content_changed
+from storage import get_supabase
+from url_canon import url_variants
+
+BATCH_SIZE = 200      # pages in flight in the parse pool at once
+LOOKUP_CHUNK = 25     # recipes per url lookup (each URL expands to ~8 variants)
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOOKUP_COLUMNS = ", ".join(["id", "url", "content_hash"] + CONTENT_COLUMNS)
+
+
+def _stored_rows(supabase, rows: List[Dict]) -> Dict[str, Dict]:
+    """Existing Recipes rows for `rows`, keyed by the canonical URL."""
+    found: Dict[str, Dict] = {}
+    for i in range(0, len(rows), LOOKUP_CHUNK):
+        chunk = rows[i:i + LOOKUP_CHUNK]
+        variant_of = {v: row['url'] for row in chunk for v in url_variants(row['url'])}
+        result = supabase.table("Recipes").select(LOOKUP_COLUMNS).in_("url", list(variant_of)).execute()
+        for stored in result.data:
+            found.setdefault(variant_of.get(stored['url'], stored['url']), stored)
+    return found
+
+
+def write_batch(supabase, recipes: List[RecipeRecord], stats: Dict[str, int], dry_run: bool = False):
+    rows = [r.to_row() for r in recipes]
+    stored = _stored_rows(supabase, rows)
+    updates: List[Dict] = []
+    inserts: List[Dict] = []
+    for row in rows:
+        old = stored.get(row['url'])
+        if old is None:
+            stored[row['url']] = row   # two archived spellings of one URL: insert once
+            inserts.append(row)
+        elif old.get('content_hash') and old['content_hash'] != row['content_hash']:
+            stats['other_version'] += 1
+        elif content_changed(old, row):
+            updates.append({'id': old['id'], 'url': old['url'], 'tagger_version': row['tagger_version'],
+                            **{col: row[col] for col in CONTENT_COLUMNS}})
+        else:
+            stats['unchanged'] += 1
+    stats['updated'] += len(updates)
+    if dry_run:
+        stats['inserted'] += len(inserts)
+        return
+    if updates:
+        supabase.table("Recipes").upsert(updates, on_conflict="id").execute()
+    if inserts:
+        # A live crawl may have stored one of these URLs since the lookup
+        result = supabase.table("Recipes").upsert(inserts, on_conflict="url", ignore_duplicates=True).execute()
+        stats['inserted'] += len(result.data)
+
+
+def reextract(
+    supabase,
+    archive: HtmlArchive,
+    workers: Optional[int] = None,
+    site: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    stats = dict.fromkeys(['pages', 'failed', 'updated', 'inserted', 'unchanged', 'other_version'], 0)
+    url_like = f"%://%{site}/%" if site else None
+
+    with ParsePool(workers) as pool:
+        pending = []
+
+        def drain():
+            recipes = []
+            for page, future in pending:
+                try:
+                    recipe = future.result()
+                except Exception as e:
+                    print(f"  ✗ {page.url}: {e}")
+                    stats['failed'] += 1
+                    continue
+                # The row describes the page as fetched then, not now
+                recipe.scraped_date = datetime.fromtimestamp(page.fetched_at).strftime(DATE_FORMAT)
+                recipes.append(recipe)
+            pending.clear()
+            if recipes:
+                write_batch(supabase, recipes, stats, dry_run)
+            print(f"  … {stats['pages']} page(s): {stats['updated']} updated, {stats['inserted']} new, "
+                  f"{stats['unchanged']} unchanged, {stats['failed']} failed")
+
+        for page in archive.iter_latest(url_like=url_like):
+            stats['pages'] += 1
+            pending.append((page, pool.submit(page.content, page.url, page.headers)))
+            if len(pending) >= batch_size:
+                drain()
+        if pending:
+            drain()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run extraction over archived pages (no network)")
+    parser.add_argument("--archive",    default=DEFAULT_ARCHIVE_DIR, required=DEFAULT_ARCHIVE_DIR is None,
+                        help="Archive directory (default: $HTML_ARCHIVE_DIR)")
+    parser.add_argument("--workers",    type=int, default=None,
+                        help=f"Parse processes (default: {default_workers()})")
+    parser.add_argument("--site",       default=None,
+                        help="Only pages from this site, e.g. allrecipes.com")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Pages per write batch (default: {BATCH_SIZE})")
+    parser.add_argument("--dry-run",    action="store_true",
+                        help="Extract and compare, but write nothing")
+    args = parser.parse_args()
+
+    start = time.time()
+    with HtmlArchive(args.archive) as archive:
+        print(f"📦 {len(archive)} archived URL(s) in {args.archive}/")
+        stats = reextract(get_supabase(), archive, workers=args.workers, site=args.site,
+                          batch_size=args.batch_size, dry_run=args.dry_run)
+    elapsed = time.time() - start
+    print(
+        f"\n{'═'*60}\n"
+        f"RE-EXTRACTION {'DRY RUN ' if args.dry_run else ''}COMPLETE\n"
+        f"  Pages         : {stats['pages']} ({stats['failed']} failed to parse)\n"
+        f"  Updated       : {stats['updated']}\n"
+        f"  Inserted      : {stats['inserted']}\n"
+        f"  Unchanged     : {stats['unchanged']}\n"
+        f"  Skipped       : {stats['other_version']} (row stored from different page bytes)\n"
+        f"  Total time    : {int(elapsed // 60)}m {int(elapsed % 60)}s\n"
+        f"{'═'*60}"
+    )
+
+
+if __name__ == "__main__":
+    main()
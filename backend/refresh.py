@@ -0,0 +1,165 @@
+# refresh.py
+"""
+Conditional refresh of stored recipes.
+Walks Recipes rows oldest-scraped first and re-checks each page with a
+conditional GET (If-None-Match / If-Modified-Since). Pages answering 304, or
+whose body hash is unchanged, are only re-stamped. Changed pages are
+re-extracted, and only rows whose extracted content actually differs are
+batch-upserted. Runs within a request budget and a wall-clock budget.
+
+Requires migrations/001_refresh_validators.sql.
+
+Usage:
+    python3 refresh.py                              # defaults below
+    python3 refresh.py --max-requests 500 --time-budget 1800
+    python3 refresh.py --min-age-days 14 --delay 2.0
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from recipe_record import CONTENT_COLUMNS, content_changed
+from scraper_v3_railway import RecipeSearchScraper, content_hash
+from storage import SupabaseStorage
+
+SELECT_COLUMNS = ", ".join(["id", "url", "scraped_date", "etag", "last_modified", "content_hash"] + CONTENT_COLUMNS)
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Written back for pages whose bytes changed but whose recipe did not
+VALIDATOR_COLUMNS = ["etag", "last_modified", "content_hash", "scraped_date", "tagger_version"]
+
+
+def _now() -> str:
+    return datetime.now().strftime(DATE_FORMAT)
+
+
+def refresh_stale(
+    scraper: RecipeSearchScraper,
+    max_requests: int = 200,
+    time_budget: float = 600.0,
+    batch_size: int = 50,
+    min_age_days: float = 7.0,
+    delay: float = 1.0,
+) -> Dict[str, int]:
+    """
+    Refresh up to `max_requests` rows last scraped more than `min_age_days`
+    ago, stopping early once `time_budget` seconds have passed.
+    Returns counters: checked, not_modified, same_hash, unchanged, updated, failed.
+    """
+    supabase = scraper.storage.client
+    cutoff = (datetime.now() - timedelta(days=min_age_days)).strftime(DATE_FORMAT)
+    deadline = time.monotonic() + time_budget
+    stats = dict.fromkeys(['checked', 'not_modified', 'same_hash', 'unchanged', 'updated', 'failed'], 0)
+    # Touched rows move past the cutoff, so the next page starts at the front
+    # again; only rows that failed stay behind and have to be skipped over.
+    skip = 0
+
+    while stats['checked'] < max_requests and time.monotonic() < deadline:
+        limit = min(batch_size, max_requests - stats['checked'])
+        rows = supabase.table("Recipes") \
+            .select(SELECT_COLUMNS) \
+            .lt("scraped_date", cutoff) \
+            .order("scraped_date") \
+            .range(skip, skip + limit - 1) \
+            .execute().data
+        if not rows:
+            break
+
+        touched_ids: List[int] = []
+        upserts: List[Dict] = []
+        revalidated: List[Dict] = []
+        for row in rows:
+            if time.monotonic() >= deadline:
+                break
+            stats['checked'] += 1
+            headers = dict(scraper.headers)
+            if row.get('etag'):
+                headers['If-None-Match'] = row['etag']
+            if row.get('last_modified'):
+                headers['If-Modified-Since'] = row['last_modified']
+            try:
+                response = scraper.fetch_recipe_page(row['url'], headers)
+                if response.status_code == 304:
+                    stats['not_modified'] += 1
+                    touched_ids.append(row['id'])
+                    continue
+                body_hash = content_hash(response.content)
+                if body_hash == row.get('content_hash'):
+                    stats['same_hash'] += 1
+                    touched_ids.append(row['id'])
+                    continue
+                fresh = scraper.parse_recipe(response.content, row['url'], response.headers).to_row()
+            except Exception as e:
+                print(f"  ✗ {row['url']}: {e}")
+                stats['failed'] += 1
+                skip += 1
+                continue
+            finally:
+                time.sleep(delay)
+
+            fresh.update(id=row['id'], url=row['url'])
+            if content_changed(row, fresh):
+                stats['updated'] += 1
+                upserts.append(fresh)
+            else:
+                # Same recipe, new bytes (ads, timestamps): keep the new validators
+                stats['unchanged'] += 1
+                revalidated.append({"id": row['id'], **{col: fresh[col] for col in VALIDATOR_COLUMNS}})
+
+        if upserts:
+            supabase.table("Recipes").upsert(upserts, on_conflict="id").execute()
+        if revalidated:
+            supabase.table("Recipes").upsert(revalidated, on_conflict="id").execute()
+        if touched_ids:
+            supabase.table("Recipes").update({"scraped_date": _now()}).in_("id", touched_ids).execute()
+        print(f"  … checked {stats['checked']}: {stats['updated']} updated, "
+              f"{stats['not_modified'] + stats['same_hash'] + stats['unchanged']} unchanged, "
+              f"{stats['failed']} failed")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-check stored recipes, oldest first")
+    parser.add_argument("--max-requests", type=int,   default=200,
+                        help="Max pages to fetch this run (default: 200)")
+    parser.add_argument("--time-budget",  type=float, default=600.0,
+                        help="Stop after this many seconds (default: 600)")
+    parser.add_argument("--batch-size",   type=int,   default=50,
+                        help="Rows per select / upsert batch (default: 50)")
+    parser.add_argument("--min-age-days", type=float, default=7.0,
+                        help="Only refresh rows scraped longer ago than this (default: 7)")
+    parser.add_argument("--delay",        type=float, default=1.0,
+                        help="Seconds between requests (default: 1.0)")
+    args = parser.parse_args()
+
+    # Refresh updates rows in place through the Supabase client directly
+    scraper = RecipeSearchScraper(use_url_index=False, storage=SupabaseStorage())
+    start = time.time()
+    stats = refresh_stale(
+        scraper,
+        max_requests=args.max_requests,
+        time_budget=args.time_budget,
+        batch_size=args.batch_size,
+        min_age_days=args.min_age_days,
+        delay=args.delay,
+    )
+    scraper._save_state()
+    elapsed = time.time() - start
+    print(
+        f"\n{'═'*60}\n"
+        f"REFRESH COMPLETE\n"
+        f"  Checked       : {stats['checked']}\n"
+        f"  304 / same    : {stats['not_modified']} / {stats['same_hash']}\n"
+        f"  Re-parsed, unchanged : {stats['unchanged']}\n"
+        f"  Updated       : {stats['updated']}\n"
+        f"  Failed        : {stats['failed']}\n"
+        f"  Total time    : {int(elapsed // 60)}m {int(elapsed % 60)}s\n"
+        f"{'═'*60}"
+    )
+    print(f"  {scraper.fetch_stats.report()}")
+    print(f"  {scraper.retries.report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+# retag.py
+"""
+Batch dietary re-tagging of stored recipes.
+Applies the current tag rules (dietary_tags.py) to every Recipes row from its
+stored ingredients and nutrient columns, with no re-scraping. Each row's
+ingredient text is scanned once by the tag matcher into a sparse
+recipe×term presence matrix; every rule is then evaluated for all rows at
+once as NumPy boolean operations over its columns. Only rows whose tags
+change are written, in bulk: one update per distinct tag set and id chunk.
+
+Before writing, a sample of rows is re-tagged one by one with
+dietary_tags() and must agree with the batch result.
+
+--stale is the incremental mode for rolling out a rule change: it streams
+only rows whose tagger_version differs from the current rules' hash, in
+bounded batches in id order, and checkpoints the last id written so an
+interrupted run resumes where it stopped. Every row it touches gets the
+current tagger_version. Requires migrations/002_tagger_version.sql.
+
+Usage:
+    python3 retag.py                     # re-tag everything, write changes
+    python3 retag.py --dry-run           # report what would change
+    python3 retag.py --verify 1000
+    python3 retag.py --stale --batch-size 500 --time-budget 600 --pause 1
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from dietary_tags import (
+    ALLIUMS, BEEF_SOURCES, BUDDHIST_MEAT_SOURCES, BUDDHIST_SIGNALS, DAIRY_FREE_SIGNALS,
+    DAIRY_SOURCES, GLUTEN_FREE_SIGNALS, GLUTEN_SOURCES, HALAL_SIGNALS, HARAM_INGREDIENTS,
+    HIGH_PROTEIN_INGREDIENTS, HIGH_PROTEIN_SIGNALS, HIGH_SODIUM_INGREDIENTS, HIGH_SUGAR_CARB,
+    HINDU_SIGNALS, KETO_DISQUALIFIERS, KETO_SIGNALS, KOSHER_DAIRY_WORDS, KOSHER_MEAT_WORDS,
+    KOSHER_SIGNALS, LAND_MEAT, LOW_CAL_SIGNALS, LOW_SODIUM_SIGNALS, LOW_SUGAR_SIGNALS,
+    NON_VEG, NON_VEGAN, NUT_SOURCES, PALEO_DISQUALIFIERS, PALEO_SIGNALS, SHELLFISH_SOURCES,
+    SUBSTRING_TERMS, TREIF_INGREDIENTS, WORD_TERMS, TermMatcher, dietary_tags, get_matcher,
+    tagger_version,
+)
+from extraction_context import NUTRIENT_UNITS, ExtractionContext, parse_amount
+from storage import get_supabase
+
+LOAD_CHUNK_SIZE = 1000    # Supabase caps a select at 1000 rows by default
+WRITE_CHUNK_SIZE = 500    # ids per update ... in (...) request
+STALE_BATCH_SIZE = 500
+DEFAULT_CHECKPOINT_FILE = os.environ.get("RETAG_CHECKPOINT_FILE", "retag_checkpoint.json")
+
+# Nutrients the tag rules read -> Recipes column they are stored in
+NUTRIENT_COLUMNS = {
+    'calories':            'calories',
+    'sugarContent':        'sugar_content',
+    'carbohydrateContent': 'carbohydrate_content',
+    'proteinContent':      'protein_content',
+    'sodiumContent':       'sodium_content',
+}
+SELECT_COLUMNS = ", ".join(["id", "ingredients", "dietary_tags", "tagger_version"] + list(NUTRIENT_COLUMNS.values()))
+
+# The order dietary_tags() emits tags in
+TAG_ORDER = [
+    'vegan', 'vegetarian', 'pescatarian', 'gluten-free', 'lactose-free', 'nut-free',
+    'shellfish-free', 'diabetic-friendly', 'keto', 'low-calorie', 'high-protein',
+    'halal', 'kosher', 'hindu-friendly', 'buddhist-friendly', 'low-sodium', 'paleo',
+]
+
+
+class StoredRecipe:
+    """A Recipes row behind the two scraper methods ExtractionContext reads."""
+
+    def __init__(self, row: Dict):
+        self.row = row
+
+    def ingredients(self) -> List[str]:
+        return (self.row.get('ingredients') or '').split(' | ')
+
+    def nutrients(self) -> Dict[str, str]:
+        return {key: self.row[col] for key, col in NUTRIENT_COLUMNS.items() if self.row.get(col)}
+
+
+def load_rows(supabase, chunk_size: int = LOAD_CHUNK_SIZE, columns: str = SELECT_COLUMNS) -> List[Dict]:
+    """Every Recipes row, paged by id (keyset pagination)."""
+    rows: List[Dict] = []
+    last_id = 0
+    while True:
+        chunk = supabase.table("Recipes") \
+            .select(columns) \
+            .gt("id", last_id) \
+            .order("id") \
+            .limit(chunk_size) \
+            .execute().data
+        if not chunk:
+            break
+        rows.extend(chunk)
+        last_id = chunk[-1]["id"]
+        if len(chunk) < chunk_size:
+            break
+    return rows
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BATCH TAGGER
+# ═══════════════════════════════════════════════════════════════
+
+class BatchTagger:
+    """Evaluates the tag rules for many stored rows at once."""
+
+    def __init__(self, matcher: Optional[TermMatcher] = None):
+        self.matcher = matcher or get_matcher()
+        self._word_col = {t: i for i, t in enumerate(sorted(WORD_TERMS))}
+        self._signal_col = {t: len(self._word_col) + i for i, t in enumerate(sorted(SUBSTRING_TERMS))}
+
+    def term_matrix(self, rows: List[Dict]) -> sparse.csc_matrix:
+        """recipe × term presence: whole-word terms first, then substring signals."""
+        indptr, indices = [0], []
+        for row in rows:
+            words, signals = self.matcher.scan(ExtractionContext(StoredRecipe(row)).text)
+            indices.extend(self._word_col[t] for t in words)
+            indices.extend(self._signal_col[t] for t in signals)
+            indptr.append(len(indices))
+        shape = (len(rows), len(self._word_col) + len(self._signal_col))
+        data = np.ones(len(indices), dtype=np.bool_)
+        return sparse.csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr)), shape=shape).tocsc()
+
+    @staticmethod
+    def nutrient_values(rows: List[Dict], key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(value in the rule's unit, NaN if missing or unreadable; unreadable mask)."""
+        values = np.full(len(rows), np.nan)
+        unreadable = np.zeros(len(rows), dtype=np.bool_)
+        column, unit = NUTRIENT_COLUMNS[key], NUTRIENT_UNITS.get(key, 'g')
+        for i, row in enumerate(rows):
+            try:
+                value = parse_amount(row.get(column) or '', unit)
+            except Exception:
+                unreadable[i] = True
+                continue
+            if value is not None:
+                values[i] = value
+        return values, unreadable
+
+    def tags(self, rows: List[Dict]) -> List[str]:
+        """The dietary_tags string for each row, as parse_recipe() would store it."""
+        if not rows:
+            return []
+        matrix = self.term_matrix(rows)
+
+        def words(terms) -> np.ndarray:
+            return matrix[:, [self._word_col[t] for t in terms]].getnnz(axis=1) > 0
+
+        def signals(terms) -> np.ndarray:
+            return matrix[:, [self._signal_col[t] for t in terms]].getnnz(axis=1) > 0
+
+        sugar, sugar_bad = self.nutrient_values(rows, 'sugarContent')
+        carbs, carbs_bad = self.nutrient_values(rows, 'carbohydrateContent')
+        calories, _ = self.nutrient_values(rows, 'calories')
+        protein, _ = self.nutrient_values(rows, 'proteinContent')
+        sodium, _ = self.nutrient_values(rows, 'sodiumContent')
+
+        with np.errstate(invalid='ignore'):
+            vegan = ~words(NON_VEGAN)
+            low_sugar_signal, high_sugar_carb = signals(LOW_SUGAR_SIGNALS), words(HIGH_SUGAR_CARB)
+            columns = {
+                'vegan':             vegan,
+                'vegetarian':        ~vegan & ~words(NON_VEG),
+                'pescatarian':       ~words(LAND_MEAT),
+                'gluten-free':       signals(GLUTEN_FREE_SIGNALS) | ~words(GLUTEN_SOURCES),
+                'lactose-free':      signals(DAIRY_FREE_SIGNALS) | ~words(DAIRY_SOURCES),
+                'nut-free':          ~words(NUT_SOURCES),
+                'shellfish-free':    ~words(SHELLFISH_SOURCES),
+                'diabetic-friendly': np.where(
+                    sugar_bad | carbs_bad,
+                    low_sugar_signal | ~high_sugar_carb,
+                    ((sugar <= 10) & (carbs <= 30)) | (low_sugar_signal & ~high_sugar_carb),
+                ),
+                'keto':              (carbs <= 10) | (signals(KETO_SIGNALS) & ~words(KETO_DISQUALIFIERS)),
+                'low-calorie':       (calories <= 400) | signals(LOW_CAL_SIGNALS),
+                'high-protein':      ((protein >= 20) | signals(HIGH_PROTEIN_SIGNALS)
+                                      | words(HIGH_PROTEIN_INGREDIENTS)),
+                'halal':             signals(HALAL_SIGNALS) | ~words(HARAM_INGREDIENTS),
+                'kosher':            signals(KOSHER_SIGNALS) | (
+                    ~words(TREIF_INGREDIENTS) & ~(words(KOSHER_MEAT_WORDS) & words(KOSHER_DAIRY_WORDS))),
+                'hindu-friendly':    signals(HINDU_SIGNALS) | ~words(BEEF_SOURCES),
+                'buddhist-friendly': signals(BUDDHIST_SIGNALS) | ~words(BUDDHIST_MEAT_SOURCES | ALLIUMS),
+                'low-sodium':        ((sodium <= 600) | signals(LOW_SODIUM_SIGNALS)
+                                      | ~words(HIGH_SODIUM_INGREDIENTS)),
+                'paleo':             signals(PALEO_SIGNALS) | ~words(PALEO_DISQUALIFIERS),
+            }
+
+        # One bit per tag; each distinct tag set is joined into a string once
+        codes = np.zeros(len(rows), dtype=np.int64)
+        for bit, tag in enumerate(TAG_ORDER):
+            codes |= columns[tag].astype(np.int64) << bit
+        unique, inverse = np.unique(codes, return_inverse=True)
+        strings = [', '.join(tag for bit, tag in enumerate(TAG_ORDER) if code >> bit & 1) for code in unique]
+        return [strings[i] for i in inverse.ravel()]
+
+
+def verify(rows: List[Dict], batch_tags: List[str], sample: int) -> int:
+    """Re-tag `sample` random rows with dietary_tags(); returns the mismatch count."""
+    mismatches = 0
+    for i in random.sample(range(len(rows)), min(sample, len(rows))):
+        expected = ', '.join(dietary_tags(ExtractionContext(StoredRecipe(rows[i]))))
+        if expected != batch_tags[i]:
+            mismatches += 1
+            print(f"  ✗ id {rows[i]['id']}: batch '{batch_tags[i]}' != '{expected}'")
+    return mismatches
+
+
+def write_tags(supabase, changes: Dict[str, List[int]], chunk_size: int = WRITE_CHUNK_SIZE) -> int:
+    """
+    One update per tag set and id chunk, stamping the current
+    tagger_version; returns rows written.
+    """
+    version = tagger_version()
+    written = 0
+    for tags, ids in changes.items():
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            supabase.table("Recipes").update({"dietary_tags": tags, "tagger_version": version}) \
+                .in_("id", chunk).execute()
+            written += len(chunk)
+    return written
+
+
+def _group_changes(rows: List[Dict], new_tags: List[str]) -> Tuple[Dict[str, List[int]], int]:
+    """Ids to write grouped by tag set (tags or version differ), and how many have new tags."""
+    version = tagger_version()
+    changes: Dict[str, List[int]] = defaultdict(list)
+    retagged = 0
+    for row, tags in zip(rows, new_tags):
+        tags_differ = (row.get('dietary_tags') or '') != tags
+        if tags_differ or row.get('tagger_version') != version:
+            changes[tags].append(row['id'])
+            retagged += tags_differ
+    return changes, retagged
+
+
+def retag_all(supabase, dry_run: bool = False, sample: int = 200, write_chunk: int = WRITE_CHUNK_SIZE) -> Dict[str, float]:
+    stats: Dict[str, float] = {}
+    start = time.perf_counter()
+    rows = load_rows(supabase)
+    stats['rows'] = len(rows)
+    stats['load_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_tags = BatchTagger().tags(rows)
+    stats['tag_s'] = time.perf_counter() - start
+
+    if sample and rows:
+        bad = verify(rows, new_tags, sample)
+        if bad:
+            raise RuntimeError(f"batch tagger disagrees with dietary_tags() on {bad} sampled row(s); nothing written")
+
+    changes, stats['changed'] = _group_changes(rows, new_tags)
+    stats['tag_sets'] = len(changes)
+
+    start = time.perf_counter()
+    stats['written'] = 0 if dry_run else write_tags(supabase, changes, write_chunk)
+    stats['write_s'] = time.perf_counter() - start
+    return stats
+
+
+# ═══════════════════════════════════════════════════════════════
+#  INCREMENTAL (STALE ROWS)
+# ═══════════════════════════════════════════════════════════════
+
+def load_checkpoint(filepath: str, version: str) -> int:
+    """Last id written by an unfinished run for `version`, else 0."""
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    return data.get('last_id', 0) if data.get('version') == version else 0
+
+
+def save_checkpoint(filepath: str, version: str, last_id: int):
+    tmp = f"{filepath}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({'version': version, 'last_id': last_id}, f)
+    os.replace(tmp, filepath)
+
+
+def retag_stale(
+    supabase,
+    batch_size: int = STALE_BATCH_SIZE,
+    time_budget: Optional[float] = None,
+    max_rows: Optional[int] = None,
+    pause: float = 0.0,
+    sample: int = 20,
+    checkpoint_file: str = DEFAULT_CHECKPOINT_FILE,
+    dry_run: bool = False,
+) -> Dict[str, float]:
+    """
+    Re-tag rows whose tagger_version isn't the current one, `batch_size`
+    rows at a time, until none are left, `max_rows` have been processed or
+    `time_budget` seconds have passed. Sleeps `pause` seconds between
+    batches to stay out of the way of live scraping. With `dry_run`, nothing
+    is written and the checkpoint is left as it was.
+    """
+    version = tagger_version()
+    last_id = load_checkpoint(checkpoint_file, version)
+    if last_id:
+        print(f"  ↻ Resuming tagger {version} after id {last_id}")
+    deadline = time.monotonic() + time_budget if time_budget else None
+    tagger = BatchTagger()
+    stats: Dict[str, float] = dict.fromkeys(['rows', 'changed', 'written', 'batches'], 0)
+    stats['finished'] = False
+
+    while max_rows is None or stats['rows'] < max_rows:
+        limit = batch_size if max_rows is None else min(batch_size, max_rows - stats['rows'])
+        rows = supabase.table("Recipes") \
+            .select(SELECT_COLUMNS) \
+            .or_(f"tagger_version.is.null,tagger_version.neq.{version}") \
+            .gt("id", last_id) \
+            .order("id") \
+            .limit(limit) \
+            .execute().data
+        if not rows:
+            stats['finished'] = True
+            break
+        new_tags = tagger.tags(rows)
+        if sample:
+            bad = verify(rows, new_tags, sample)
+            if bad:
+                raise RuntimeError(f"batch tagger disagrees with dietary_tags() on {bad} sampled row(s) "
+                                   f"after id {last_id}; stopping")
+        changes, changed = _group_changes(rows, new_tags)
+        if not dry_run:
+            stats['written'] += write_tags(supabase, changes)
+        stats['rows'] += len(rows)
+        stats['changed'] += changed
+        stats['batches'] += 1
+        last_id = rows[-1]['id']
+        if not dry_run:
+            save_checkpoint(checkpoint_file, version, last_id)
+        print(f"  … {stats['rows']} row(s) up to id {last_id}: {stats['changed']} with new tags")
+        if len(rows) < limit:
+            stats['finished'] = True
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        time.sleep(pause)
+
+    if stats['finished'] and not dry_run and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-apply the dietary tag rules to stored recipes")
+    parser.add_argument("--dry-run",     action="store_true",
+                        help="Compute and report changes without writing")
+    parser.add_argument("--verify",      type=int, default=200,
+                        help="Rows to cross-check against dietary_tags() before writing (default: 200)")
+    parser.add_argument("--write-chunk", type=int, default=WRITE_CHUNK_SIZE,
+                        help=f"Ids per bulk update (default: {WRITE_CHUNK_SIZE})")
+    parser.add_argument("--stale",       action="store_true",
+                        help="Only re-tag rows tagged by other rule versions, resumably")
+    parser.add_argument("--batch-size",  type=int, default=STALE_BATCH_SIZE,
+                        help=f"--stale: rows per batch (default: {STALE_BATCH_SIZE})")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="--stale: stop after this many seconds")
+    parser.add_argument("--max-rows",    type=int, default=None,
+                        help="--stale: stop after this many rows")
+    parser.add_argument("--pause",       type=float, default=0.0,
+                        help="--stale: seconds to sleep between batches (default: 0)")
+    args = parser.parse_args()
+
+    if args.stale:
+        start = time.time()
+        stats = retag_stale(get_supabase(), batch_size=args.batch_size, time_budget=args.time_budget,
+                            max_rows=args.max_rows, pause=args.pause, sample=min(args.verify, args.batch_size),
+                            dry_run=args.dry_run)
+        elapsed = time.time() - start
+        print(
+            f"\n{'═'*60}\n"
+            f"STALE RETAG {'DRY RUN ' if args.dry_run else ''}"
+            f"{'COMPLETE' if stats['finished'] else 'PAUSED' if args.dry_run else 'PAUSED (checkpoint saved)'}\n"
+            f"  Tagger version: {tagger_version()}\n"
+            f"  Rows          : {stats['rows']} in {stats['batches']} batch(es)\n"
+            f"  New tags      : {stats['changed']}\n"
+            f"  Written       : {stats['written']}\n"
+            f"  Total time    : {int(elapsed // 60)}m {int(elapsed % 60)}s\n"
+            f"{'═'*60}"
+        )
+        return
+
+    stats = retag_all(get_supabase(), dry_run=args.dry_run, sample=args.verify, write_chunk=args.write_chunk)
+    print(
+        f"\n{'═'*60}\n"
+        f"RETAG {'DRY RUN ' if args.dry_run else ''}COMPLETE\n"
+        f"  Rows          : {stats['rows']} (loaded in {stats['load_s']:.1f}s)\n"
+        f"  Tagged in     : {stats['tag_s']:.2f}s\n"
+        f"  Changed       : {stats['changed']} across {stats['tag_sets']} tag set(s)\n"
+        f"  Written       : {stats['written']} ({stats['write_s']:.1f}s)\n"
+        f"{'═'*60}"
+    )
+
+
+if __name__ == "__main__":
+    main()
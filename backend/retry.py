@@ -0,0 +1,153 @@
+# retry.py
+"""
+Retries for transient fetch failures.
+Timeouts, connection resets and 5xx responses are retried with full-jitter
+exponential backoff (sleep a random 0…min(cap, base·2^n) seconds), and a
+429/503 carrying Retry-After waits as long as the server asks. Retries are
+paid for from a per-host budget — a few to start with plus a fraction of the
+host's requests — so a host that keeps failing cannot soak up the crawl.
+
+    retries = RetryController()
+    response = retries.call('allrecipes.com', lambda: requests.get(url, timeout=10))
+    print(retries.report())
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+RETRY_AFTER_STATUS_CODES = {429, 503}    # retried only when the server says when
+RETRY_EXCEPTIONS = (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)
+MAX_RETRY_AFTER = 60.0                   # longer waits are treated as a refusal
+
+T = TypeVar('T')
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Per host: `min_retries` free retries plus `ratio` retries per request made."""
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._requests: Dict[str, int] = {}
+        self._retries: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, host: str):
+        with self._lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+
+    def try_spend(self, host: str) -> bool:
+        with self._lock:
+            allowed = self.min_retries + self.ratio * self._requests.get(host, 0)
+            if self._retries.get(host, 0) >= allowed:
+                return False
+            self._retries[host] = self._retries.get(host, 0) + 1
+            return True
+
+
+class RetryController:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self._lock = threading.Lock()
+        self.retried = 0          # retry attempts made
+        self.recovered = 0        # calls that succeeded after at least one retry
+        self.exhausted = 0        # calls that still failed after retrying
+        self.budget_denied = 0    # retries refused by the host budget
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _delay_for(self, attempt: int, status: Optional[int], headers) -> Optional[float]:
+        """Seconds to wait before retrying, or None if this outcome is not retried."""
+        if status is None:
+            return self._backoff(attempt)
+        if status in RETRY_AFTER_STATUS_CODES:
+            wait = parse_retry_after((headers or {}).get('Retry-After'))
+            if wait is not None:
+                return wait if wait <= MAX_RETRY_AFTER else None
+        if status in RETRY_STATUS_CODES:
+            return self._backoff(attempt)
+        return None
+
+    def call(self, host: str, fn: Callable[[], T]) -> T:
+        """
+        Run `fn` (one request) until it succeeds, the outcome is not transient,
+        attempts run out, or `host`'s budget is spent. Returns fn's last result
+        or re-raises its last exception. A returned response with a retryable
+        status is retried too, so callers that check status themselves work.
+        """
+        self.budget.record_request(host)
+        attempt = 0
+        while True:
+            error: Optional[Exception] = None
+            result = None
+            try:
+                result = fn()
+                status = getattr(result, 'status_code', None)
+                delay = self._delay_for(attempt, status, getattr(result, 'headers', None)) if status else None
+            except RETRY_EXCEPTIONS as e:
+                error, delay = e, self._delay_for(attempt, None, None)
+            except requests.HTTPError as e:
+                response = e.response
+                error = e
+                delay = self._delay_for(attempt, response.status_code, response.headers) if response is not None else None
+
+            if delay is None:
+                if attempt:
+                    # A retry that ended in a non-retryable error (e.g. a 404) did not recover
+                    ok = error is None and (status is None or status < 400)
+                    self._count(**({'recovered': 1} if ok else {'exhausted': 1}))
+                if error is not None:
+                    raise error
+                return result
+            if attempt + 1 >= self.max_attempts or not self.budget.try_spend(host):
+                if attempt + 1 < self.max_attempts:
+                    self._count(budget_denied=1)
+                self._count(exhausted=1)
+                if error is not None:
+                    raise error
+                return result
+            self._count(retried=1)
+            time.sleep(delay)
+            attempt += 1
+
+    def report(self) -> str:
+        return (f"Retries: {self.retried} attempted, {self.recovered} recovered, "
+                f"{self.exhausted} still failed, {self.budget_denied} denied by host budget")
@@ -0,0 +1,217 @@
+# robots.py
+"""
+robots.txt cache and crawl-delay scheduling.
+Each host's robots.txt is fetched once per TTL (cached across runs in
+robots_cache.json) and compiled into a single anchored regex: the rules are
+ordered longest-first with Allow winning ties, so the first alternative that
+matches is the governing rule. Search and recipe URLs are checked against it
+before any request, and each host's Crawl-delay spaces out our requests to it.
+Groups are matched against the User-Agent we actually send. The file's
+Sitemap: lines are kept too, so sitemap discovery never fetches robots.txt
+itself.
+
+    robots = RobotsCache(headers)
+    if robots.allowed(url):
+        robots.wait_turn(url)
+        requests.get(url, ...)
+    robots.rules(url).sitemaps     # Sitemap: URLs advertised for url's host
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+DEFAULT_CACHE_FILE = os.environ.get("ROBOTS_CACHE_FILE", "robots_cache.json")
+ROBOTS_USER_AGENT = "recipe-scraper"   # matched against User-agent groups when no User-Agent header is sent
+ROBOTS_TTL = 24 * 3600
+ERROR_TTL = 3600                       # retry unreachable robots.txt sooner
+MAX_CRAWL_DELAY = 30.0                 # hosts asking for more are skipped for the run
+
+
+# ═══════════════════════════════════════════════════════════════
+#  PARSE + COMPILE
+# ═══════════════════════════════════════════════════════════════
+
+def _pattern_to_regex(pattern: str) -> str:
+    anchored = pattern.endswith('$')
+    body = pattern[:-1] if anchored else pattern
+    regex = '.*'.join(re.escape(part) for part in body.split('*'))
+    return regex + ('$' if anchored else '')
+
+
+class RobotsRules:
+    """The rules of the group that applies to us, compiled into one matcher."""
+
+    def __init__(
+        self,
+        rules: List[Tuple[bool, str]],
+        crawl_delay: Optional[float] = None,
+        sitemaps: Optional[List[str]] = None,
+    ):
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        # Longest pattern first, Allow before Disallow on equal length
+        ordered = sorted((r for r in rules if r[1]), key=lambda r: (-len(r[1]), not r[0]))
+        self._matcher: Optional[Pattern] = None
+        if ordered:
+            self._matcher = re.compile('|'.join(
+                f"(?P<{'a' if allow else 'd'}{i}>{_pattern_to_regex(path)})"
+                for i, (allow, path) in enumerate(ordered)
+            ))
+
+    def allowed(self, path: str) -> bool:
+        if self._matcher is None or path == '/robots.txt':
+            return True
+        m = self._matcher.match(path)
+        return m is None or m.lastgroup[0] == 'a'
+
+    @classmethod
+    def parse(cls, text: str, agent: str = ROBOTS_USER_AGENT) -> 'RobotsRules':
+        """
+        Pick the group(s) naming a token found in `agent` (the User-Agent we
+        send), else the '*' group(s), following the usual rules: consecutive
+        User-agent lines share one group, groups for the same agent are merged,
+        and an empty User-agent value names nobody. Sitemap: lines belong to
+        no group and are kept whichever group applies.
+        """
+        groups: List[Tuple[List[str], List[Tuple[bool, str]], List[float]]] = []
+        agents: List[str] = []
+        sitemaps: List[str] = []
+        in_rules = False
+        for raw_line in text.splitlines():
+            line = raw_line.split('#', 1)[0].strip()
+            key, sep, value = line.partition(':')
+            if not sep:
+                continue
+            key, value = key.strip().lower(), value.strip()
+            if key == 'sitemap':
+                if value and value not in sitemaps:
+                    sitemaps.append(value)
+            elif key == 'user-agent':
+                if in_rules:
+                    agents, in_rules = [], False
+                if not agents and not (groups and groups[-1][0] is agents):
+                    groups.append((agents, [], []))
+                if value:
+                    agents.append(value.lower())
+            elif key in ('allow', 'disallow') and groups:
+                in_rules = True
+                groups[-1][1].append((key == 'allow', value))
+            elif key == 'crawl-delay' and groups:
+                in_rules = True
+                try:
+                    groups[-1][2].append(float(value))
+                except ValueError:
+                    pass
+
+        agent = agent.lower()
+        for wanted in (lambda a: a != '*' and a in agent, lambda a: a == '*'):
+            matching = [g for g in groups if any(wanted(a) for a in g[0])]
+            if matching:
+                rules = [r for g in matching for r in g[1]]
+                delays = [d for g in matching for d in g[2]]
+                return cls(rules, max(delays) if delays else None, sitemaps)
+        return cls([], sitemaps=sitemaps)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  CACHE + SCHEDULER
+# ═══════════════════════════════════════════════════════════════
+
+def _host_key(url: str) -> str:
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class RobotsCache:
+    """
+    robots.txt per host, refetched after `ttl` seconds. Persisted as raw text
+    with its fetch time; compiled on first use in each run. Also tracks when
+    each host may next be requested under its Crawl-delay.
+    """
+
+    def __init__(self, headers: Dict[str, str], filepath: str = DEFAULT_CACHE_FILE, ttl: float = ROBOTS_TTL):
+        self.headers = headers
+        self.agent = headers.get('User-Agent') or ROBOTS_USER_AGENT
+        self.filepath = filepath
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._raw: Dict[str, Dict] = {}        # host -> {'text', 'fetched_at', 'ttl'}
+        self._compiled: Dict[str, RobotsRules] = {}
+        self._next_request: Dict[str, float] = {}
+        self.disallowed = 0
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    self._raw = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Could not read robots cache ({e}) — starting fresh")
+
+    def _fetch(self, host: str) -> Dict:
+        try:
+            response = requests.get(f"https://{host}/robots.txt", headers=self.headers, timeout=10)
+        except requests.RequestException:
+            return {'text': '', 'fetched_at': time.time(), 'ttl': ERROR_TTL}
+        if response.ok:
+            return {'text': response.text, 'fetched_at': time.time(), 'ttl': self.ttl}
+        # 4xx: no robots.txt, crawl freely; 5xx: unknown, allow but look again soon
+        return {'text': '', 'fetched_at': time.time(), 'ttl': self.ttl if response.status_code < 500 else ERROR_TTL}
+
+    def rules(self, url: str) -> RobotsRules:
+        host = _host_key(url)
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            entry = self._raw.get(host)
+            if entry is None or time.time() - entry['fetched_at'] > entry.get('ttl', self.ttl):
+                entry = self._fetch(host)
+                with self._lock:
+                    self._raw[host] = entry
+                    self._compiled.pop(host, None)
+            compiled = self._compiled.get(host)
+            if compiled is None:
+                compiled = RobotsRules.parse(entry['text'], self.agent)
+                with self._lock:
+                    self._compiled[host] = compiled
+            return compiled
+
+    def allowed(self, url: str) -> bool:
+        rules = self.rules(url)
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        ok = rules.allowed(path) and (rules.crawl_delay or 0) <= MAX_CRAWL_DELAY
+        if not ok:
+            with self._lock:
+                self.disallowed += 1
+        return ok
+
+    def filter_allowed(self, urls: List[str]) -> List[str]:
+        return [u for u in urls if self.allowed(u)]
+
+    def wait_turn(self, url: str):
+        """Sleep until `url`'s host may be requested again under its Crawl-delay."""
+        delay = self.rules(url).crawl_delay
+        if not delay:
+            return
+        host = _host_key(url)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, 0.0))
+            self._next_request[host] = start + delay   # reserve our slot before sleeping
+        if start > now:
+            time.sleep(start - now)
+
+    def save(self):
+        with self._lock:
+            raw = json.dumps(self._raw)
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(raw)
+        os.replace(tmp, self.filepath)
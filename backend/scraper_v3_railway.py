@@ -1,7 +1,8 @@
 # scraper_v3_railway.py
 """
 Recipe Search & Scraper
-Searches for recipes across multiple websites and stores data in Supabase.
+Searches for recipes across multiple websites and stores data in Supabase
+(or a local SQLite file — see storage.py).
 
 Usage (interactive):
     python3 scraper_v3_railway.py
@@ -12,21 +13,38 @@ Dependencies:
 
 from recipe_scrapers import scrape_html
 import requests
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-from urllib.parse import quote_plus, urlparse
+from bs4 import XMLParsedAsHTMLWarning
+from urllib.parse import urljoin, urlparse
 import time
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 import re
+import hashlib
 import warnings
 import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from supabase import create_client, Client
+from site_stats import SiteStatsStore
+from storage import SAVE_CHUNK_SIZE, RecipeStorage, get_storage
+from concurrency import ConcurrencyController
+from dietary_tags import dietary_tags, tagger_version
+from extraction_context import ExtractionContext
+from fetch import DEFAULT_MAX_BYTES, FetchedPage, FetchStats, fetch_page
+from html_archive import DEFAULT_ARCHIVE_DIR, HtmlArchive
+from ingredient_parser import parse_ingredient_lines
+from jsonld_recipe import load_recipe
+from parse_pool import ParsePool
+from recipe_record import NUTRIENT_FIELDS, RecipeRecord
+from recipe_writer import BufferedRecipeWriter, MAX_DELAY
+from retry import RetryController
+from robots import RobotsCache
+from link_extract import DEFAULT_LINK_EXTRACTOR, extract_next_link, get_link_extractor
+from site_registry import SiteConfig, get_site_config
+from sitemap_discovery import SitemapState, discover_site
+from url_index import KnownUrlIndex
+from url_canon import canonicalize, fetch_url, preferred_url
 
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
-SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")  # use service role key for scraper
 DEFAULT_SITES_FILE = "website-recipe-list.txt"
 
 # ═══════════════════════════════════════════════════════════════
@@ -90,159 +108,25 @@ def load_recipe_sites(filepath: str = DEFAULT_SITES_FILE) -> List[str]:
     return sites
 
 
-# ═══════════════════════════════════════════════════════════════
-#  SITE SEARCH CONFIGS
-# ═══════════════════════════════════════════════════════════════
-
-SITE_SEARCH_CONFIGS = {
-    'cooking.nytimes.com': {
-        'search_url': 'https://cooking.nytimes.com/search?q={query}',
-        'recipe_path_re': r'/recipes/\d+',
-    },
-    'bonappetit.com': {
-        'search_url': 'https://www.bonappetit.com/search?q={query}',
-        'recipe_path_re': r'/recipe/[a-z0-9-]+$',
-    },
-    'epicurious.com': {
-        'search_url': 'https://www.epicurious.com/search/{query}',
-        'recipe_path_re': r'/recipes/food/views/',
-    },
-    'food52.com': {
-        'search_url': 'https://food52.com/search?q={query}',
-        'recipe_path_re': r'/recipes/\d+',
-    },
-    'seriouseats.com': {
-        'search_url': 'https://www.seriouseats.com/search?q={query}',
-        'recipe_path_re': r'seriouseats\.com/(?!search|category|author|tag)[a-z0-9-]+-recipe',
-    },
-    'allrecipes.com': {
-        'search_url': 'https://www.allrecipes.com/search?q={query}',
-        'recipe_path_re': r'/recipe/\d+/',
-    },
-    'foodnetwork.com': {
-        'search_url': 'https://www.foodnetwork.com/search/{query}-',
-        'recipe_path_re': r'/recipes/[^/]+/[^/]+-recipe-\d+',
-    },
-    'tasty.co': {
-        'search_url': 'https://tasty.co/search?q={query}',
-        'recipe_path_re': r'/recipe/[a-z0-9-]+$',
-    },
-    'bbcgoodfood.com': {
-        'search_url': 'https://www.bbcgoodfood.com/search?q={query}',
-        'recipe_path_re': r'/recipes/(?!category|collection|glossary)[a-z0-9-]+$',
-    },
-    'jamieoliver.com': {
-        'search_url': 'https://www.jamieoliver.com/search/?s={query}',
-        'recipe_path_re': r'/recipes/[^/]+/[a-z0-9-]+/?$',
-    },
-    'marmiton.org': {
-        'search_url': 'https://www.marmiton.org/recettes/recherche.aspx?aqt={query}',
-        'recipe_path_re': r'/recettes/recette_',
-    },
-    'chefkoch.de': {
-        'search_url': 'https://www.chefkoch.de/suche.php?suche={query}',
-        'recipe_path_re': r'/rezepte/\d+/',
-    },
-    'delish.com': {
-        'search_url': 'https://www.delish.com/search/?q={query}',
-        'recipe_path_re': r'/cooking/recipe-ideas/[a-z0-9-]+$',
-    },
-    'americastestkitchen.com': {
-        'search_url': 'https://www.americastestkitchen.com/search?q={query}',
-        'recipe_path_re': r'/recipes/\d+',
-    },
-    'bettycrocker.com': {
-        'search_url': 'https://www.bettycrocker.com/search#q={query}&t=recipe',
-        'recipe_path_re': r'/recipes/[a-z0-9-]+/[a-z0-9-]+-\d+',
-    },
-    'kingarthurbaking.com': {
-        'search_url': 'https://www.kingarthurbaking.com/search?q={query}',
-        'recipe_path_re': r'/recipes/[a-z0-9-]+-recipe$',
-    },
-}
-
-DEFAULT_CONFIG = {
-    'search_url': 'https://www.{site}/search?q={query}',
-    'recipe_path_re': r'/recipes?/(?!category|tag|author|collection|index|search|browse|list|ideas)[a-z0-9][a-z0-9_-]{3,}/?$',
-}
-
-LISTING_PATH_SEGMENTS = {
-    'category', 'categories', 'tag', 'tags', 'author', 'authors',
-    'collection', 'collections', 'index', 'browse', 'archive',
-    'search', 'list', 'gallery', 'topic', 'cuisine', 'meal-type',
-    'ingredient', 'how-to', 'technique',
-}
-
 PERMANENT_FAILURE_CODES = {402, 403, 406, 429}
+SITEMAP_QUERY = "[sitemap]"   # search_log.query value for sitemap crawls
+
+# Search pagination: fetch another result page only while at least this share
+# of the previous page's recipe links were neither stored nor already seen.
+MAX_SEARCH_PAGES = 3
+MIN_NEW_FRACTION = 0.5
 
 
 # ═══════════════════════════════════════════════════════════════
-#  SUPABASE HELPERS
+#  STORAGE HELPERS
 # ═══════════════════════════════════════════════════════════════
 
-def get_supabase() -> Client:
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise ValueError("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY environment variables")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+def content_hash(html: bytes) -> str:
+    return hashlib.sha256(html).hexdigest()
 
 
-def save_recipe(supabase: Client, recipe: Dict) -> bool:
-    """
-    Insert a recipe. Skips duplicates by checking URL first.
-    Returns True if inserted, False if duplicate.
-    """
-    # FIX 1: consistent lowercase table name "recipes" everywhere
-    existing = supabase.table("Recipes").select("id").eq("url", recipe["url"]).execute()
-    if existing.data:
-        return False
-
-    row = {
-        "title":                   recipe.get("title"),
-        "url":                     recipe.get("url"),
-        "author":                  recipe.get("author"),
-        "source_site":             recipe.get("source_site"),
-        "image_url":               recipe.get("image_url"),
-        "total_time":              recipe.get("total_time"),
-        "yields":                  recipe.get("yields"),
-        "cuisine":                 recipe.get("cuisine"),
-        "category":                recipe.get("category"),
-        "calories":                recipe.get("calories"),
-        "fat_content":             recipe.get("fatContent"),
-        "saturated_fat_content":   recipe.get("saturatedFatContent"),
-        "trans_fat_content":       recipe.get("transFatContent"),
-        "unsaturated_fat_content": recipe.get("unsaturatedFatContent"),
-        "carbohydrate_content":    recipe.get("carbohydrateContent"),
-        "sugar_content":           recipe.get("sugarContent"),
-        "fiber_content":           recipe.get("fiberContent"),
-        "protein_content":         recipe.get("proteinContent"),
-        "sodium_content":          recipe.get("sodiumContent"),
-        "cholesterol_content":     recipe.get("cholesterolContent"),
-        "dietary_tags":            recipe.get("dietary_tags"),
-        "ingredients":             recipe.get("ingredients"),
-        "instructions":            recipe.get("instructions"),
-        "scraped_date":            recipe.get("scraped_date"),
-    }
-
-    supabase.table("Recipes").insert(row).execute()
-    return True
-
-
-def log_search(supabase: Client, query: str, sites: Optional[List[str]], results: int):
-    supabase.table("search_log").insert({
-        "query":          query,
-        "sites_used":     ','.join(sites) if sites else 'all',
-        "results_found":  results,
-        "searched_at":    datetime.now().isoformat(),
-    }).execute()
-
-
-def list_recipes(supabase: Client, limit: int = 50):
-    # FIX 1: consistent lowercase table name
-    rows = supabase.table("Recipes") \
-        .select("id, title, source_site, cuisine, dietary_tags, scraped_date") \
-        .order("id", desc=True) \
-        .limit(limit) \
-        .execute().data
+def list_recipes(storage: RecipeStorage, limit: int = 50):
+    rows, total = storage.list_recipes(limit)
 
     if not rows:
         print("  (no recipes saved yet)")
@@ -257,17 +141,14 @@ def list_recipes(supabase: Client, limit: int = 50):
             f"{str(r['cuisine'] or '')[:14]:<15} "
             f"{str(r['dietary_tags'] or '')[:30]}"
         )
-    total = supabase.table("Recipes").select("id", count="exact").execute().count
     print(f"\n  Showing {len(rows)} of {total} saved recipe(s).")
 
 
-def view_recipe(supabase: Client, recipe_id: int):
-    # FIX 1: consistent lowercase table name
-    rows = supabase.table("Recipes").select("*").eq("id", recipe_id).execute().data
-    if not rows:
+def view_recipe(storage: RecipeStorage, recipe_id: int):
+    r = storage.get_recipe(recipe_id)
+    if r is None:
         print(f"  No recipe with ID {recipe_id}.")
         return
-    r = rows[0]
     print(f"\n  {'═'*60}")
     print(f"  {r['title']}")
     print(f"  {'═'*60}")
@@ -307,123 +188,54 @@ def view_recipe(supabase: Client, recipe_id: int):
 #  SCRAPER CLASS
 # ═══════════════════════════════════════════════════════════════
 
-class RecipeSearchScraper:
+class RecipeParser:
+    """
+    Turns a downloaded recipe page into a recipe dict. Holds no connections
+    or network state, so it can also run inside parse worker processes.
+    """
     NUTRIENT_KEYS = [
         'calories', 'fatContent', 'saturatedFatContent', 'transFatContent',
         'unsaturatedFatContent', 'carbohydrateContent', 'sugarContent',
         'fiberContent', 'proteinContent', 'sodiumContent', 'cholesterolContent',
     ]
 
-    def __init__(self):
-        self.headers = {
-            'User-Agent': (
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/120.0.0.0 Safari/537.36'
-            ),
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
-        self._blocked_sites: Set[str] = set()
-        self.supabase = get_supabase()
-        print("  ✅ Connected to Supabase")
-
-    def _get_site_config(self, site: str) -> dict:
-        config = SITE_SEARCH_CONFIGS.get(site, {})
-        search_url = config.get('search_url', DEFAULT_CONFIG['search_url'].replace('{site}', site))
-        recipe_path_re = config.get('recipe_path_re', DEFAULT_CONFIG['recipe_path_re'])
-        return {'search_url': search_url, 'recipe_path_re': recipe_path_re}
-
-    def _is_recipe_url(self, href: str, site: str, recipe_path_re: str) -> bool:
-        if not re.search(recipe_path_re, href, re.IGNORECASE):
-            return False
-        path = urlparse(href).path.lower().strip('/')
-        segments = set(path.split('/'))
-        return not (segments & LISTING_PATH_SEGMENTS)
+    def __init__(self, prefer_page_canonical: bool = True, jsonld_fast_path: bool = True):
+        self.prefer_page_canonical = prefer_page_canonical
+        self.jsonld_fast_path = jsonld_fast_path
 
-    def _search_site(self, site: str, query: str, limit: int = 6) -> List[str]:
-        if site in self._blocked_sites:
-            return []
-        config = self._get_site_config(site)
-        search_url = config['search_url'].replace('{query}', quote_plus(query))
-        recipe_path_re = config['recipe_path_re']
-        try:
-            response = requests.get(search_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-        except requests.HTTPError as e:
-            code = e.response.status_code if e.response is not None else 0
-            if code in PERMANENT_FAILURE_CODES:
-                self._blocked_sites.add(site)
-            return []
-        except Exception:
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        urls: List[str] = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if href.startswith('/'):
-                href = f"https://{'www.' if not site.startswith('www') else ''}{site}{href}"
-            if site not in href:
-                continue
-            clean_url = href.split('?')[0].rstrip('/')
-            if self._is_recipe_url(clean_url, site, recipe_path_re):
-                if clean_url not in urls:
-                    urls.append(clean_url)
-                if len(urls) >= limit:
-                    break
-        if urls:
-            print(f"    ✓ {site}: {len(urls)} recipe(s)")
-        return urls
-
-    def search_recipe_sites_directly(
-        self,
-        query: str,
-        num_results: int = 20,
-        sites: Optional[List[str]] = None,
-        max_workers: int = 10,
-        per_site_limit: int = 6,
-    ) -> List[str]:
-        target_sites = sites if sites is not None else DEFAULT_RECIPE_SITES
-        print(f"\n🔍 Searching {len(target_sites)} recipe site(s) for: '{query}'")
-        recipe_urls: List[str] = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_site = {
-                executor.submit(self._search_site, site, query, per_site_limit): site
-                for site in target_sites
-            }
-            for future in as_completed(future_to_site):
-                recipe_urls.extend(future.result())
-        unique_urls = list(dict.fromkeys(recipe_urls))
-        if self._blocked_sites:
-            print(f"  ℹ️  {len(self._blocked_sites)} site(s) blocked/paywalled (skipped)")
-        print(f"✓Found {len(unique_urls)} unique recipe URL(s)")
-        return unique_urls if num_results is None else unique_urls[:num_results]
-
-    def scrape_recipe(self, url: str) -> Optional[Dict]:
-        try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            scraper = scrape_html(html=response.content, org_url=url)
-            recipe_data = {
-                'title':        scraper.title(),
-                'url':          url,
-                'author':       self._safe_extract(scraper.author) or 'Unknown',
-                'image_url':    self._safe_extract(scraper.image) or '',
-                'total_time':   self._format_time(self._safe_extract(scraper.total_time)),
-                'yields':       self._safe_extract(scraper.yields) or '',
-                'cuisine':      self._safe_extract(scraper.cuisine) or '',
-                'category':     self._safe_extract(scraper.category) or '',
-                'ingredients':  ' | '.join(scraper.ingredients()),
-                'instructions': self._clean_instructions(scraper),
-                **self._extract_nutrients(scraper),
-                'dietary_tags': ', '.join(self._extract_dietary_tags(scraper)),
-                'source_site':  urlparse(url).netloc,
-                'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            }
-            return recipe_data
-        except Exception as e:
-            print(f"  ✗ Failed to scrape {url}: {e}")
-            return None
+    def parse_recipe(self, html: bytes, url: str, response_headers=None) -> RecipeRecord:
+        """
+        Extract a recipe record from a downloaded page. Also records the HTTP
+        validators and a content hash so refresh mode can skip unchanged pages.
+        """
+        response_headers = response_headers or {}
+        if self.jsonld_fast_path:
+            scraper = load_recipe(html, url)
+        else:
+            scraper = scrape_html(html=html, org_url=url)
+        context = ExtractionContext(scraper)
+        page_canonical = self._safe_extract(scraper.canonical_url) if self.prefer_page_canonical else None
+        return RecipeRecord(
+            title=scraper.title(),
+            url=preferred_url(url, page_canonical),
+            author=self._safe_extract(scraper.author) or 'Unknown',
+            image_url=self._safe_extract(scraper.image) or '',
+            total_time=self._format_time(self._safe_extract(scraper.total_time)),
+            yields=self._safe_extract(scraper.yields) or '',
+            cuisine=self._safe_extract(scraper.cuisine) or '',
+            category=self._safe_extract(scraper.category) or '',
+            ingredients=' | '.join(context.ingredients),
+            ingredients_parsed=parse_ingredient_lines(context.ingredients),
+            instructions=self._clean_instructions(scraper),
+            **{NUTRIENT_FIELDS[k]: v for k, v in self._extract_nutrients(context).items()},
+            dietary_tags=', '.join(self._extract_dietary_tags(context)),
+            tagger_version=tagger_version(),
+            source_site=urlparse(url).netloc,
+            scraped_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            etag=response_headers.get('ETag'),
+            last_modified=response_headers.get('Last-Modified'),
+            content_hash=content_hash(html),
+        )
 
     def _safe_extract(self, method):
         try:
@@ -466,10 +278,10 @@ class RecipeSearchScraper:
 
         return joined[:2000] + '...' if len(joined) > 2000 else joined
 
-    def _extract_nutrients(self, scraper) -> Dict[str, str]:
+    def _extract_nutrients(self, context: ExtractionContext) -> Dict[str, str]:
         result = {k: '' for k in self.NUTRIENT_KEYS}
         try:
-            raw = scraper.nutrients()
+            raw = context.nutrients
             if raw:
                 for key, val in raw.items():
                     result[key] = str(val).strip()
@@ -477,392 +289,499 @@ class RecipeSearchScraper:
             pass
         return result
 
-    def _extract_dietary_tags(self, scraper) -> List[str]:
-        tags = []
-        try:
-            ingredients = scraper.ingredients()
-
-            # Vegan / Vegetarian
-            text = ' '.join(ingredients).lower()
-            if self._is_vegan(ingredients):
-                tags.append('vegan')
-            elif self._is_vegetarian(ingredients):
-                tags.append('vegetarian')
-            
-            # Pescatarian
-            if self._is_pescatarian(ingredients):
-                tags.append('pescatarian')
-            
-            # Gluten-Free
-            GLUTEN_SOURCES = {
-                'flour', 'wheat', 'barley', 'rye', 'spelt', 'farro', 'bulgur',
-                'semolina', 'durum', 'triticale', 'malt', 'bread', 'breadcrumbs',
-                'pasta', 'noodles', 'couscous', 'cracker', 'tortilla', 'pita',
-                'soy sauce', 'teriyaki', 'panko', 'seitan', 'beer',
-            }
-            GLUTEN_FREE_SIGNALS = {'gluten-free', 'gluten free', 'gf flour', 'rice flour',
-                                   'almond flour', 'coconut flour', 'tapioca flour'}
-            has_gf_signal  = any(s in text for s in GLUTEN_FREE_SIGNALS)
-            has_gluten     = any(re.search(rf'\b{re.escape(g)}\b', text) for g in GLUTEN_SOURCES)
-            if has_gf_signal or not has_gluten:
-                tags.append('gluten-free')
-            
-            # Lactose-Free
-            DAIRY_SOURCES = {
-                'milk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt',
-                'whey', 'casein', 'lactose', 'ghee', 'kefir', 'sour cream',
-                'half-and-half', 'half and half', 'ice cream', 'custard',
-                'bechamel', 'béchamel',
-            }
-            DAIRY_FREE_SIGNALS = {'dairy-free', 'dairy free', 'non-dairy', 'nondairy',
-                                   'lactose-free', 'lactose free', 'plant-based milk',
-                                   'almond milk', 'oat milk', 'soy milk', 'coconut milk',
-                                   'vegan butter', 'vegan cheese'}
-            has_df_signal = any(s in text for s in DAIRY_FREE_SIGNALS)
-            has_dairy     = any(re.search(rf'\b{re.escape(d)}\b', text) for d in DAIRY_SOURCES)
-            if has_df_signal or not has_dairy:
-                tags.append('lactose-free')
-            
-            # Nut Allergy / Nut-Free
-            NUT_SOURCES = {
-                'almond', 'almonds', 'cashew', 'cashews', 'walnut', 'walnuts',
-                'pecan', 'pecans', 'pistachio', 'pistachios', 'hazelnut', 'hazelnuts',
-                'macadamia', 'pine nut', 'pine nuts', 'brazil nut', 'brazil nuts',
-                'peanut', 'peanuts', 'peanut butter', 'nut butter', 'almond butter',
-                'almond flour', 'almond milk', 'marzipan', 'praline', 'nutella',
-                'mixed nuts', 'chopped nuts',
-            }
-            has_nuts = any(re.search(rf'\b{re.escape(n)}\b', text) for n in NUT_SOURCES)
-            if not has_nuts:
-                tags.append('nut-free')
-            
-            # Shellfish Allergy / Shellfish-Free
-            SHELLFISH_SOURCES = {
-                'shrimp', 'prawn', 'prawns', 'crab', 'lobster', 'crayfish',
-                'crawfish', 'scallop', 'scallops', 'clam', 'clams', 'oyster',
-                'oysters', 'mussel', 'mussels', 'barnacle', 'krill',
-                'cuttlefish', 'squid', 'calamari', 'octopus',
-                'seafood sauce', 'shrimp paste', 'fish sauce',
-            }
-            has_shellfish = any(re.search(rf'\b{re.escape(s)}\b', text) for s in SHELLFISH_SOURCES)
-            if not has_shellfish:
-                tags.append('shellfish-free')
-
-            # Diabetic-Friendly (flags high-sugar / high-carb) -- not perfect
-            HIGH_SUGAR_CARB = {
-                'sugar', 'brown sugar', 'powdered sugar', 'caster sugar',
-                'corn syrup', 'high fructose', 'honey', 'maple syrup', 'agave',
-                'molasses', 'jam', 'jelly', 'condensed milk', 'caramel',
-                'frosting', 'icing', 'candy', 'chocolate chips',
-                'white rice', 'white bread', 'white flour', 'pasta',
-                'potato', 'potatoes', 'sweet potato',
-            }
-            LOW_SUGAR_SIGNALS = {'sugar-free', 'sugar free', 'no sugar', 'zero sugar',
-                                 'diabetic', 'low-carb', 'low carb', 'no added sugar'}
-            has_ls_signal   = any(s in text for s in LOW_SUGAR_SIGNALS)
-            has_high_sc     = any(re.search(rf'\b{re.escape(h)}\b', text) for h in HIGH_SUGAR_CARB)
-            # Try nutrition data first
-            try:
-                nutrients = scraper.nutrients() or {}
-                sugar_str = nutrients.get('sugarContent', '')
-                carb_str  = nutrients.get('carbohydrateContent', '')
-                sugar_g   = float(re.search(r'[\d.]+', sugar_str).group()) if sugar_str else None
-                carb_g    = float(re.search(r'[\d.]+', carb_str).group()) if carb_str else None
-                if (sugar_g is not None and carb_g is not None
-                        and sugar_g <= 10 and carb_g <= 30):
-                    tags.append('diabetic-friendly')
-                elif has_ls_signal and not has_high_sc:
-                    tags.append('diabetic-friendly')
-            except Exception:
-                if has_ls_signal or not has_high_sc:
-                    tags.append('diabetic-friendly')
-            
-            # Keto
-            KETO_DISQUALIFIERS = {
-                'sugar', 'honey', 'maple syrup', 'corn syrup', 'agave',
-                'white flour', 'wheat flour', 'bread', 'pasta', 'rice',
-                'potato', 'oat', 'oats', 'oatmeal', 'beans', 'lentils',
-                'chickpeas', 'corn', 'tortilla', 'cracker', 'granola',
-            }
-            KETO_SIGNALS = {'keto', 'ketogenic', 'low-carb', 'low carb'}
-            has_keto_signal = any(s in text for s in KETO_SIGNALS)
-            has_keto_disq   = any(re.search(rf'\b{re.escape(k)}\b', text) for k in KETO_DISQUALIFIERS)
-            try:
-                nutrients = scraper.nutrients() or {}
-                carb_str  = nutrients.get('carbohydrateContent', '')
-                carb_g    = float(re.search(r'[\d.]+', carb_str).group()) if carb_str else None
-                if carb_g is not None and carb_g <= 10:
-                    tags.append('keto')
-                elif has_keto_signal and not has_keto_disq:
-                    tags.append('keto')
-            except Exception:
-                if has_keto_signal and not has_keto_disq:
-                    tags.append('keto')
-
-            # Low-Calorie
-            HIGH_CAL_INGREDIENTS = {
-                'butter', 'oil', 'cream', 'lard', 'shortening', 'sugar',
-                'chocolate', 'cheese', 'bacon', 'mayonnaise', 'peanut butter',
-                'coconut cream', 'heavy cream', 'full-fat',
-            }
-            LOW_CAL_SIGNALS = {'low-calorie', 'low calorie', 'light', 'diet', 'reduced-fat',
-                                'reduced fat', 'low-fat', 'low fat', 'skinny', 'low-cal',
-                                'low cal', 'lowcal', 'lowfat'}
-            has_lc_signal = any(s in text for s in LOW_CAL_SIGNALS)
-            try:
-                nutrients   = scraper.nutrients() or {}
-                cal_str     = nutrients.get('calories', '')
-                cal_val     = float(re.search(r'[\d.]+', cal_str).group()) if cal_str else None
-                if cal_val is not None and cal_val <= 400:
-                    tags.append('low-calorie')
-                elif has_lc_signal:
-                    tags.append('low-calorie')
-            except Exception:
-                if has_lc_signal:
-                    tags.append('low-calorie')
-
-            # High-Protein
-            HIGH_PROTEIN_INGREDIENTS = {
-                'chicken', 'beef', 'pork', 'turkey', 'tuna', 'salmon', 'egg',
-                'eggs', 'lentils', 'chickpeas', 'black beans', 'edamame',
-                'tofu', 'tempeh', 'cottage cheese', 'greek yogurt',
-                'protein powder', 'whey', 'quinoa',
-            }
-            HIGH_PROTEIN_SIGNALS = {'high-protein', 'high protein', 'protein-packed',
-                                    'protein packed'}
-            has_hp_signal = any(s in text for s in HIGH_PROTEIN_SIGNALS)
-            has_protein_ing = any(re.search(rf'\b{re.escape(p)}\b', text)
-                                  for p in HIGH_PROTEIN_INGREDIENTS)
-            try:
-                nutrients  = scraper.nutrients() or {}
-                prot_str   = nutrients.get('proteinContent', '')
-                prot_g     = float(re.search(r'[\d.]+', prot_str).group()) if prot_str else None
-                if prot_g is not None and prot_g >= 20:
-                    tags.append('high-protein')
-                elif has_hp_signal or has_protein_ing:
-                    tags.append('high-protein')
-            except Exception:
-                if has_hp_signal or has_protein_ing:
-                    tags.append('high-protein')
-
-            # Halal
-            HARAM_INGREDIENTS = {
-                'pork', 'bacon', 'ham', 'lard', 'prosciutto', 'pepperoni',
-                'salami', 'sausage', 'chorizo', 'gelatin', 'beer', 'wine',
-                'alcohol', 'liqueur', 'rum', 'vodka', 'whiskey', 'brandy',
-                'sake', 'mirin', 'cooking wine',
-            }
-            HALAL_SIGNALS = {'halal'}
-            has_halal_signal = any(s in text for s in HALAL_SIGNALS)
-            has_haram = any(re.search(rf'\b{re.escape(h)}\b', text) for h in HARAM_INGREDIENTS)
-            if has_halal_signal or not has_haram:
-                tags.append('halal')
-            
-            # Kosher -- simplified
-            TREIF_INGREDIENTS = {
-                'pork', 'bacon', 'ham', 'lard', 'prosciutto', 'pepperoni',
-                'salami', 'chorizo', 'shrimp', 'crab', 'lobster', 'clam',
-                'oyster', 'mussel', 'scallop', 'squid', 'calamari', 'octopus',
-                'rabbit', 'catfish', 'eel',
-            }
-            # Cannot mix meat and dairy
-            MEAT_WORDS  = {'chicken', 'beef', 'lamb', 'turkey', 'meat', 'steak',
-                           'veal', 'brisket', 'ground beef', 'ground turkey'}
-            DAIRY_WORDS = {'milk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt',
-                           'whey', 'sour cream', 'half and half'}
-            KOSHER_SIGNALS = {'kosher'}
-            has_kosher_signal = any(s in text for s in KOSHER_SIGNALS)
-            has_treif    = any(re.search(rf'\b{re.escape(t)}\b', text) for t in TREIF_INGREDIENTS)
-            has_meat_and_dairy = (
-                any(re.search(rf'\b{re.escape(m)}\b', text) for m in MEAT_WORDS) and
-                any(re.search(rf'\b{re.escape(d)}\b', text) for d in DAIRY_WORDS)
-            )
-            if has_kosher_signal or (not has_treif and not has_meat_and_dairy):
-                tags.append('kosher')
-
-            # Hindu-Friendly
-            BEEF_SOURCES = {
-                'beef', 'steak', 'brisket', 'veal', 'ground beef', 'ribeye',
-                'sirloin', 'chuck', 'short rib', 'oxtail', 'beef broth',
-                'beef stock', 'beef bouillon', 'suet', 'lard',
-            }
-            HINDU_SIGNALS = {'hindu'}
-            has_hindu_signal = any(s in text for s in HINDU_SIGNALS)
-            has_beef = any(re.search(rf'\b{re.escape(b)}\b', text) for b in BEEF_SOURCES)
-            if has_hindu_signal or not has_beef:
-                tags.append('hindu-friendly')
-
-            # Buddhist - typically no meat and sometimes no alliums
-            ALLIUMS = {'garlic', 'onion', 'onions', 'leek', 'leeks', 'shallot',
-                       'shallots', 'chive', 'chives', 'scallion', 'scallions',
-                       'spring onion'}
-            MEAT_SOURCES = {
-                'chicken', 'beef', 'pork', 'lamb', 'turkey', 'duck', 'veal',
-                'bacon', 'ham', 'sausage', 'fish', 'shrimp', 'crab', 'lobster',
-            }
-            BUDDHIST_SIGNALS = {'buddhist'}
-            has_buddhist_signal = any(s in text for s in BUDDHIST_SIGNALS)
-            has_meat_b  = any(re.search(rf'\b{re.escape(m)}\b', text) for m in MEAT_SOURCES)
-            has_alliums = any(re.search(rf'\b{re.escape(a)}\b', text) for a in ALLIUMS)
-            if has_buddhist_signal or (not has_meat_b and not has_alliums):
-                tags.append('buddhist-friendly')
-
-            # Low-Sodium
-            HIGH_SODIUM_INGREDIENTS = {
-                'soy sauce', 'salt', 'table salt', 'kosher salt', 'sea salt',
-                'fish sauce', 'oyster sauce', 'worcestershire', 'anchovies',
-                'capers', 'olives', 'pickles', 'miso', 'tamari',
-                'canned tomatoes', 'canned beans', 'stock', 'broth', 'bouillon',
-                'deli meat', 'bacon', 'ham', 'sausage', 'salami', 'pepperoni',
-            }
-            LOW_SODIUM_SIGNALS = {'low-sodium', 'low sodium', 'no salt', 'unsalted',
-                                   'reduced sodium', 'sodium-free', 'sodium free'}
-            has_lsod_signal = any(s in text for s in LOW_SODIUM_SIGNALS)
-            has_high_sodium = any(re.search(rf'\b{re.escape(h)}\b', text)
-                                  for h in HIGH_SODIUM_INGREDIENTS)
+    def _extract_dietary_tags(self, context: ExtractionContext) -> List[str]:
+        return dietary_tags(context)
+
+
+class RecipeSearchScraper(RecipeParser):
+    def __init__(
+        self,
+        link_extractor: str = DEFAULT_LINK_EXTRACTOR,
+        use_url_index: bool = True,
+        prefer_page_canonical: bool = True,
+        max_search_pages: int = MAX_SEARCH_PAGES,
+        min_new_fraction: float = MIN_NEW_FRACTION,
+        max_page_bytes: int = DEFAULT_MAX_BYTES,
+        jsonld_fast_path: bool = True,
+        parse_workers: int = 0,
+        respect_robots: bool = True,
+        archive_dir: Optional[str] = DEFAULT_ARCHIVE_DIR,
+        save_chunk_size: int = SAVE_CHUNK_SIZE,
+        flush_interval: float = MAX_DELAY,
+        storage: Optional[RecipeStorage] = None,
+    ):
+        self.headers = {
+            'User-Agent': (
+                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                'AppleWebKit/537.36 (KHTML, like Gecko) '
+                'Chrome/120.0.0.0 Safari/537.36'
+            ),
+            'Accept-Language': 'en-US,en;q=0.9',
+        }
+        self._blocked_sites: Set[str] = set()
+        self._url_sites: Dict[str, str] = {}   # recipe URL -> site it was found on
+        self.site_stats = SiteStatsStore()
+        self.extract_links = get_link_extractor(link_extractor)
+        super().__init__(prefer_page_canonical=prefer_page_canonical, jsonld_fast_path=jsonld_fast_path)
+        self.max_search_pages = max_search_pages
+        self.min_new_fraction = min_new_fraction
+        self.max_page_bytes = max_page_bytes
+        self.save_chunk_size = save_chunk_size
+        self.fetch_stats = FetchStats()
+        self.concurrency = ConcurrencyController()
+        self.retries = RetryController()
+        self.robots: Optional[RobotsCache] = RobotsCache(self.headers) if respect_robots else None
+        # Start parse workers before the writer or any other thread exists
+        self.parse_pool: Optional[ParsePool] = None
+        self.set_parse_workers(parse_workers)
+        self.archive: Optional[HtmlArchive] = HtmlArchive(archive_dir) if archive_dir else None
+        if self.archive is not None:
+            print(f"  ✅ Archiving pages to {archive_dir}/")
+        self.storage = storage or get_storage()
+        print(f"  ✅ Connected to {self.storage.name}")
+        self.known_urls: Optional[KnownUrlIndex] = None
+        if use_url_index:
+            self.known_urls = KnownUrlIndex()
+            print(f"  ✅ Indexed {self.known_urls.load(self.storage)} stored recipe URL(s)")
+        # Recipes are written in the background while crawling continues
+        self.writer = BufferedRecipeWriter(self._save_batch, max_rows=save_chunk_size, max_delay=flush_interval,
+                                           chunk_size=save_chunk_size)
+
+    def _search_site(self, site: str, query: str, limit: int = 6) -> List[str]:
+        """
+        Collect recipe URLs from `site`'s search results. Page 1 is read as
+        before; further pages (config page_url, else rel="next") are only
+        fetched while fewer than `limit` new URLs were found and the last page
+        was still mostly new — deep queries go further, exhausted ones stop.
+        """
+        if site in self._blocked_sites:
+            return []
+        config = get_site_config(site)
+        page_url = config.search_url(query)
+        if not self._robots_allows(page_url):
+            print(f"    ⊘ {site}: search disallowed by robots.txt (skipped)")
+            self._blocked_sites.add(site)
+            return []
+        started = time.monotonic()
+        urls: List[str] = []
+        seen: Set[str] = set()
+        new_count = 0
+        pages = 0
+        while page_url and pages < self.max_search_pages:
             try:
-                nutrients = scraper.nutrients() or {}
-                sod_str   = nutrients.get('sodiumContent', '')
-                sod_mg    = float(re.search(r'[\d.]+', sod_str).group()) if sod_str else None
-                if sod_mg is not None and sod_mg <= 600:
-                    tags.append('low-sodium')
-                elif has_lsod_signal or not has_high_sodium:
-                    tags.append('low-sodium')
+                response = self.retries.call(site, lambda: self._get_search_page(site, page_url))
+                response.raise_for_status()
+            except requests.HTTPError as e:
+                code = e.response.status_code if e.response is not None else 0
+                if code in PERMANENT_FAILURE_CODES:
+                    self._blocked_sites.add(site)
+                if not pages:
+                    self.site_stats.record_search(site, time.monotonic() - started, 0, http_error=True)
+                    return []
+                break
             except Exception:
-                if has_lsod_signal or not has_high_sodium:
-                    tags.append('low-sodium')
-            
-            # Paleo
-            PALEO_DISQUALIFIERS = {
-                'sugar', 'brown sugar', 'white sugar', 'cane sugar', 'powdered sugar',
-                'caster sugar', 'corn syrup', 'high fructose', 'artificial sweetener',
-                'splenda', 'aspartame', 'sucralose',
-                # grains
-                'wheat', 'flour', 'bread', 'pasta', 'rice', 'oat', 'oats', 'oatmeal',
-                'barley', 'rye', 'corn', 'cornmeal', 'cornstarch', 'couscous',
-                'quinoa', 'granola', 'cereal', 'cracker', 'tortilla', 'breadcrumbs',
-                # legumes
-                'beans', 'lentils', 'chickpeas', 'peanut', 'peanuts', 'peanut butter',
-                'soy', 'tofu', 'tempeh', 'edamame', 'miso', 'soy sauce', 'tamari',
-                # dairy
-                'milk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt',
-                'whey', 'casein', 'ghee', 'kefir', 'sour cream', 'ice cream',
-                # processed / industrial
-                'canola oil', 'vegetable oil', 'soybean oil', 'corn oil',
-                'margarine', 'shortening', 'msg', 'maltodextrin',
+                if not pages:
+                    self.site_stats.record_search(site, time.monotonic() - started, 0, failed=True)
+                    return []
+                break
+            pages += 1
+
+            page_urls = [u for u in self._collect_recipe_urls(response.content, config, limit)
+                         if canonicalize(u) not in seen and self._robots_allows(u)]
+            seen.update(canonicalize(u) for u in page_urls)
+            urls.extend(page_urls)
+            new = [u for u in page_urls if self.known_urls is None or u not in self.known_urls]
+            new_count += len(new)
+            if new_count >= limit or not page_urls or len(new) / len(page_urls) < self.min_new_fraction:
+                break
+            next_url = config.page_url(query, pages + 1)
+            if next_url is None:
+                next_href = extract_next_link(response.content)
+                next_url = urljoin(page_url, next_href) if next_href else None
+            page_url = next_url if next_url and next_url != page_url and config.site in next_url else None
+            if page_url and not self._robots_allows(page_url):
+                page_url = None
+
+        self.site_stats.record_search(site, time.monotonic() - started, len(urls))
+        if urls:
+            more = f" over {pages} pages" if pages > 1 else ""
+            print(f"    ✓ {site}: {len(urls)} recipe(s){more}")
+        return urls
+
+    def _get_search_page(self, site: str, page_url: str) -> requests.Response:
+        self._wait_turn(page_url)
+        with self.concurrency.slot(site) as slot:
+            response = requests.get(page_url, headers=self.headers, timeout=10)
+            slot.status = response.status_code
+        return response
+
+    def fetch_recipe_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+        """
+        fetch_page() with the crawl-delay wait, a global and per-host
+        concurrency slot, and transient-failure retries; the page is archived
+        when an archive is configured.
+        """
+        host = urlparse(url).netloc.lower()
+        host = host[4:] if host.startswith('www.') else host
+
+        def attempt():
+            self._wait_turn(url)
+            with self.concurrency.slot(host) as slot:
+                try:
+                    page = fetch_page(url, headers or self.headers, max_bytes=self.max_page_bytes,
+                                      stats=self.fetch_stats)
+                except requests.HTTPError as e:
+                    # 429/5xx feed back into the AIMD windows
+                    slot.status = e.response.status_code if e.response is not None else None
+                    raise
+                slot.status = page.status_code
+                return page
+        page = self.retries.call(host, attempt)
+        if self.archive is not None and page.status_code == 200 and page.content:
+            self.archive.put(url, page.content, page.headers)
+        return page
+
+    def _robots_allows(self, url: str) -> bool:
+        return self.robots is None or self.robots.allowed(url)
+
+    def _wait_turn(self, url: str):
+        if self.robots is not None:
+            self.robots.wait_turn(url)
+
+    def _collect_recipe_urls(self, body: bytes, config: SiteConfig, limit: int) -> List[str]:
+        """
+        Pull up to `limit` recipe URLs out of a search page, stopping early.
+        URLs are returned as published; variants are collapsed by canonical key.
+        """
+        urls: Dict[str, str] = {}
+        for href in self.extract_links(body):
+            href = config.absolutize(href)
+            if config.site not in href:
+                continue
+            key = canonicalize(href)
+            if config.is_recipe_url(key):
+                urls.setdefault(key, fetch_url(href))
+                if len(urls) >= limit:
+                    break
+        return list(urls.values())
+
+    def search_recipe_sites_directly(
+        self,
+        query: str,
+        num_results: int = 20,
+        sites: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        per_site_limit: int = 6,
+        adaptive: bool = True,
+    ) -> List[str]:
+        """
+        Search every target site in parallel. With `adaptive` on, sites are
+        ordered by their historical yield per second, sites that persistently
+        return nothing are skipped, and each site gets its own link limit.
+        Request parallelism follows self.concurrency (AIMD); `max_workers`
+        only caps it.
+        """
+        target_sites = sites if sites is not None else DEFAULT_RECIPE_SITES
+        if adaptive:
+            ranked = self.site_stats.rank(target_sites)
+            skipped = len(target_sites) - len(ranked)
+            if skipped:
+                print(f"  ℹ️  Skipping {skipped} site(s) with no recent results")
+            target_sites = ranked
+        print(f"\n🔍 Searching {len(target_sites)} recipe site(s) for: '{query}'")
+        site_urls: Dict[str, List[str]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.concurrency.max_workers) as executor:
+            future_to_site = {
+                executor.submit(
+                    self._search_site, site, query,
+                    self.site_stats.limit_for(site, per_site_limit) if adaptive else per_site_limit,
+                ): site
+                for site in target_sites
             }
-            PALEO_SIGNALS = {'paleo', 'paleolithic', 'primal'}
-            has_paleo_signal = any(s in text for s in PALEO_SIGNALS)
-            has_paleo_disq   = any(
-                re.search(rf'\b{re.escape(p)}\b', text) for p in PALEO_DISQUALIFIERS
-            )
-            if has_paleo_signal or not has_paleo_disq:
-                tags.append('paleo')
-        except Exception:
-            pass
-        return tags
-
-    def _is_vegan(self, ingredients: List[str]) -> bool:
-        NON_VEGAN = {
-            # Meat
-            'meat', 'chicken', 'beef', 'pork', 'ham', 'bacon', 'sausage',
-            'turkey', 'lamb', 'duck', 'veal', 'goat', 'rabbit', 'venison',
-            'salami', 'pepperoni', 'prosciutto',
-            # Seafood
-            'fish', 'anchovy', 'anchovies', 'shrimp', 'prawn', 'prawns',
-            'crab', 'lobster', 'shellfish', 'salmon', 'tuna', 'cod',
-            'sardine', 'sardines', 'mussel', 'mussels', 'clam', 'clams',
-            'oyster', 'oysters', 'scallop', 'scallops', 'squid', 'octopus',
-            # Dairy
-            'milk', 'cheese', 'butter', 'cream', 'ghee', 'whey', 'casein',
-            'lactose', 'lactalbumin', 'kefir', 'buttermilk', 'custard',
-            'yogurt', 'yoghurt',
-            # Eggs
-            'egg', 'eggs', 'albumin', 'albumen', 'mayonnaise', 'meringue',
-            # Animal-derived additives
-            'honey', 'gelatin', 'lard', 'suet', 'tallow', 'rennet',
-            'isinglass', 'carmine', 'cochineal', 'shellac', 'collagen',
-            'lanolin',
-        }
-        text = ' '.join(ingredients).lower()
-        return not any(re.search(rf'\b{re.escape(w)}\b', text) for w in NON_VEGAN)
-
-    def _is_vegetarian(self, ingredients: List[str]) -> bool:
-        NON_VEG = {
-            # Meat
-            'meat', 'chicken', 'beef', 'pork', 'ham', 'bacon', 'sausage',
-            'turkey', 'lamb', 'duck', 'veal', 'goat', 'rabbit', 'venison',
-            'bison', 'quail', 'goose', 'salami', 'pepperoni', 'prosciutto',
-            # Seafood
-            'fish', 'salmon', 'tuna', 'cod', 'tilapia', 'sardine', 'sardines',
-            'herring', 'mackerel', 'anchovy', 'anchovies', 'shrimp', 'prawn',
-            'prawns', 'crab', 'lobster', 'squid', 'octopus', 'scallop', 'scallops',
-            'clam', 'clams', 'oyster', 'oysters', 'mussel', 'mussels',
-            # Animal-derived
-            'lard', 'suet', 'tallow', 'gelatin', 'rennet', 'isinglass',
-            'carmine', 'cochineal', 'dashi',
-        }
-        text = ' '.join(ingredients).lower()
-        return not any(re.search(rf'\b{re.escape(w)}\b', text) for w in NON_VEG)
-
-    def _is_pescatarian(self, ingredients: List[str]) -> bool:
-        LAND_MEAT = {
-            'chicken', 'beef', 'pork', 'bacon', 'ham', 'sausage', 'lamb',
-            'turkey', 'duck', 'veal', 'lard', 'suet', 'meat', 'gelatin',
-            'chorizo', 'salami', 'pepperoni', 'prosciutto', 'brisket',
-        }
-        text = ' '.join(ingredients).lower()
-        return not any(re.search(rf'\b{re.escape(m)}\b', text) for m in LAND_MEAT)
+            for future in as_completed(future_to_site):
+                site_urls[future_to_site[future]] = future.result()
+        # Keep best-ranked sites first so num_results truncation favours them
+        recipe_urls: Dict[str, str] = {}
+        for site in target_sites:
+            for url in site_urls.get(site, []):
+                self._url_sites.setdefault(url, site)
+                recipe_urls.setdefault(canonicalize(url), url)
+        unique_urls = list(recipe_urls.values())
+        if self._blocked_sites:
+            print(f"  ℹ️  {len(self._blocked_sites)} site(s) blocked/paywalled (skipped)")
+        print(f"✓Found {len(unique_urls)} unique recipe URL(s)")
+        return unique_urls if num_results is None else unique_urls[:num_results]
 
-    def scrape_multiple(self, urls: List[str], delay: float = 1.0) -> List[Dict]:
+    def scrape_recipe(self, url: str) -> Optional[RecipeRecord]:
+        try:
+            page = self.fetch_recipe_page(url)
+            return self.parse_recipe(page.content, url, page.headers)
+        except Exception as e:
+            print(f"  ✗ Failed to scrape {url}: {e}")
+            return None
+
+    def set_parse_workers(self, workers: int):
+        """Parse in `workers` processes; 0 parses inline on the calling thread."""
+        if self.parse_pool is not None:
+            if self.parse_pool.workers == workers:
+                return
+            self.parse_pool.close()
+            self.parse_pool = None
+        if workers > 0:
+            self.parse_pool = ParsePool(workers, self.prefer_page_canonical, self.jsonld_fast_path)
+            print(f"  ✅ Parsing in {workers} worker process(es)")
+
+    def close(self):
+        self.writer.close()
+        self.storage.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+            self.parse_pool = None
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+    def scrape_multiple(
+        self, urls: List[str], delay: float = 1.0, writer: Optional[BufferedRecipeWriter] = None,
+    ) -> List[RecipeRecord]:
+        """Scrape `urls`; each recipe is also handed to `writer` as soon as it is parsed."""
+        if self.parse_pool is not None:
+            return self._scrape_multiple_pooled(urls, delay, writer)
         recipes = []
         total = len(urls)
         print(f"\nScraping {total} recipe(s)...")
         for i, url in enumerate(urls, 1):
             print(f"  [{i}/{total}] {url}")
             recipe = self.scrape_recipe(url)
+            site = self._url_sites.get(url)
+            if site:
+                self.site_stats.record_parse(site, ok=recipe is not None)
             if recipe:
                 recipes.append(recipe)
-                print(f"  ✓ {recipe['title']}")
+                if writer is not None:
+                    writer.put(recipe)
+                print(f"  ✓ {recipe.title}")
+            if i < total:
+                time.sleep(delay)
+        print(f"\n✓ Scraped {len(recipes)}/{total} successfully")
+        return recipes
+
+    def _scrape_multiple_pooled(
+        self, urls: List[str], delay: float, writer: Optional[BufferedRecipeWriter] = None,
+    ) -> List[RecipeRecord]:
+        """Fetch on this thread while the parse pool works through earlier pages."""
+        total = len(urls)
+        print(f"\nScraping {total} recipe(s) ({self.parse_pool.workers} parse worker(s))...")
+        pending = []
+        for i, url in enumerate(urls, 1):
+            print(f"  [{i}/{total}] {url}")
+            try:
+                page = self.fetch_recipe_page(url)
+                pending.append((url, self.parse_pool.submit(page.content, url, page.headers)))
+            except Exception as e:
+                print(f"  ✗ Failed to scrape {url}: {e}")
+                pending.append((url, None))
             if i < total:
                 time.sleep(delay)
+
+        recipes = []
+        for url, future in pending:
+            recipe = None
+            if future is not None:
+                try:
+                    recipe = future.result()
+                except Exception as e:
+                    print(f"  ✗ Failed to parse {url}: {e}")
+            site = self._url_sites.get(url)
+            if site:
+                self.site_stats.record_parse(site, ok=recipe is not None)
+            if recipe:
+                recipes.append(recipe)
+                if writer is not None:
+                    writer.put(recipe)
+                print(f"  ✓ {recipe.title}")
         print(f"\n✓ Scraped {len(recipes)}/{total} successfully")
         return recipes
 
-    def save_to_db(self, recipes: List[Dict]) -> int:
+    def _save_batch(self, recipes: List[RecipeRecord]) -> Tuple[List[RecipeRecord], List[RecipeRecord]]:
+        inserted, duplicates = self.storage.save_batch(recipes, self.save_chunk_size)
+        if self.known_urls is not None:
+            self.known_urls.update(recipe.url for recipe in inserted)
+        for recipe in duplicates:
+            if recipe.url in self._url_sites:
+                self.site_stats.record_duplicate(self._url_sites[recipe.url])
+        return inserted, duplicates
+
+    def save_to_db(self, recipes: List[RecipeRecord]) -> int:
         if not recipes:
             print("No recipes to save!")
             return 0
-        inserted = 0
-        for recipe in recipes:
-            if save_recipe(self.supabase, recipe):
-                inserted += 1
-        skipped = len(recipes) - inserted
-        print(f"\nSaved {inserted} new recipe(s) to Supabase"
-              + (f"  ({skipped} duplicate(s) skipped)" if skipped else ""))
-        return inserted
+        inserted, duplicates = self._save_batch(recipes)
+        self._print_saved(len(inserted), len(duplicates))
+        return len(inserted)
+
+    def _print_saved(self, inserted: int, duplicates: int):
+        print(f"\nSaved {inserted} new recipe(s) to {self.storage.name}"
+              + (f"  ({duplicates} duplicate(s) skipped)" if duplicates else ""))
+
+    def _scrape_and_write(self, urls: List[str], delay: float) -> Optional[Tuple[int, int]]:
+        """
+        scrape_multiple() through the background writer, then wait for its
+        last batch. Returns (saved, failed), where failed counts recipes the
+        writer gave up on (kept in writer.failed_recipes); None if nothing
+        was scraped.
+        """
+        inserted, duplicates = self.writer.inserted, self.writer.duplicates
+        failed = len(self.writer.failed_recipes)
+        recipes = self.scrape_multiple(urls, delay=delay, writer=self.writer)
+        if not recipes:
+            print("No recipes successfully scraped!")
+            return None
+        self.writer.flush()
+        saved = self.writer.inserted - inserted
+        self._print_saved(saved, self.writer.duplicates - duplicates)
+        return saved, len(self.writer.failed_recipes) - failed
 
     def search_and_scrape(
         self,
         query: str,
         num_results: int = None,
         sites: Optional[List[str]] = None,
-        max_workers: int = 10,
+        max_workers: Optional[int] = None,
         scrape_delay: float = 1.5,
+        parse_workers: Optional[int] = None,
     ) -> int:
+        if parse_workers is not None:
+            self.set_parse_workers(parse_workers)
         urls = self.search_recipe_sites_directly(
-            query, num_results=num_results, sites=sites, max_workers=max_workers,
+            query, num_results=None, sites=sites, max_workers=max_workers,
         )
+        urls = self._skip_disallowed(self._skip_known(urls))
+        if num_results is not None:
+            urls = urls[:num_results]
+        try:
+            if not urls:
+                print("No recipe URLs found!")
+                return 0
+            result = self._scrape_and_write(urls, scrape_delay)
+            if result is None:
+                return 0
+            saved, failed = result
+            if failed:
+                # Left out of search_log, so a resumed bulk run tries the query again
+                print(f"  ✗ {failed} recipe(s) for '{query}' could not be written; query not logged")
+            else:
+                self.storage.log_search(query, sites, saved)
+            return saved
+        finally:
+            self._save_state()
+
+    def _skip_known(self, urls: List[str]) -> List[str]:
+        """Drop URLs that are already stored before anything is fetched."""
         if not urls:
-            print("No recipe URLs found!")
-            return 0
-        recipes = self.scrape_multiple(urls, delay=scrape_delay)
-        if not recipes:
-            print("No recipes successfully scraped!")
-            return 0
-        saved = self.save_to_db(recipes)
-        log_search(self.supabase, query, sites, saved)
-        return saved
+            return urls
+        if self.known_urls is None:
+            stored = self.storage.existing_urls(canonicalize(u) for u in urls)
+            new_urls = [u for u in urls if canonicalize(u) not in stored]
+        else:
+            new_urls = self.known_urls.filter_new(urls)
+        for url in set(urls).difference(new_urls):
+            if url in self._url_sites:
+                self.site_stats.record_known_skip(self._url_sites[url])
+        if len(new_urls) < len(urls):
+            print(f"  ℹ️  {len(urls) - len(new_urls)} URL(s) already stored (skipped)")
+        if self.known_urls is not None:
+            print(f"  {self.known_urls.report()}")
+        return new_urls
+
+    def _skip_disallowed(self, urls: List[str]) -> List[str]:
+        """Drop URLs robots.txt disallows (recipe URLs found via sitemaps or search)."""
+        if self.robots is None or not urls:
+            return urls
+        allowed = self.robots.filter_allowed(urls)
+        if len(allowed) < len(urls):
+            print(f"  ℹ️  {len(urls) - len(allowed)} URL(s) disallowed by robots.txt (skipped)")
+        return allowed
+
+    def _save_state(self):
+        self.site_stats.save()
+        if self.robots is not None:
+            self.robots.save()
+
+    def discover_from_sitemaps(
+        self,
+        sites: Optional[List[str]] = None,
+        max_per_site: Optional[int] = 50,
+        max_workers: Optional[int] = None,
+        state: Optional[SitemapState] = None,
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Discovery without search queries: walk each site's sitemaps and return
+        (url, lastmod) for recipe URLs that are new or changed since last crawl.
+        """
+        target_sites = sites if sites is not None else DEFAULT_RECIPE_SITES
+        state = state or SitemapState()
+        print(f"\n🗺️  Reading sitemaps for {len(target_sites)} site(s)")
+        found: List[Tuple[str, Optional[str]]] = []
+        with ThreadPoolExecutor(max_workers=max_workers or self.concurrency.max_workers) as executor:
+            future_to_site = {
+                executor.submit(self._discover_site, site, state, max_per_site): site
+                for site in target_sites if site not in self._blocked_sites
+            }
+            for future in as_completed(future_to_site):
+                site = future_to_site[future]
+                try:
+                    entries = future.result()
+                except Exception as e:
+                    print(f"    ✗ {site}: sitemap discovery failed ({e})")
+                    continue
+                if entries:
+                    print(f"    ✓ {site}: {len(entries)} new/changed recipe(s)")
+                for url, lastmod in entries:
+                    self._url_sites.setdefault(url, site)
+                    found.append((url, lastmod))
+        print(f"✓Found {len(found)} new/changed recipe URL(s) in sitemaps")
+        return found
+
+    def _discover_site(self, site: str, state: SitemapState, max_per_site: Optional[int]):
+        # One slot for the whole walk: gates parallelism, no per-request latency
+        with self.concurrency.slot(site, track_latency=False):
+            return discover_site(site, self.headers, state, max_per_site, robots=self.robots, retries=self.retries)
+
+    def sitemap_and_scrape(
+        self,
+        sites: Optional[List[str]] = None,
+        max_per_site: Optional[int] = 50,
+        max_workers: Optional[int] = None,
+        scrape_delay: float = 1.5,
+        parse_workers: Optional[int] = None,
+    ) -> int:
+        if parse_workers is not None:
+            self.set_parse_workers(parse_workers)
+        state = SitemapState()
+        entries = self.discover_from_sitemaps(
+            sites, max_per_site=max_per_site, max_workers=max_workers, state=state,
+        )
+        urls = self._skip_disallowed(self._skip_known([url for url, _ in entries]))
+        try:
+            saved = failed = 0
+            if urls:
+                saved, failed = self._scrape_and_write(urls, scrape_delay) or (0, 0)
+            else:
+                print("No new recipe URLs in sitemaps!")
+            if failed:
+                print(f"  ✗ {failed} recipe(s) could not be written; sitemap state not saved")
+                return saved
+            if urls:
+                self.storage.log_search(SITEMAP_QUERY, sites, saved)
+            # Only persist crawl state once the batch went through, so an
+            # interrupted or failed run re-discovers the same URLs next time
+            for url, lastmod in entries:
+                state.mark_url(self._url_sites.get(url, urlparse(url).netloc), canonicalize(url), lastmod)
+            state.save()
+            return saved
+        finally:
+            self._save_state()
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -871,14 +790,15 @@ class RecipeSearchScraper:
 
 if __name__ == "__main__":
     print("=" * 60)
-    print("RECIPE SEARCH & SCRAPER  (Supabase edition)")
+    print("RECIPE SEARCH & SCRAPER")
     print("=" * 60)
 
     scraper = RecipeSearchScraper()
 
     while True:
         print()
-        print("Actions:  [1] Search & scrape   [2] List saved   [3] View recipe   [q] Quit")
+        print("Actions:  [1] Search & scrape   [2] List saved   [3] View recipe   "
+              "[4] Site stats   [q] Quit")
         action = input("Choice: ").strip().lower()
 
         if action in ("q", "quit", "exit"):
@@ -888,15 +808,18 @@ if __name__ == "__main__":
         elif action == "2":
             raw = input("Max rows to show [default 50]: ").strip()
             limit = int(raw) if raw.isdigit() else 50
-            list_recipes(scraper.supabase, limit)
+            list_recipes(scraper.storage, limit)
 
         elif action == "3":
             raw = input("Recipe ID: ").strip()
             if raw.isdigit():
-                view_recipe(scraper.supabase, int(raw))
+                view_recipe(scraper.storage, int(raw))
             else:
                 print("  Please enter a numeric ID.")
 
+        elif action == "4":
+            scraper.site_stats.report()
+
         elif action == "1":
             query = input("Search query: ").strip()
             if not query:
@@ -936,7 +859,7 @@ if __name__ == "__main__":
                 print(f"\nDone!  {saved} recipe(s) saved.")
 
         else:
-            print("  Unrecognised choice — please enter 1, 2, 3, or q.")
+            print("  Unrecognised choice — please enter 1, 2, 3, 4, or q.")
 
         again = input("\nReturn to menu? [Y/n]: ").strip().lower()
         if again in ("n", "no"):
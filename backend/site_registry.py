@@ -0,0 +1,192 @@
+# site_registry.py
+"""
+Site search config registry.
+Every SITE_SEARCH_CONFIGS / DEFAULT_CONFIG entry is compiled once into an
+immutable SiteConfig: search URL template with the site already filled in,
+the host used to absolutize relative links, and the compiled recipe path
+regex. Together with one shared listing-segment pattern this classifies a URL
+without urlparse or per-href pattern lookups.
+
+    config = get_site_config('allrecipes.com')
+    config.search_url('pad thai')
+    config.is_recipe_url('https://www.allrecipes.com/recipe/12345/pad-thai')
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Pattern
+from urllib.parse import quote_plus
+
+# ═══════════════════════════════════════════════════════════════
+#  SITE SEARCH CONFIGS
+# ═══════════════════════════════════════════════════════════════
+
+SITE_SEARCH_CONFIGS = {
+    'cooking.nytimes.com': {
+        'search_url': 'https://cooking.nytimes.com/search?q={query}',
+        'recipe_path_re': r'/recipes/\d+',
+        'page_url': 'https://cooking.nytimes.com/search?q={query}&page={page}',
+    },
+    'bonappetit.com': {
+        'search_url': 'https://www.bonappetit.com/search?q={query}',
+        'recipe_path_re': r'/recipe/[a-z0-9-]+$',
+    },
+    'epicurious.com': {
+        'search_url': 'https://www.epicurious.com/search/{query}',
+        'recipe_path_re': r'/recipes/food/views/',
+    },
+    'food52.com': {
+        'search_url': 'https://food52.com/search?q={query}',
+        'recipe_path_re': r'/recipes/\d+',
+        'page_url': 'https://food52.com/search?q={query}&page={page}',
+    },
+    'seriouseats.com': {
+        'search_url': 'https://www.seriouseats.com/search?q={query}',
+        'recipe_path_re': r'seriouseats\.com/(?!search|category|author|tag)[a-z0-9-]+-recipe',
+        'page_url': 'https://www.seriouseats.com/search?q={query}&offset={offset}',
+        'page_size': 24,
+    },
+    'allrecipes.com': {
+        'search_url': 'https://www.allrecipes.com/search?q={query}',
+        'recipe_path_re': r'/recipe/\d+/',
+        'page_url': 'https://www.allrecipes.com/search?q={query}&offset={offset}',
+        'page_size': 24,
+    },
+    'foodnetwork.com': {
+        'search_url': 'https://www.foodnetwork.com/search/{query}-',
+        'recipe_path_re': r'/recipes/[^/]+/[^/]+-recipe-\d+',
+    },
+    'tasty.co': {
+        'search_url': 'https://tasty.co/search?q={query}',
+        'recipe_path_re': r'/recipe/[a-z0-9-]+$',
+    },
+    'bbcgoodfood.com': {
+        'search_url': 'https://www.bbcgoodfood.com/search?q={query}',
+        'recipe_path_re': r'/recipes/(?!category|collection|glossary)[a-z0-9-]+$',
+        'page_url': 'https://www.bbcgoodfood.com/search?q={query}&page={page}',
+    },
+    'jamieoliver.com': {
+        'search_url': 'https://www.jamieoliver.com/search/?s={query}',
+        'recipe_path_re': r'/recipes/[^/]+/[a-z0-9-]+/?$',
+    },
+    'marmiton.org': {
+        'search_url': 'https://www.marmiton.org/recettes/recherche.aspx?aqt={query}',
+        'recipe_path_re': r'/recettes/recette_',
+    },
+    'chefkoch.de': {
+        'search_url': 'https://www.chefkoch.de/suche.php?suche={query}',
+        'recipe_path_re': r'/rezepte/\d+/',
+        'page_url': 'https://www.chefkoch.de/suche.php?suche={query}&page={page}',
+    },
+    'delish.com': {
+        'search_url': 'https://www.delish.com/search/?q={query}',
+        'recipe_path_re': r'/cooking/recipe-ideas/[a-z0-9-]+$',
+    },
+    'americastestkitchen.com': {
+        'search_url': 'https://www.americastestkitchen.com/search?q={query}',
+        'recipe_path_re': r'/recipes/\d+',
+    },
+    'bettycrocker.com': {
+        'search_url': 'https://www.bettycrocker.com/search#q={query}&t=recipe',
+        'recipe_path_re': r'/recipes/[a-z0-9-]+/[a-z0-9-]+-\d+',
+    },
+    'kingarthurbaking.com': {
+        'search_url': 'https://www.kingarthurbaking.com/search?q={query}',
+        'recipe_path_re': r'/recipes/[a-z0-9-]+-recipe$',
+    },
+}
+
+DEFAULT_CONFIG = {
+    'search_url': 'https://www.{site}/search?q={query}',
+    'recipe_path_re': r'/recipes?/(?!category|tag|author|collection|index|search|browse|list|ideas)[a-z0-9][a-z0-9_-]{3,}/?$',
+}
+
+# Optional pagination keys per site:
+#   page_url  — later result pages; {query}, {page} (1-based) and/or {offset}
+#   page_size — results per page, used to fill {offset}
+# Sites without page_url fall back to the page's rel="next" link, if any.
+
+LISTING_PATH_SEGMENTS = {
+    'category', 'categories', 'tag', 'tags', 'author', 'authors',
+    'collection', 'collections', 'index', 'browse', 'archive',
+    'search', 'list', 'gallery', 'topic', 'cuisine', 'meal-type',
+    'ingredient', 'how-to', 'technique',
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COMPILED REGISTRY
+# ═══════════════════════════════════════════════════════════════
+
+# Matches a URL with a listing segment anywhere in its path — the same test as
+# splitting urlparse(url).path on '/' and intersecting with LISTING_PATH_SEGMENTS.
+LISTING_SEGMENT_RE = re.compile(
+    r'[^?#]*?/(?:'
+    + '|'.join(sorted(map(re.escape, LISTING_PATH_SEGMENTS), key=len, reverse=True))
+    + r')(?=[/?#]|$)',
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    site: str
+    host: str                   # host used for relative links
+    search_url_template: str    # only {query} left to fill
+    recipe_path_re: str
+    recipe_re: Pattern
+    page_url_template: Optional[str] = None   # {query}, {page}, {offset}
+    page_size: int = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.host}"
+
+    def search_url(self, query: str) -> str:
+        return self.search_url_template.replace('{query}', quote_plus(query))
+
+    def page_url(self, query: str, page: int) -> Optional[str]:
+        """URL of result page `page` (1-based), or None if the site has no template."""
+        if page <= 1:
+            return self.search_url(query)
+        if not self.page_url_template:
+            return None
+        return (self.page_url_template
+                .replace('{query}', quote_plus(query))
+                .replace('{page}', str(page))
+                .replace('{offset}', str((page - 1) * self.page_size)))
+
+    def absolutize(self, href: str) -> str:
+        return self.base_url + href if href.startswith('/') else href
+
+    def is_recipe_url(self, url: str) -> bool:
+        # Two compiled passes beat one fused pattern: a bare search() keeps re's
+        # literal-prefix scan, and the listing guard only runs on candidates.
+        return (self.recipe_re.search(url) is not None
+                and LISTING_SEGMENT_RE.match(url) is None)
+
+
+def _normalize_host(site: str) -> str:
+    return site if site.startswith('www') else f"www.{site}"
+
+
+@lru_cache(maxsize=None)
+def _compiled(recipe_path_re: str) -> Pattern:
+    return re.compile(recipe_path_re, re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def get_site_config(site: str) -> SiteConfig:
+    """Compiled config for `site`; built on first use and cached for the process."""
+    config = SITE_SEARCH_CONFIGS.get(site, {})
+    recipe_path_re = config.get('recipe_path_re', DEFAULT_CONFIG['recipe_path_re'])
+    return SiteConfig(
+        site=site,
+        host=_normalize_host(site),
+        search_url_template=config.get('search_url', DEFAULT_CONFIG['search_url']).replace('{site}', site),
+        recipe_path_re=recipe_path_re,
+        recipe_re=_compiled(recipe_path_re),
+        page_url_template=config.get('page_url'),
+        page_size=config.get('page_size', 0),
+    )
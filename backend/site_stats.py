@@ -0,0 +1,223 @@
+# site_stats.py
+"""
+Per-site search statistics.
+Tracks how every recipe site performs across runs (search latency, HTTP
+errors, links found, recipes parsed, duplicates, links skipped because the
+recipe was already stored) and uses that history to
+order sites by expected yield per second, skip sites that never return
+anything and size each site's link limit.
+
+Usage (report):
+    python3 site_stats.py                  # sorted by yield/sec
+    python3 site_stats.py --sort errors    # yield | errors | latency | name
+    python3 site_stats.py --top 30
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_STATS_FILE = os.environ.get("SITE_STATS_FILE", "site_stats.json")
+
+# Priors so unseen sites still get tried (and rank ahead of known-bad ones)
+PRIOR_YIELD = 1.0          # new recipes per search
+PRIOR_LATENCY = 2.0        # seconds per search
+PRIOR_WEIGHT = 2.0         # how many "virtual" searches the prior is worth
+
+SKIP_AFTER_EMPTY = 5       # consecutive empty searches before a site is skipped
+REPROBE_AFTER_DAYS = 7     # skipped sites get one retry after this long
+MIN_SEARCHES_FOR_LIMIT = 3 # searches before per-site limits start adapting
+
+COUNTER_FIELDS = (
+    'searches', 'http_errors', 'failures', 'links_found',
+    'recipes_parsed', 'parse_failures', 'duplicates', 'known_skips',
+)
+
+
+class SiteStats:
+    """Running totals for a single site."""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        for field in COUNTER_FIELDS:
+            setattr(self, field, int(data.get(field, 0)))
+        self.search_seconds: float = float(data.get('search_seconds', 0.0))
+        self.consecutive_empty: int = int(data.get('consecutive_empty', 0))
+        self.last_searched: Optional[str] = data.get('last_searched')
+
+    def to_dict(self) -> Dict:
+        data = {field: getattr(self, field) for field in COUNTER_FIELDS}
+        data['search_seconds'] = round(self.search_seconds, 3)
+        data['consecutive_empty'] = self.consecutive_empty
+        data['last_searched'] = self.last_searched
+        return data
+
+    @property
+    def avg_latency(self) -> float:
+        return (self.search_seconds + PRIOR_LATENCY * PRIOR_WEIGHT) / (self.searches + PRIOR_WEIGHT)
+
+    @property
+    def useful(self) -> int:
+        return max(0, self.recipes_parsed - self.duplicates)
+
+    @property
+    def expected_yield(self) -> float:
+        """Smoothed new recipes per search."""
+        return (self.useful + PRIOR_YIELD * PRIOR_WEIGHT) / (self.searches + PRIOR_WEIGHT)
+
+    @property
+    def yield_per_second(self) -> float:
+        return self.expected_yield / max(self.avg_latency, 0.1)
+
+    @property
+    def duplicate_rate(self) -> float:
+        return self.duplicates / self.recipes_parsed if self.recipes_parsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.http_errors + self.failures) / self.searches if self.searches else 0.0
+
+
+class SiteStatsStore:
+    """
+    Thread-safe store of SiteStats keyed by site, persisted as JSON.
+    Search threads record into it concurrently; call save() once per run.
+    """
+
+    def __init__(self, filepath: str = DEFAULT_STATS_FILE):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._sites: Dict[str, SiteStats] = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.filepath):
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not read site stats ({e}) — starting fresh")
+            return
+        self._sites = {site: SiteStats(data) for site, data in raw.items()}
+
+    def save(self):
+        with self._lock:
+            raw = {site: s.to_dict() for site, s in sorted(self._sites.items())}
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(raw, f, indent=1)
+        os.replace(tmp, self.filepath)
+
+    def get(self, site: str) -> SiteStats:
+        """Stats for `site` (a blank, unrecorded entry if never seen)."""
+        with self._lock:
+            return self._sites.get(site) or SiteStats()
+
+    # ── recording ────────────────────────────────────────────────
+
+    def record_search(self, site: str, seconds: float, links: int,
+                      http_error: bool = False, failed: bool = False):
+        with self._lock:
+            s = self._sites.setdefault(site, SiteStats())
+            s.searches += 1
+            s.search_seconds += seconds
+            s.links_found += links
+            s.http_errors += int(http_error)
+            s.failures += int(failed)
+            s.consecutive_empty = 0 if links else s.consecutive_empty + 1
+            s.last_searched = datetime.now().isoformat(timespec='seconds')
+
+    def record_parse(self, site: str, ok: bool):
+        with self._lock:
+            s = self._sites.setdefault(site, SiteStats())
+            if ok:
+                s.recipes_parsed += 1
+            else:
+                s.parse_failures += 1
+
+    def record_duplicate(self, site: str, count: int = 1):
+        """A parsed recipe the store turned away as already saved."""
+        with self._lock:
+            self._sites.setdefault(site, SiteStats()).duplicates += count
+
+    def record_known_skip(self, site: str, count: int = 1):
+        """A link dropped before fetching because its URL is already stored."""
+        with self._lock:
+            self._sites.setdefault(site, SiteStats()).known_skips += count
+
+    # ── adaptive selection ───────────────────────────────────────
+
+    def should_skip(self, site: str) -> bool:
+        """Skip sites that keep coming back empty, with a periodic re-probe."""
+        with self._lock:
+            s = self._sites.get(site)
+            if s is None or s.consecutive_empty < SKIP_AFTER_EMPTY or not s.last_searched:
+                return False
+            last_searched = s.last_searched
+        age = time.time() - datetime.fromisoformat(last_searched).timestamp()
+        return age < REPROBE_AFTER_DAYS * 86400
+
+    def rank(self, sites: List[str]) -> List[str]:
+        """Return non-skipped sites ordered by expected yield per second (best first)."""
+        active = [site for site in sites if not self.should_skip(site)]
+        return sorted(active, key=lambda site: self.get(site).yield_per_second, reverse=True)
+
+    def limit_for(self, site: str, base_limit: int) -> int:
+        """
+        Scale the per-site link limit by how many of this site's links turned
+        into new recipes: productive sites get up to 2x, wasteful ones down to 2.
+        """
+        with self._lock:
+            s = self._sites.get(site)
+            if s is None or s.searches < MIN_SEARCHES_FOR_LIMIT or not s.links_found:
+                return base_limit
+            useful_rate = s.useful / s.links_found
+        scaled = round(base_limit * (0.5 + 1.5 * useful_rate))
+        return max(2, min(base_limit * 2, scaled))
+
+    # ── reporting ────────────────────────────────────────────────
+
+    def report(self, sort: str = "yield", top: Optional[int] = None):
+        with self._lock:
+            items = list(self._sites.items())
+        if not items:
+            print("  (no site stats recorded yet)")
+            return
+
+        sort_keys = {
+            'yield':   lambda kv: -kv[1].yield_per_second,
+            'errors':  lambda kv: -kv[1].error_rate,
+            'latency': lambda kv: kv[1].avg_latency,
+            'name':    lambda kv: kv[0],
+        }
+        items.sort(key=sort_keys.get(sort, sort_keys['yield']))
+        if top:
+            items = items[:top]
+
+        print(f"\n  {'Site':<30} {'Srch':>5} {'Lat(s)':>7} {'Err%':>5} {'Links':>6} "
+              f"{'Parsed':>6} {'Dup%':>5} {'Known':>6} {'Yld/s':>6}  Status")
+        print("  " + "─" * 97)
+        for site, s in items:
+            status = 'skipped' if self.should_skip(site) else ''
+            print(
+                f"  {site[:29]:<30} {s.searches:>5} {s.avg_latency:>7.2f} "
+                f"{s.error_rate * 100:>5.0f} {s.links_found:>6} {s.recipes_parsed:>6} "
+                f"{s.duplicate_rate * 100:>5.0f} {s.known_skips:>6} {s.yield_per_second:>6.2f}  {status}"
+            )
+        skipped = sum(1 for site, _ in items if self.should_skip(site))
+        print(f"\n  {len(items)} site(s) shown, {skipped} currently skipped.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-site search statistics report")
+    parser.add_argument("--file", default=DEFAULT_STATS_FILE,
+                        help=f"Stats file (default: {DEFAULT_STATS_FILE})")
+    parser.add_argument("--sort", default="yield", choices=["yield", "errors", "latency", "name"])
+    parser.add_argument("--top", type=int, default=None, help="Show only the first N sites")
+    args = parser.parse_args()
+    SiteStatsStore(args.file).report(sort=args.sort, top=args.top)
@@ -0,0 +1,213 @@
+# sitemap_discovery.py
+"""
+Sitemap-based recipe discovery.
+Instead of running search queries, read each site's robots.txt-advertised
+sitemaps (falling back to /sitemap.xml), walk sitemap indexes, and keep the
+URLs that match the site's recipe path regex. The Sitemap: lines come from
+the scraper's RobotsCache, and every sitemap request is checked against
+robots.txt, waits out the host's Crawl-delay and goes through the
+RetryController, like any other request. Sitemaps are parsed as they
+stream in, and <lastmod> is compared with the previous crawl so only new or
+changed recipe URLs reach the scrape stage.
+
+Used by RecipeSearchScraper.sitemap_and_scrape() / bulk_scrape.py --mode sitemap.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+import requests
+
+from retry import RetryController
+from robots import RobotsCache
+from site_registry import get_site_config
+from url_canon import canonicalize, fetch_url
+
+DEFAULT_STATE_FILE = os.environ.get("SITEMAP_STATE_FILE", "sitemap_state.json")
+
+FALLBACK_SITEMAP_PATHS = ['/sitemap.xml', '/sitemap_index.xml']
+MAX_SITEMAPS_PER_SITE = 50
+CHUNK_SIZE = 64 * 1024
+
+# Child sitemaps that never list recipe pages (taxonomy, media, authors)
+SKIP_SITEMAP_RE = re.compile(
+    r'(?:tag|category|categories|author|video|image|attachment|page)[-_]?sitemap'
+    r'|sitemap[-_]?(?:tag|category|categories|author|video|image)',
+    re.IGNORECASE,
+)
+
+SitemapEntry = Tuple[str, str, Optional[str]]   # (kind, loc, lastmod); kind is 'sitemap' or 'url'
+
+
+# ═══════════════════════════════════════════════════════════════
+#  FETCH + STREAMING PARSE
+# ═══════════════════════════════════════════════════════════════
+
+def robots_sitemaps(base_url: str, robots: Optional[RobotsCache] = None) -> List[str]:
+    """Sitemap URLs advertised in robots.txt (read through `robots`), or the conventional fallbacks."""
+    sitemaps = robots.rules(base_url).sitemaps if robots is not None else []
+    return sitemaps or [base_url + path for path in FALLBACK_SITEMAP_PATHS]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap(
+    url: str,
+    headers: Dict[str, str],
+    robots: Optional[RobotsCache] = None,
+    retries: Optional[RetryController] = None,
+    host: Optional[str] = None,
+) -> Iterator[SitemapEntry]:
+    """
+    Stream one sitemap (plain or gzipped) and yield its entries as they are
+    parsed. Elements are cleared as soon as they are read, so memory stays flat
+    on sitemaps with tens of thousands of URLs. Each attempt waits for the
+    host's Crawl-delay turn; transient failures are retried through `retries`,
+    charged to `host`.
+    """
+    def attempt():
+        if robots is not None:
+            robots.wait_turn(url)
+        return requests.get(url, headers=headers, timeout=20, stream=True)
+
+    response = retries.call(host or url, attempt) if retries is not None else attempt()
+    with response:
+        response.raise_for_status()
+        parser = XMLPullParser(events=('end',))
+        inflater = None
+        loc: Optional[str] = None
+        lastmod: Optional[str] = None
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if inflater is None:
+                # .xml.gz served without Content-Encoding still needs inflating
+                gzipped = chunk[:2] == b'\x1f\x8b'
+                inflater = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else False
+            parser.feed(inflater.decompress(chunk) if inflater else chunk)
+            for _, elem in parser.read_events():
+                tag = _local(elem.tag)
+                if tag == 'loc':
+                    loc = (elem.text or '').strip()
+                elif tag == 'lastmod':
+                    lastmod = (elem.text or '').strip() or None
+                elif tag in ('url', 'sitemap'):
+                    if loc:
+                        yield ('url' if tag == 'url' else 'sitemap', loc, lastmod)
+                    loc, lastmod = None, None
+                    elem.clear()
+        parser.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  CRAWL STATE
+# ═══════════════════════════════════════════════════════════════
+
+class SitemapState:
+    """
+    Last-seen <lastmod> per child sitemap and per recipe URL, by site.
+    A URL is new/changed if it was never seen or its lastmod moved; a child
+    sitemap whose lastmod did not move is not downloaded again.
+    """
+
+    def __init__(self, filepath: str = DEFAULT_STATE_FILE):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._sites: Dict[str, Dict[str, Dict[str, Optional[str]]]] = {}
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    self._sites = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Could not read sitemap state ({e}) — starting fresh")
+
+    def _site(self, site: str) -> Dict[str, Dict[str, Optional[str]]]:
+        return self._sites.setdefault(site, {'sitemaps': {}, 'urls': {}})
+
+    def sitemap_changed(self, site: str, url: str, lastmod: Optional[str]) -> bool:
+        with self._lock:
+            seen = self._site(site)['sitemaps']
+            return lastmod is None or url not in seen or seen[url] != lastmod
+
+    def url_changed(self, site: str, url: str, lastmod: Optional[str]) -> bool:
+        with self._lock:
+            seen = self._site(site)['urls']
+            return url not in seen or (lastmod is not None and seen[url] != lastmod)
+
+    def mark_sitemap(self, site: str, url: str, lastmod: Optional[str]):
+        with self._lock:
+            self._site(site)['sitemaps'][url] = lastmod
+
+    def mark_url(self, site: str, url: str, lastmod: Optional[str]):
+        with self._lock:
+            self._site(site)['urls'][url] = lastmod
+
+    def save(self):
+        with self._lock:
+            raw = json.dumps(self._sites)
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(raw)
+        os.replace(tmp, self.filepath)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  DISCOVERY
+# ═══════════════════════════════════════════════════════════════
+
+def discover_site(
+    site: str,
+    headers: Dict[str, str],
+    state: SitemapState,
+    max_urls: Optional[int] = None,
+    robots: Optional[RobotsCache] = None,
+    retries: Optional[RetryController] = None,
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Walk `site`'s sitemaps breadth-first and return (url, lastmod) for recipe
+    URLs that are new or changed since the last crawl. Child sitemaps are only
+    marked as read once fully consumed, so a run cut short by max_urls resumes
+    where it stopped. URLs come back as published; the crawl state is keyed
+    by their canonical form (mark them with canonicalize(url)). Sitemaps
+    robots.txt disallows are skipped.
+    """
+    config = get_site_config(site)
+    queue: List[Tuple[str, Optional[str]]] = [(u, None) for u in robots_sitemaps(config.base_url, robots)]
+    visited = set()
+    found: List[Tuple[str, Optional[str]]] = []
+    found_urls = set()
+
+    while queue and len(visited) < MAX_SITEMAPS_PER_SITE:
+        sitemap_url, sitemap_lastmod = queue.pop(0)
+        if sitemap_url in visited:
+            continue
+        visited.add(sitemap_url)
+        if robots is not None and not robots.allowed(sitemap_url):
+            continue
+        complete = True
+        try:
+            for kind, loc, lastmod in iter_sitemap(sitemap_url, headers, robots, retries, config.site):
+                if kind == 'sitemap':
+                    if not SKIP_SITEMAP_RE.search(loc) and state.sitemap_changed(site, loc, lastmod):
+                        queue.append((loc, lastmod))
+                    continue
+                key = canonicalize(loc)
+                if key in found_urls or config.site not in key:
+                    continue
+                if config.is_recipe_url(key) and state.url_changed(site, key, lastmod):
+                    found_urls.add(key)
+                    found.append((fetch_url(loc), lastmod))
+                    if max_urls is not None and len(found) >= max_urls:
+                        complete = False
+                        break
+        except (requests.RequestException, ParseError, zlib.error):
+            continue
+        if not complete:
+            break
+        state.mark_sitemap(site, sitemap_url, sitemap_lastmod)
+    return found
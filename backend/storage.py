@@ -0,0 +1,345 @@
+# storage.py
+"""
+Recipe storage backends.
+Everything the scraper stores or reads back goes through one small
+interface, so a crawl can write to Supabase (production) or to a local
+SQLite file at full speed with no network round trips:
+
+    save_batch(recipes)   -> (inserted, duplicates), skipping stored URLs
+    existing_urls(urls)   -> the subset already stored
+    iter_urls()           -> every stored URL (known-URL index)
+    log_search(...) / searched_queries()
+    list_recipes(limit)   -> (rows, total)
+    get_recipe(id)        -> row dict or None
+
+The backend comes from RECIPE_STORAGE ('supabase', the default, or
+'sqlite'; the file is RECIPE_SQLITE_PATH), RecipeSearchScraper(storage=...)
+or bulk_scrape.py --storage.
+
+    storage = get_storage("sqlite", "recipes.sqlite3")
+    inserted, duplicates = storage.save_batch(records)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import fields
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from supabase import Client, create_client
+
+from recipe_record import RecipeRecord
+
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
+SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")  # use service role key for scraper
+STORAGE_BACKEND = os.environ.get("RECIPE_STORAGE", "supabase")
+SQLITE_PATH = os.environ.get("RECIPE_SQLITE_PATH", "recipes.sqlite3")
+
+SAVE_CHUNK_SIZE = 100     # rows per multi-row insert
+EXISTS_CHUNK_SIZE = 100   # URLs per "url in (...)" lookup
+LOAD_CHUNK_SIZE = 1000    # Supabase caps a select at 1000 rows by default
+LIST_COLUMNS = ["id", "title", "source_site", "cuisine", "dietary_tags", "scraped_date"]
+
+
+def _search_log_row(query: str, sites: Optional[List[str]], results: int) -> Dict:
+    return {
+        "query":          query,
+        "sites_used":     ','.join(sites) if sites else 'all',
+        "results_found":  results,
+        "searched_at":    datetime.now().isoformat(),
+    }
+
+
+def _dedupe_by_url(recipes: List[RecipeRecord]) -> Tuple[Dict[str, Tuple[Dict, RecipeRecord]], List[RecipeRecord]]:
+    """(canonical URL -> (row, recipe), recipes whose URL already came up earlier in the batch)."""
+    by_url: Dict[str, Tuple[Dict, RecipeRecord]] = {}
+    repeats: List[RecipeRecord] = []
+    for recipe in recipes:
+        row = recipe.to_row()
+        if row["url"] in by_url:
+            repeats.append(recipe)   # two spellings of one recipe in this batch
+        else:
+            by_url[row["url"]] = (row, recipe)
+    return by_url, repeats
+
+
+class RecipeStorage(ABC):
+    """The operations the scraper and its tools need from a store."""
+
+    name = "storage"
+
+    @abstractmethod
+    def save_batch(
+        self, recipes: List[RecipeRecord], chunk_size: int = SAVE_CHUNK_SIZE,
+    ) -> Tuple[List[RecipeRecord], List[RecipeRecord]]: ...
+
+    @abstractmethod
+    def existing_urls(self, urls: Iterable[str]) -> Set[str]: ...
+
+    @abstractmethod
+    def iter_urls(self, chunk_size: int = LOAD_CHUNK_SIZE) -> Iterator[str]: ...
+
+    @abstractmethod
+    def log_search(self, query: str, sites: Optional[List[str]], results: int): ...
+
+    @abstractmethod
+    def searched_queries(self) -> Set[str]: ...
+
+    @abstractmethod
+    def list_recipes(self, limit: int = 50) -> Tuple[List[Dict], int]: ...
+
+    @abstractmethod
+    def get_recipe(self, recipe_id: int) -> Optional[Dict]: ...
+
+    def close(self):
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SUPABASE
+# ═══════════════════════════════════════════════════════════════
+
+def get_supabase() -> Client:
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY environment variables")
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def save_recipes(
+    supabase: Client, recipes: List[RecipeRecord], chunk_size: int = SAVE_CHUNK_SIZE,
+) -> Tuple[List[RecipeRecord], List[RecipeRecord]]:
+    """
+    Insert recipes in chunked multi-row upserts that skip any URL already
+    stored (on_conflict="url", ignore_duplicates — the unique index from
+    migrations/004_unique_recipe_url.sql makes this safe against concurrent
+    scrapers). Returns (inserted, duplicates), judged by the rows the
+    database reports it actually wrote.
+    """
+    inserted: List[RecipeRecord] = []
+    duplicates: List[RecipeRecord] = []
+    for start in range(0, len(recipes), chunk_size):
+        by_url, repeats = _dedupe_by_url(recipes[start:start + chunk_size])
+        duplicates.extend(repeats)
+        if not by_url:
+            continue
+        result = supabase.table("Recipes") \
+            .upsert([row for row, _ in by_url.values()], on_conflict="url", ignore_duplicates=True) \
+            .execute()
+        written = {row["url"] for row in result.data}
+        for url, (_, recipe) in by_url.items():
+            (inserted if url in written else duplicates).append(recipe)
+    return inserted, duplicates
+
+
+def log_search(supabase: Client, query: str, sites: Optional[List[str]], results: int):
+    supabase.table("search_log").insert(_search_log_row(query, sites, results)).execute()
+
+
+class SupabaseStorage(RecipeStorage):
+    name = "Supabase"
+
+    def __init__(self, client: Optional[Client] = None):
+        self.client = client or get_supabase()
+
+    def save_batch(self, recipes, chunk_size=SAVE_CHUNK_SIZE):
+        return save_recipes(self.client, recipes, chunk_size)
+
+    def existing_urls(self, urls):
+        urls = list(urls)
+        found: Set[str] = set()
+        for start in range(0, len(urls), EXISTS_CHUNK_SIZE):
+            rows = self.client.table("Recipes").select("url") \
+                .in_("url", urls[start:start + EXISTS_CHUNK_SIZE]).execute().data
+            found.update(row["url"] for row in rows)
+        return found
+
+    def iter_urls(self, chunk_size=LOAD_CHUNK_SIZE):
+        """Every stored URL, paged by id (keyset pagination)."""
+        last_id = 0
+        while True:
+            rows = self.client.table("Recipes") \
+                .select("id, url") \
+                .gt("id", last_id) \
+                .order("id") \
+                .limit(chunk_size) \
+                .execute().data
+            if not rows:
+                break
+            yield from (r["url"] for r in rows if r.get("url"))
+            last_id = rows[-1]["id"]
+            if len(rows) < chunk_size:
+                break
+
+    def log_search(self, query, sites, results):
+        log_search(self.client, query, sites, results)
+
+    def searched_queries(self):
+        rows = self.client.table("search_log").select("query").execute().data
+        return {r["query"].lower().strip() for r in rows}
+
+    def list_recipes(self, limit=50):
+        rows = self.client.table("Recipes") \
+            .select(", ".join(LIST_COLUMNS)) \
+            .order("id", desc=True) \
+            .limit(limit) \
+            .execute().data
+        total = self.client.table("Recipes").select("id", count="exact").execute().count
+        return rows, total
+
+    def get_recipe(self, recipe_id):
+        rows = self.client.table("Recipes").select("*").eq("id", recipe_id).execute().data
+        return rows[0] if rows else None
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SQLITE
+# ═══════════════════════════════════════════════════════════════
+
+RECIPE_COLUMNS = [f.name for f in fields(RecipeRecord)]
+
+_SQLITE_SCHEMA = f"""
+create table if not exists recipes (
+    id  integer primary key,
+    url text not null unique,
+    {", ".join(f"{c} text" for c in RECIPE_COLUMNS if c != "url")}
+);
+create index if not exists recipes_scraped_date_idx on recipes (scraped_date);
+create table if not exists search_log (
+    id            integer primary key,
+    query         text not null,
+    sites_used    text,
+    results_found integer,
+    searched_at   text
+);
+"""
+_SQLITE_PRAGMAS = [
+    "pragma journal_mode=wal",      # readers never block the writer
+    "pragma synchronous=normal",    # fsync at checkpoints, not every commit (safe with WAL)
+    "pragma temp_store=memory",
+    "pragma cache_size=-65536",     # 64 MB page cache
+    "pragma mmap_size=268435456",   # 256 MB memory-mapped reads
+    "pragma busy_timeout=5000",     # wait for another process's write instead of failing
+]
+_INSERT_RECIPE = (f"insert or ignore into recipes ({', '.join(RECIPE_COLUMNS)}) "
+                  f"values ({', '.join('?' * len(RECIPE_COLUMNS))})")
+
+
+class SQLiteStorage(RecipeStorage):
+    """
+    Local SQLite store: one persistent connection in WAL mode, the schema
+    created once on open, and each batch written with a single prepared
+    executemany inside one transaction.
+    """
+
+    name = "SQLite"
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()   # the writer thread and the crawl share the connection
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        for pragma in _SQLITE_PRAGMAS:
+            self._db.execute(pragma)
+        self._db.executescript(_SQLITE_SCHEMA)
+
+    def _stored(self, urls: List[str]) -> Set[str]:
+        found: Set[str] = set()
+        for start in range(0, len(urls), EXISTS_CHUNK_SIZE):
+            chunk = urls[start:start + EXISTS_CHUNK_SIZE]
+            found.update(row[0] for row in self._db.execute(
+                f"select url from recipes where url in ({', '.join('?' * len(chunk))})", chunk))
+        return found
+
+    def save_batch(self, recipes, chunk_size=SAVE_CHUNK_SIZE):
+        inserted: List[RecipeRecord] = []
+        duplicates: List[RecipeRecord] = []
+        for start in range(0, len(recipes), chunk_size):
+            by_url, repeats = _dedupe_by_url(recipes[start:start + chunk_size])
+            duplicates.extend(repeats)
+            if not by_url:
+                continue
+            with self._lock:
+                # "begin immediate" takes the write lock up front, so no other
+                # process can insert between the lookup and the insert
+                self._db.execute("begin immediate")
+                try:
+                    stored = self._stored(list(by_url))
+                    new = [(row, recipe) for url, (row, recipe) in by_url.items() if url not in stored]
+                    self._db.executemany(_INSERT_RECIPE, (
+                        [json.dumps(row[c]) if c == "ingredients_parsed" else row[c] for c in RECIPE_COLUMNS]
+                        for row, _ in new
+                    ))
+                    self._db.execute("commit")
+                except BaseException:
+                    self._db.execute("rollback")
+                    raise
+            inserted.extend(recipe for _, recipe in new)
+            duplicates.extend(recipe for url, (_, recipe) in by_url.items() if url in stored)
+        return inserted, duplicates
+
+    def existing_urls(self, urls):
+        with self._lock:
+            return self._stored(list(urls))
+
+    def iter_urls(self, chunk_size=LOAD_CHUNK_SIZE):
+        """Every stored URL, `chunk_size` rows per fetch; the lock is only held while fetching."""
+        with self._lock:
+            cursor = self._db.execute("select url from recipes order by id")
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from (row[0] for row in rows)
+        finally:
+            cursor.close()
+
+    def log_search(self, query, sites, results):
+        row = _search_log_row(query, sites, results)
+        with self._lock:
+            self._db.execute(f"insert into search_log ({', '.join(row)}) values ({', '.join('?' * len(row))})",
+                             list(row.values()))
+
+    def searched_queries(self):
+        with self._lock:
+            return {row[0].lower().strip() for row in self._db.execute("select query from search_log")}
+
+    def list_recipes(self, limit=50):
+        with self._lock:
+            rows = [dict(r) for r in self._db.execute(
+                f"select {', '.join(LIST_COLUMNS)} from recipes order by id desc limit ?", (limit,))]
+            total = self._db.execute("select count(*) from recipes").fetchone()[0]
+        return rows, total
+
+    def get_recipe(self, recipe_id):
+        with self._lock:
+            row = self._db.execute("select * from recipes where id = ?", (recipe_id,)).fetchone()
+        if row is None:
+            return None
+        recipe = dict(row)
+        if recipe.get("ingredients_parsed"):
+            recipe["ingredients_parsed"] = json.loads(recipe["ingredients_parsed"])
+        return recipe
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+STORAGE_BACKENDS = {
+    "supabase": SupabaseStorage,
+    "sqlite":   SQLiteStorage,
+}
+
+
+def get_storage(backend: Optional[str] = None, sqlite_path: Optional[str] = None) -> RecipeStorage:
+    backend = (backend or STORAGE_BACKEND).lower()
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}'. Available: {', '.join(STORAGE_BACKENDS)}")
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path or SQLITE_PATH)
+    return SupabaseStorage()
@@ -0,0 +1,217 @@
+# url_canon.py
+"""
+Recipe URL canonicalization.
+Collapses the variants of a recipe URL that used to be fetched and stored as
+separate recipes: http vs https, www. vs bare host, /amp/ and /print pages,
+#fragments, tracking query strings and trailing slashes. Path case is only
+folded for sites listed as case-insensitive in CANONICAL_SITE_RULES.
+
+The canonical form is a dedup key — the stored Recipes.url and what
+discovery and the known-URL index compare on. The crawler itself fetches
+fetch_url(), the URL as the site published it.
+
+Usage (one-off maintenance over stored rows):
+    python3 url_canon.py                  # list groups that collapse
+    python3 url_canon.py --delete         # keep the oldest row of each group
+    python3 url_canon.py --delete --rewrite   # ...then store every url in canonical form
+"""
+
+import argparse
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+# Per-site overrides, keyed by bare site domain:
+#   host        — preferred host (default: lowercase, 'www.' stripped)
+#   keep_params — query parameters that identify the recipe (default: drop all)
+#   lower_path  — lowercase the path (default: False; only for hosts known to
+#                 serve paths case-insensitively, most are case-sensitive)
+# WordPress looks posts up by slug case-insensitively and redirects any
+# casing to the lowercase permalink; ?p=<id> is its shortlink to a post.
+_WORDPRESS = {'lower_path': True, 'keep_params': frozenset({'p'})}
+WORDPRESS_SITES = [
+    'ambitiouskitchen.com', 'budgetbytes.com', 'cafedelites.com', 'cookieandkate.com',
+    'damndelicious.net', 'downshiftology.com', 'gimmesomeoven.com', 'halfbakedharvest.com',
+    'justonecookbook.com', 'loveandlemons.com', 'minimalistbaker.com', 'natashaskitchen.com',
+    'pinchofyum.com', 'recipetineats.com', 'sallysbakingaddiction.com', 'skinnytaste.com',
+    'spendwithpennies.com', 'thewoksoflife.com', 'twopeasandtheirpod.com', 'wellplated.com',
+]
+CANONICAL_SITE_RULES: Dict[str, Dict] = {
+    **{site: _WORDPRESS for site in WORDPRESS_SITES},
+    # Food.com's former name; its /recipe/ paths carried over unchanged
+    'geniuskitchen.com': {'host': 'food.com'},
+}
+
+_AMP_RE = re.compile(r'(?:^|/)amp(?=/|$)', re.IGNORECASE)
+_PRINT_SUFFIX_RE = re.compile(r'/print(?:/\d+)?/?$', re.IGNORECASE)
+_MULTI_SLASH_RE = re.compile(r'/{2,}')
+
+
+def _bare_host(host: str) -> str:
+    host = host.lower().rstrip('.')
+    if host.endswith(':443') or host.endswith(':80'):
+        host = host.rsplit(':', 1)[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def site_rules(host: str) -> Dict:
+    bare = _bare_host(host)
+    for site, rules in CANONICAL_SITE_RULES.items():
+        if bare == site or bare.endswith('.' + site):
+            return rules
+    return {}
+
+
+@lru_cache(maxsize=65536)   # search pages repeat the same nav/footer links on every query
+def canonicalize(url: str) -> str:
+    """Canonical form of a recipe URL; returns the input unchanged if it has no host."""
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url
+    rules = site_rules(parts.netloc)
+    host = rules.get('host') or _bare_host(parts.netloc)
+
+    path = _MULTI_SLASH_RE.sub('/', parts.path)
+    path = _AMP_RE.sub('', path)
+    path = _PRINT_SUFFIX_RE.sub('', path)
+    if rules.get('lower_path', False):
+        path = path.lower()
+    path = path.rstrip('/')
+
+    query = ''
+    keep = rules.get('keep_params')
+    if keep and parts.query:
+        pairs = [p for p in parts.query.split('&') if p.split('=', 1)[0] in keep]
+        query = '&'.join(sorted(pairs))
+
+    return urlunsplit(('https', host, path, query, ''))
+
+
+def fetch_url(url: str) -> str:
+    """The URL to request: as the site published it, minus any #fragment."""
+    return urldefrag(url.strip())[0]
+
+
+def url_variants(url: str) -> List[str]:
+    """
+    Spellings of `url` that rows stored before canonicalization may use
+    (scheme, www. and trailing slash), for duplicate checks against old data.
+    """
+    canonical = canonicalize(url)
+    parts = urlsplit(canonical)
+    hosts = {parts.netloc, f"www.{parts.netloc}"}
+    variants = {canonical, url}
+    for scheme in ('https', 'http'):
+        for host in hosts:
+            base = urlunsplit((scheme, host, parts.path, parts.query, ''))
+            variants.update({base, base + '/'})
+    return sorted(variants)
+
+
+def same_site(url: str, other: str) -> bool:
+    """True if both URLs are on the same site (ignoring www. and subdomain of it)."""
+    a, b = _bare_host(urlsplit(url).netloc), _bare_host(urlsplit(other).netloc)
+    return bool(a and b) and (a == b or a.endswith('.' + b) or b.endswith('.' + a))
+
+
+def preferred_url(fetched_url: str, page_canonical: Optional[str]) -> str:
+    """
+    URL to record for a scraped page: the page's own <link rel="canonical">
+    when it points back at the same site, otherwise the URL we fetched.
+    Stored under canonicalize() of it.
+    """
+    if page_canonical and page_canonical.startswith('http') and same_site(fetched_url, page_canonical):
+        return fetch_url(page_canonical)
+    return fetch_url(fetched_url)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ONE-OFF MAINTENANCE
+# ═══════════════════════════════════════════════════════════════
+
+def _iter_rows(supabase, chunk_size: int = 1000):
+    """Every stored (id, url) row, paged by id (keyset pagination)."""
+    last_id = 0
+    while True:
+        rows = supabase.table("Recipes") \
+            .select("id, url") \
+            .gt("id", last_id) \
+            .order("id") \
+            .limit(chunk_size) \
+            .execute().data
+        if not rows:
+            break
+        yield from (r for r in rows if r.get("url"))
+        last_id = rows[-1]["id"]
+
+
+def find_duplicate_rows(supabase, chunk_size: int = 1000) -> Dict[str, List[Dict]]:
+    """Group stored rows whose URLs collapse to the same canonical URL."""
+    groups: Dict[str, List[Dict]] = {}
+    for r in _iter_rows(supabase, chunk_size):
+        groups.setdefault(canonicalize(r["url"]), []).append(r)
+    return {url: rows for url, rows in groups.items() if len(rows) > 1}
+
+
+def rewrite_urls(supabase, chunk_size: int = 1000) -> Dict[str, int]:
+    """
+    Store every url in canonical form, so the unique-url upsert matches rows
+    saved before canonicalization. A row whose canonical url another row
+    already holds is left alone and counted as a conflict (run --delete first).
+    Returns counters: rewritten, conflicts.
+    """
+    rows = list(_iter_rows(supabase, chunk_size))
+    taken = {r["url"] for r in rows}
+    changes: List[Dict] = []
+    conflicts = 0
+    for r in rows:
+        canonical = canonicalize(r["url"])
+        if canonical == r["url"]:
+            continue
+        if canonical in taken:
+            conflicts += 1
+            continue
+        taken.add(canonical)
+        changes.append({"id": r["id"], "url": canonical})
+    for start in range(0, len(changes), chunk_size):
+        supabase.table("Recipes").upsert(changes[start:start + chunk_size], on_conflict="id").execute()
+    return {"rewritten": len(changes), "conflicts": conflicts}
+
+
+if __name__ == "__main__":
+    from supabase import create_client
+
+    parser = argparse.ArgumentParser(description="Find stored recipes whose URLs collapse under canonicalization")
+    parser.add_argument("--delete", action="store_true",
+                        help="Delete all but the oldest row of each duplicate group")
+    parser.add_argument("--rewrite", action="store_true",
+                        help="Rewrite every stored url to its canonical form (after --delete)")
+    args = parser.parse_args()
+
+    url, key = os.environ.get("SUPABASE_URL", ""), os.environ.get("SUPABASE_SERVICE_KEY", "")
+    if not url or not key:
+        raise SystemExit("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY environment variables")
+    supabase = create_client(url, key)
+
+    duplicates = find_duplicate_rows(supabase)
+    extra_ids: List[int] = []
+    for canonical, rows in sorted(duplicates.items()):
+        rows.sort(key=lambda r: r["id"])
+        print(f"\n  {canonical}")
+        for i, r in enumerate(rows):
+            marker = "keep" if i == 0 else "dup "
+            print(f"    [{marker}] {r['id']:<7} {r['url']}")
+        extra_ids.extend(r["id"] for r in rows[1:])
+
+    print(f"\n  {len(duplicates)} duplicate group(s), {len(extra_ids)} extra row(s).")
+    if args.delete and extra_ids:
+        for start in range(0, len(extra_ids), 200):
+            supabase.table("Recipes").delete().in_("id", extra_ids[start:start + 200]).execute()
+        print(f"  Deleted {len(extra_ids)} duplicate row(s).")
+    if args.rewrite:
+        counts = rewrite_urls(supabase)
+        print(f"  Rewrote {counts['rewritten']} url(s) to canonical form"
+              + (f", {counts['conflicts']} left as is (duplicates remain — run with --delete)"
+                 if counts['conflicts'] else "."))
@@ -0,0 +1,69 @@
+# url_index.py
+"""
+Known-URL index.
+An in-memory hashed set of every recipe URL already stored, loaded in chunks
+from the recipe store when the scraper starts and updated on each
+insert. URLs are keyed by their canonical form, so any spelling of a stored
+recipe hits. Candidates are checked against it before they are fetched, so
+already-stored recipes cost neither bandwidth nor parse time.
+
+URLs are kept as 64-bit blake2b digests rather than strings (~4x smaller);
+a false positive needs a 64-bit collision, so new recipes are never skipped
+in practice.
+"""
+
+import hashlib
+import threading
+from typing import Iterable, List
+
+from url_canon import canonicalize
+
+LOAD_CHUNK_SIZE = 1000   # Supabase caps a select at 1000 rows by default
+
+
+def _key(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class KnownUrlIndex:
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, url: str) -> bool:
+        return _key(canonicalize(url)) in self._keys
+
+    def add(self, url: str):
+        self._keys.add(_key(canonicalize(url)))
+
+    def update(self, urls: Iterable[str]):
+        self._keys.update(_key(canonicalize(u)) for u in urls)
+
+    def load(self, storage, chunk_size: int = LOAD_CHUNK_SIZE) -> int:
+        """
+        Index every URL in `storage` (a storage.RecipeStorage), so older rows
+        stored under a variant spelling still hit.
+        """
+        self.update(storage.iter_urls(chunk_size))
+        return len(self)
+
+    def filter_new(self, urls: List[str]) -> List[str]:
+        """Return the URLs not yet stored, counting hits for the report."""
+        new = [u for u in urls if u not in self]
+        with self._lock:
+            self.lookups += len(urls)
+            self.hits += len(urls) - len(new)
+        return new
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def report(self) -> str:
+        return (f"Known-URL index: {self.hits}/{self.lookups} candidate(s) already stored "
+                f"({self.hit_rate * 100:.0f}% hit rate, {len(self)} URLs indexed)")